@@ -0,0 +1,57 @@
+# bench_detector.py
+"""Seçili satır tespiti: kontur yolu ile satır izdüşümü yolunun karşılaştırması.
+
+Korpustaki her karenin maskesinde iki yöntemin aynı ``highlight_rect``
+değerini döndürdüğünü doğrular ve kare başına süreyi ölçer.
+
+Kullanım:
+    python benchmarks/bench_detector.py CORPUS_DIR [--repeat 10]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from frame_source import ImageDirFrameSource  # noqa: E402
+from vision import HIGHLIGHT_DETECTORS, FusedHighlightMask  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("corpus")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    masker = FusedHighlightMask()
+    masks = []
+    with ImageDirFrameSource(args.corpus) as source:
+        while (frame := source.grab()) is not None:
+            masks.append((os.path.basename(source.current_path), masker(frame).copy()))
+    if not masks:
+        print("Korpusta kare yok.")
+        return
+
+    timings = {name: 0.0 for name in HIGHLIGHT_DETECTORS}
+    mismatched = []
+    for name, mask in masks:
+        rects = {}
+        for detector, find_rect in HIGHLIGHT_DETECTORS.items():
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                rects[detector] = find_rect(mask)
+            timings[detector] += (time.perf_counter() - start) / args.repeat
+        if len(set(rects.values())) > 1:
+            mismatched.append((name, rects))
+
+    n = len(masks)
+    for detector, total in timings.items():
+        print(f"{detector:<11} {total * 1000.0 / n:7.3f} ms/kare")
+    print(f"Kare: {n}  farklı sonuç: {len(mismatched)}")
+    for name, rects in mismatched[:10]:
+        print(f"  {name}: {rects}")
+
+
+if __name__ == "__main__":
+    main()
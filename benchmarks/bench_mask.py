@@ -0,0 +1,72 @@
+# bench_mask.py
+"""Highlight maskesi: HSV referans yolu ile tek geçişli FusedHighlightMask karşılaştırması.
+
+Korpustaki her karede iki maskenin birebir aynı olduğunu doğrular ve kare
+başına süreyi ölçer. Ayrıca 1440p ve 4K tarama şeridi boyutlarında (rastgele
+içerikli) karelerle ölçüm yapar.
+
+Kullanım:
+    python benchmarks/bench_mask.py [CORPUS_DIR] [--repeat 20]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+from frame_source import ImageDirFrameSource, scan_width  # noqa: E402
+from vision import FusedHighlightMask, highlight_mask  # noqa: E402
+
+# (genişlik, yükseklik) — tarama şeridi ekranın sol %35'i (en fazla 600px)
+SCREEN_SIZES = {"1440p": (2560, 1440), "4K": (3840, 2160)}
+
+
+def time_ms(fn, frame, repeat: int) -> float:
+    fn(frame)  # Isınma (tampon ayırma)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(frame)
+    return (time.perf_counter() - start) * 1000.0 / repeat
+
+
+def compare(name: str, frames, repeat: int) -> None:
+    fused = FusedHighlightMask()
+    mismatched = 0
+    hsv_ms = fused_ms = 0.0
+    for frame in frames:
+        if not np.array_equal(highlight_mask(frame), fused(frame)):
+            mismatched += 1
+        hsv_ms += time_ms(highlight_mask, frame, repeat)
+        fused_ms += time_ms(fused, frame, repeat)
+    n = len(frames)
+    h, w = frames[0].shape[:2]
+    print(f"{name:<10} {w}x{h}  kare={n:<4} farklı={mismatched:<3} "
+          f"hsv={hsv_ms / n:7.3f}ms  fused={fused_ms / n:7.3f}ms  hızlanma={hsv_ms / fused_ms:4.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("corpus", nargs="?")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.corpus:
+        with ImageDirFrameSource(args.corpus) as source:
+            frames = []
+            while (frame := source.grab()) is not None:
+                frames.append(frame)
+        if frames:
+            compare("korpus", frames, args.repeat)
+
+    rng = np.random.default_rng(7)
+    for name, (w, h) in SCREEN_SIZES.items():
+        frame = rng.integers(0, 256, (h, scan_width(w), 4), dtype=np.uint8)
+        # Menü şeridine benzer parlak/gri bir bant ekle
+        frame[h // 3:h // 3 + 40, 20:420, :3] = rng.integers(225, 256, (40, 400, 3), dtype=np.uint8)
+        compare(name, [frame], args.repeat)
+
+
+if __name__ == "__main__":
+    main()
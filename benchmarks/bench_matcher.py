@@ -0,0 +1,90 @@
+# bench_matcher.py
+"""_match_vehicle mikro-benchmark'ı: trigram ve TF-IDF indeksli eşleştiriciler vs eski tam tarama.
+
+Katlanmış anahtarla (skorlamasız) çözülen örnekler 100 skoru alır; bu yüzden
+iki yol seçilen araca göre karşılaştırılır, skor farkı sonuç farkı sayılmaz.
+
+Kullanım:
+    python benchmarks/bench_matcher.py [--repeat 20] [--samples benchmarks/ocr_samples.txt]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from thefuzz import process, fuzz  # noqa: E402
+from database import load_vehicle_database  # noqa: E402
+from matcher import TfidfNameIndex, VehicleNameIndex  # noqa: E402
+
+DEFAULT_SAMPLES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ocr_samples.txt")
+
+
+def legacy_match(clean_text, search_keys):
+    """Eski OcrThread._match_vehicle: tüm anahtarlar üzerinde process.extract."""
+    candidates = process.extract(clean_text, search_keys, scorer=fuzz.WRatio, limit=10)
+    return VehicleNameIndex.rank_candidates(clean_text, candidates)
+
+
+def load_samples(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+
+def time_it(func, samples, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in samples:
+            func(text)
+    elapsed = time.perf_counter() - start
+    return elapsed / (repeat * len(samples)) * 1000.0  # ms / sorgu
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--samples", default=DEFAULT_SAMPLES)
+    args = parser.parse_args()
+
+    search_dict, _ = load_vehicle_database()
+    keys = list(search_dict.keys())
+    samples = load_samples(args.samples)
+
+    build_start = time.perf_counter()
+    index = VehicleNameIndex.from_search_dict(search_dict)
+    build_ms = (time.perf_counter() - build_start) * 1000.0
+
+    build_start = time.perf_counter()
+    tfidf = TfidfNameIndex.from_search_dict(search_dict)
+    tfidf_build_ms = (time.perf_counter() - build_start) * 1000.0
+
+    mismatches = []
+    exact = 0
+    for text in samples:
+        old = legacy_match(text, keys)
+        exact += index.lookup_exact(text) is not None
+        for name, engine in (("trigram", index), ("tfidf", tfidf)):
+            new = engine.match(text)
+            if (old and old[0]) != (new and new[0]):
+                mismatches.append((text, name, old, new))
+
+    legacy_ms = time_it(lambda t: legacy_match(t, keys), samples, args.repeat)
+    index_ms = time_it(index.match, samples, args.repeat)
+    tfidf_ms = time_it(tfidf.match, samples, args.repeat)
+
+    print(f"Veritabanı: {len(keys)} anahtar, örnek: {len(samples)} satır, tekrar: {args.repeat}")
+    print(f"İndeks kurulum: {build_ms:.1f} ms (kısa liste: {index.shortlist_size})")
+    print(f"Eski (tam tarama) : {legacy_ms:.3f} ms/sorgu")
+    print(f"TF-IDF kurulum: {tfidf_build_ms:.1f} ms (kısa liste: {tfidf.shortlist_size})")
+    print(f"Yeni (trigram)    : {index_ms:.3f} ms/sorgu  ({legacy_ms / index_ms:.1f}x)")
+    print(f"Yeni (TF-IDF)     : {tfidf_ms:.3f} ms/sorgu  ({legacy_ms / tfidf_ms:.1f}x)")
+    print(f"Hızlı yol (katlanmış anahtar): {exact}/{len(samples)} ({exact / len(samples):.0%})")
+    print(f"Sonuç farkı       : {len(mismatches)}")
+    for text, name, old, new in mismatches:
+        print(f"  '{text}' [{name}]: eski={old} yeni={new}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
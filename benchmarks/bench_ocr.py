@@ -0,0 +1,291 @@
+# bench_ocr.py
+"""OCR hattı uçtan uca doğruluk ve gecikme benchmark'ı.
+
+Etiketli bir menü karesi korpusunu (bkz. make_synthetic_corpus.py) tespit,
+OCR ve eşleştirme aşamalarından geçirir. Aşama başına p50/p95/p99 gecikme,
+kare/sn, precision/recall ve yanlış HUD oranını raporlar.
+
+"replay" motoru OCR yerine labels.json'daki kayıtlı metni döndürür; böylece
+tespit ve eşleştirme Windows/OCR olmadan (Linux CI) deterministik ölçülür.
+
+Kullanım:
+    python benchmarks/bench_ocr.py CORPUS_DIR [--engine replay|tesseract|winocr]
+                                   [--detector contour|projection] [--layout] [--track]
+                                   [--garage] [--context] [--match-engine trigram|tfidf]
+                                   [--vote K/N] [--flip-rate 0.05] [--repeat-frames 3]
+                                   [--no-cache] [--json results.json]
+
+``--garage`` korpustaki beklenen araçları garaj sayarak garaj öncelikli
+eşleştirmeyi ölçer. ``--context`` menü başlığından bağlam bulup aramayı o
+menünün araçlarıyla sınırlar (replay). ``--vote K/N`` HUD yayınını son N karede
+K uyuşmaya bağlar; ``--flip-rate`` replay OCR'ının bu oranda karede başka bir
+araç okumasını taklit eder. Rapor, oylamasız ve oylamalı HUD yayın sayılarını
+ve HUD'ın doğru aracı gösterdiği kare oranını içerir. ``--repeat-frames N`` her
+kareyi N kez işler (korpus seyrek örneklenmiştir; canlı yakalamada aynı satır
+birkaç kare görünür).
+"""
+import argparse
+import datetime
+import json
+import os
+import random
+import sys
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+from config import VERSION  # noqa: E402
+from database import load_vehicle_database  # noqa: E402
+from frame_source import ImageDirFrameSource  # noqa: E402
+from matcher import MatchDebouncer, VehicleResolver  # noqa: E402
+from metrics import OCR_STAGES, StageMetrics, clock  # noqa: E402
+from pipeline import HighlightPipeline  # noqa: E402
+from vision import HighlightTracker, RoiFingerprintCache  # noqa: E402
+
+STAGES = OCR_STAGES + ("total",)
+
+
+class ReplayOcr:
+    """Kayıtlı OCR metnini döndüren deterministik OCR yerine geçeni."""
+
+    def __init__(self, labels: Dict[str, dict], flip_rate: float = 0.0, seed: int = 11):
+        self.labels = labels
+        self.current = None  # İşlenen karenin dosya adı
+        # Gürültülü kare taklidi: bu olasılıkla korpustaki başka bir aracın metni okunur
+        self.flip_rate = flip_rate
+        self._rng = random.Random(seed)
+        self._texts = sorted({text for label in labels.values() for text in label.get("ocr", [])})
+
+    def __call__(self, roi) -> List[str]:
+        lines = list(self.labels.get(self.current, {}).get("ocr", []))
+        if lines and self._texts and self._rng.random() < self.flip_rate:
+            return [self._rng.choice(self._texts)]
+        return lines
+
+    def header(self, header) -> List[str]:
+        """Menü başlığı OCR'ı: kayıtlı başlık metni."""
+        text = self.labels.get(self.current, {}).get("header", "")
+        return [text] if text else []
+
+    def page(self, column) -> List[Tuple[str, float]]:
+        """Menü sütunu OCR'ı: kayıtlı satırlar, 2x büyütülmüş görüntü koordinatında."""
+        rows = self.labels.get(self.current, {}).get("rows", [])
+        return [(row["ocr"], row["y"] * 2.0) for row in rows]
+
+
+def make_recognizer(engine: str, labels: Dict[str, dict], flip_rate: float = 0.0) -> Callable:
+    if engine == "replay":
+        return ReplayOcr(labels, flip_rate)
+
+    if engine == "tesseract":
+        import pytesseract
+
+        def recognize(roi):
+            # Hat beyaz metin/siyah zemin üretir; Tesseract tersini daha iyi okur
+            text = pytesseract.image_to_string(255 - roi, config="--oem 3 --psm 7")
+            return [line for line in text.splitlines() if line.strip()]
+        return recognize
+
+    if engine == "winocr":
+        import asyncio
+        import winocr
+        from PIL import Image as PILImage
+        loop = asyncio.new_event_loop()
+
+        def recognize(roi):
+            result = loop.run_until_complete(winocr.recognize_pil(PILImage.fromarray(roi), lang="en"))
+            return [line.text for line in result.lines]
+        return recognize
+
+    raise ValueError(f"Bilinmeyen OCR motoru: {engine}")
+
+
+def percentiles(arr: np.ndarray) -> Dict[str, float]:
+    if not arr.size:
+        return {"count": 0}
+    return {
+        "count": int(arr.size),
+        "mean": round(float(arr.mean()), 3),
+        "p50": round(float(np.percentile(arr, 50)), 3),
+        "p95": round(float(np.percentile(arr, 95)), 3),
+        "p99": round(float(np.percentile(arr, 99)), 3),
+    }
+
+
+def run_benchmark(corpus: str, engine: str = "replay", use_cache: bool = True,
+                  detector: str = "contour", layout: bool = False, track: bool = False,
+                  garage: bool = False, context: bool = False, match_engine: str = "trigram",
+                  vote: Tuple[int, int] = (1, 1), flip_rate: float = 0.0, repeat_frames: int = 1) -> Dict:
+    with open(os.path.join(corpus, "labels.json"), "r", encoding="utf-8") as f:
+        labels = json.load(f)
+
+    search_dict, _ = load_vehicle_database()
+    source = ImageDirFrameSource(corpus)
+    # Her kare için tek ölçüm; halka tampon tüm korpusu tutar
+    metrics = StageMetrics(STAGES, capacity=max(1, len(source.paths) * repeat_frames))
+    owned = sorted({label["expected"] for label in labels.values() if label.get("expected")}) if garage else []
+    resolver = VehicleResolver(search_dict, memo_size=512 if use_cache else 0, metrics=metrics, garage=owned,
+                               engine=match_engine)
+    recognizer = make_recognizer(engine, labels, flip_rate)
+    debouncer = MatchDebouncer(window=vote[1], required=vote[0])
+
+    def hud_vote(candidates):
+        # HUD: oylamadan geçen araç (menüsüz karede HUD zaman aşımını taklit etmek için sıfırlanır)
+        if candidates:
+            debouncer.push(candidates[0][0], candidates[0][1])
+        else:
+            debouncer.reset()
+
+    hud_correct = 0
+    roi_cache = RoiFingerprintCache(max_size=64 if use_cache else 0)
+    recognize_page = None
+    if layout:
+        if not isinstance(recognizer, ReplayOcr):
+            raise ValueError("Sayfa düzeni önbelleği yalnızca replay motoruyla ölçülebilir")
+        recognize_page = recognizer.page
+    recognize_header = None
+    if context:
+        if not isinstance(recognizer, ReplayOcr):
+            raise ValueError("Menü bağlamı yalnızca replay motoruyla ölçülebilir")
+        recognize_header = recognizer.header
+    tracker = HighlightTracker() if track and not layout else None
+    # Önbelleğe yalnızca oylamayı geçen okumalar yazılır (OcrThread ile aynı kural)
+    pipeline = HighlightPipeline(recognizer, resolver.resolve, on_result=hud_vote,
+                                 roi_cache=roi_cache, metrics=metrics, detector=detector,
+                                 recognize_page=recognize_page, tracker=tracker,
+                                 on_menu_context=resolver.set_context if context else None,
+                                 recognize_header=recognize_header,
+                                 confirm=lambda c: not c or debouncer.confirmed(c[0][0]))
+
+    tp = fp = fn = 0
+    no_menu_frames = false_hud = 0
+    frames = 0
+
+    with source:
+        wall_start = clock()
+        repeats_left = 0
+        while True:
+            start = clock()
+            if repeats_left:
+                repeats_left -= 1  # Aynı kare (ve bandı) yeniden işlenir
+            else:
+                band = tracker.band() if tracker is not None else None
+                frame = source.grab(band)
+                if frame is None:
+                    break
+                repeats_left = repeat_frames - 1
+            metrics.since("capture", start)
+            name = os.path.basename(source.current_path)
+            if isinstance(recognizer, ReplayOcr):
+                recognizer.current = name
+
+            candidates = pipeline.process(frame, band)
+            metrics.since("total", start)
+            frames += 1
+
+            expected = labels.get(name, {}).get("expected")
+            predicted = search_dict[candidates[0][0]].get("Vehicle Name") if candidates else None
+            shown = search_dict[debouncer.current].get("Vehicle Name") if debouncer.current else None
+            hud_correct += shown == expected
+            if expected is None:
+                no_menu_frames += 1
+                if predicted is not None:
+                    false_hud += 1
+                    fp += 1
+            elif predicted == expected:
+                tp += 1
+            else:
+                fn += 1
+                if predicted is not None:
+                    fp += 1
+        wall = clock() - wall_start
+
+    return {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "version": VERSION,
+        "corpus": os.path.abspath(corpus),
+        "engine": engine,
+        "detector": detector,
+        "layout": layout,
+        "track": tracker is not None,
+        "garage": len(owned),
+        "context": context,
+        "match_engine": match_engine,
+        "vote": f"{vote[0]}/{vote[1]}",
+        "flip_rate": flip_rate,
+        "repeat_frames": repeat_frames,
+        "cache": use_cache,
+        "frames": frames,
+        "fps": round(frames / wall, 2) if wall > 0 else 0.0,
+        "ocr_calls": int(metrics.samples_ms("ocr").size),
+        "stages_ms": {stage: percentiles(metrics.samples_ms(stage)) for stage in STAGES},
+        "accuracy": {
+            "precision": round(tp / (tp + fp), 4) if (tp + fp) else 0.0,
+            "recall": round(tp / (tp + fn), 4) if (tp + fn) else 0.0,
+            "false_hud_rate": round(false_hud / no_menu_frames, 4) if no_menu_frames else 0.0,
+            "tp": tp, "fp": fp, "fn": fn,
+        },
+        "roi_cache": roi_cache.stats(),
+        "match_memo": resolver.memo.stats(),
+        "matcher": resolver.stats(),
+        "pipeline": pipeline.stats(),
+        "hud": {
+            "emits": debouncer.emits,
+            "raw_emits": debouncer.raw_emits,
+            "wasted": debouncer.raw_emits - debouncer.emits,
+            "correct_frames": round(hud_correct / frames, 4) if frames else 0.0,
+        },
+    }
+
+
+def print_report(result: Dict) -> None:
+    print(f"Korpus: {result['corpus']}  motor: {result['engine']}  tespit: {result['detector']}  "
+          f"sayfa düzeni: {result['layout']}  bant takibi: {result['track']}  garaj: {result['garage']}  "
+          f"bağlam: {result['context']}  eşleştirici: {result['match_engine']}  "
+          f"önbellek: {result['cache']}")
+    print(f"Kare: {result['frames']}  hız: {result['fps']} kare/sn  OCR çağrısı: {result['ocr_calls']}")
+    print(f"{'aşama':<8} {'n':>6} {'p50':>9} {'p95':>9} {'p99':>9}  (ms)")
+    for stage in STAGES:
+        st = result["stages_ms"][stage]
+        if st["count"]:
+            print(f"{stage:<8} {st['count']:>6} {st['p50']:>9.3f} {st['p95']:>9.3f} {st['p99']:>9.3f}")
+    acc = result["accuracy"]
+    print(f"precision={acc['precision']:.3f} recall={acc['recall']:.3f} "
+          f"yanlış HUD={acc['false_hud_rate']:.3f} (tp={acc['tp']} fp={acc['fp']} fn={acc['fn']})")
+    hud = result["hud"]
+    print(f"HUD oylama {result['vote']} (flip={result['flip_rate']}): yayın={hud['emits']} "
+          f"oylamasız={hud['raw_emits']} gereksiz={hud['wasted']} doğru kare={hud['correct_frames']:.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("corpus")
+    parser.add_argument("--engine", default="replay", choices=["replay", "tesseract", "winocr"])
+    parser.add_argument("--detector", default="contour", choices=["contour", "projection"])
+    parser.add_argument("--layout", action="store_true", help="Sayfa düzeni önbelleğini aç (replay)")
+    parser.add_argument("--track", action="store_true", help="Şeridi son konumu etrafındaki bantta ara")
+    parser.add_argument("--garage", action="store_true", help="Beklenen araçları garaj sayıp önce onlarda ara")
+    parser.add_argument("--match-engine", default="trigram", choices=["trigram", "tfidf"])
+    parser.add_argument("--vote", default="1/1", help="HUD oylaması K/N (1/1 = oylama yok)")
+    parser.add_argument("--flip-rate", type=float, default=0.0, help="Replay OCR'ında yanlış araç okuma oranı")
+    parser.add_argument("--repeat-frames", type=int, default=1, help="Her kareyi bu kadar kez işle")
+    parser.add_argument("--context", action="store_true", help="Menü başlığından bağlamı bulup aramayı daralt")
+    parser.add_argument("--no-cache", action="store_true", help="ROI ve metin önbelleklerini kapat")
+    parser.add_argument("--json", help="Sonuçları bu JSON dosyasına yaz")
+    args = parser.parse_args()
+
+    result = run_benchmark(args.corpus, args.engine, use_cache=not args.no_cache,
+                           detector=args.detector, layout=args.layout, track=args.track,
+                           garage=args.garage, context=args.context,
+                           match_engine=args.match_engine,
+                           vote=tuple(int(v) for v in args.vote.split("/")), flip_rate=args.flip_rate,
+                           repeat_frames=max(1, args.repeat_frames))
+    print_report(result)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+# bench_records.py
+"""Tipli araç kayıtları (VehicleRecord) vs her kullanımda metin ayrıştırma.
+
+Galeri sıralaması (4 mod), HUD rozetleri ve sınıf tavsiyeleri için eski
+``parse_number`` tabanlı yol ile yükleme anında ayrıştırılmış kayıtları
+karşılaştırır; ikinci tabloda kayıt döngüleri ile sütunlu ``VehicleTable``
+(NumPy) karşılaştırılır. Her satırda iki yolun aynı sonucu verdiği kontrol edilir.
+
+Kullanım:
+    python benchmarks/bench_records.py [--repeat 20]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import (  # noqa: E402
+    get_smart_badges, get_vehicle_advice, load_vehicle_database, parse_number, vehicle_record, vehicle_table,
+)
+
+SORT_FIELDS = [
+    ("price_desc", "GTA Online Price", "price", True),
+    ("price_asc", "GTA Online Price", "price", False),
+    ("speed_desc", "Top Speed (Broughy)", "top_speed", True),
+    ("accel_desc", "Stat - Acceleration", "acceleration", True),
+]
+
+
+def legacy_sort(db_data):
+    """Eski GalleryWindow sıralaması: her karşılaştırma anahtarı için regex."""
+    return [sorted(db_data, key=lambda x: parse_number(x.get(field, "0")), reverse=rev)
+            for _, field, _, rev in SORT_FIELDS]
+
+
+def record_sort(db_data):
+    return [sorted(db_data, key=lambda x: getattr(vehicle_record(x), attr), reverse=rev)
+            for _, _, attr, rev in SORT_FIELDS]
+
+
+def legacy_badges(vehicle_data):
+    """Eski get_smart_badges (for_hud=True): üç alan her çağrıda ayrıştırılır."""
+    price = parse_number(vehicle_data.get("GTA Online Price", "0"))
+    speed = parse_number(vehicle_data.get("Top Speed (Broughy)", "0"))
+    accel = parse_number(vehicle_data.get("Stat - Acceleration", "0"))
+    badges = []
+    if "Yes" in str(vehicle_data.get("Bulletproof", "No")):
+        badges.append(("🛡️ ZIRHLI", "#0984e3"))
+    if "Weaponized" in str(vehicle_data.get("Vehicle Features", "")):
+        badges.append(("⚔️ SİLAHLI", "#d63031"))
+    if price <= 1200000 and speed >= 115:
+        badges.append(("🔥 F/P CANAVARI", "#e17055"))
+    if price >= 2500000:
+        badges.append(("💎 LÜKS", "#fdcb6e"))
+    if accel >= 90:
+        badges.append(("⚡ ROKET", "#6c5ce7"))
+    if not badges:
+        badges.append(("🚙 STANDART", "#636e72"))
+    return badges
+
+
+def legacy_class_rank(vehicle_data, db_data):
+    """Eski get_vehicle_advice sınıf sıralaması (garaj kısmı hariç)."""
+    vehicle_class = vehicle_data.get("Vehicle Class", "")
+    class_vehicles = [v for v in db_data if v.get("Vehicle Class") == vehicle_class]
+    return sorted([(v.get("Vehicle Name", ""), parse_number(v.get("Top Speed (Broughy)", "0")))
+                   for v in class_vehicles], key=lambda x: x[1], reverse=True)
+
+
+def record_class_rank(vehicle_data, db_data):
+    vehicle_class = vehicle_record(vehicle_data).vehicle_class
+    class_vehicles = [v for v in db_data if v.get("Vehicle Class") == vehicle_class]
+    return sorted([(v.get("Vehicle Name", ""), vehicle_record(v).top_speed)
+                   for v in class_vehicles], key=lambda x: x[1], reverse=True)
+
+
+def record_analytics(db_data, garage):
+    """Eski analiz sayfası: garaj araçları için toplam, en pahalı, en hızlı ve sınıf dağılımı."""
+    garage_vehicles = [v for v in db_data if v.get("Vehicle Name", "") in garage]
+    total_value = sum(vehicle_record(v).price for v in garage_vehicles)
+    most_expensive = max(garage_vehicles, key=lambda v: vehicle_record(v).price).get("Vehicle Name", "")
+    fastest = max(garage_vehicles, key=lambda v: vehicle_record(v).top_speed).get("Vehicle Name", "")
+    class_counts = {}
+    for v in garage_vehicles:
+        vc = v.get("Vehicle Class", "")
+        class_counts[vc] = class_counts.get(vc, 0) + 1
+    return total_value, most_expensive, fastest, sorted(class_counts.items(), key=lambda x: x[1], reverse=True)
+
+
+def table_analytics(db_data, garage):
+    table = vehicle_table(db_data)
+    rows = table.owned_rows(garage)
+    return (table.total(rows, "price"), table.names[table.top_row(rows, "price")],
+            table.names[table.top_row(rows, "top_speed")], table.class_counts(rows))
+
+
+def table_sort(db_data):
+    table = vehicle_table(db_data)
+    rows = range(len(db_data))
+    return [[db_data[row] for row in table.sort_rows(rows, attr, rev)] for _, _, attr, rev in SORT_FIELDS]
+
+
+def table_class_rank(vehicle_data, db_data):
+    """Yükleme anında hazırlanan sınıf sıralaması (ClassRanking) okunur."""
+    table = vehicle_table(db_data)
+    ranked = table.class_rankings[vehicle_record(vehicle_data).vehicle_class].rows
+    return [(table.names[row], float(table.top_speed[row])) for row in ranked]
+
+
+def time_it(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat * 1000.0, result  # ms / tekrar
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    build_start = time.perf_counter()
+    _, db_data = load_vehicle_database()
+    load_ms = (time.perf_counter() - build_start) * 1000.0
+    sample = db_data[::8]
+
+    rows = [
+        ("galeri sıralama (4 mod)", lambda: legacy_sort(db_data), lambda: record_sort(db_data)),
+        ("HUD rozetleri (tüm araçlar)",
+         lambda: [legacy_badges(v) for v in db_data],
+         lambda: [get_smart_badges(v, for_hud=True) for v in db_data]),
+        (f"sınıf sırası ({len(sample)} araç)",
+         lambda: [legacy_class_rank(v, db_data) for v in sample],
+         lambda: [record_class_rank(v, db_data) for v in sample]),
+    ]
+
+    # Garaj örneği: her üçüncü araç
+    garage = [v.get("Vehicle Name", "") for v in db_data[::3]]
+    table_rows = [
+        ("galeri sıralama (4 mod)", lambda: record_sort(db_data), lambda: table_sort(db_data)),
+        (f"analiz ({len(garage)} araçlık garaj)",
+         lambda: record_analytics(db_data, garage), lambda: table_analytics(db_data, garage)),
+        (f"sınıf sırası ({len(sample)} araç)",
+         lambda: [record_class_rank(v, db_data) for v in sample],
+         lambda: [table_class_rank(v, db_data) for v in sample]),
+    ]
+
+    table_start = time.perf_counter()
+    vehicle_table(list(db_data))  # Yeni liste: tablo zorla yeniden kurulur
+    table_ms = (time.perf_counter() - table_start) * 1000.0
+    vehicle_table(db_data)
+
+    print(f"Veritabanı: {len(db_data)} araç, yükleme+ayrıştırma: {load_ms:.1f} ms, "
+          f"tablo kurulumu: {table_ms:.1f} ms, tekrar: {args.repeat}")
+    mismatched = 0
+    for baseline, header, comparisons in (("eski", "kayıt", rows), ("kayıt", "tablo", table_rows)):
+        print(f"{'iş':<28} {baseline:>10} {header:>10}  (ms)")
+        for name, legacy, typed in comparisons:
+            legacy_ms, legacy_result = time_it(legacy, args.repeat)
+            typed_ms, typed_result = time_it(typed, args.repeat)
+            same = legacy_result == typed_result
+            mismatched += not same
+            print(f"{name:<28} {legacy_ms:>10.3f} {typed_ms:>10.3f}  ({legacy_ms / typed_ms:.1f}x)"
+                  f"{'' if same else '  SONUÇ FARKLI'}")
+
+    # Tavsiye üreticisi garaj dosyasını da okur; yalnızca süre raporlanır
+    advice_ms, _ = time_it(lambda: [get_vehicle_advice(v, db_data) for v in sample], args.repeat)
+    print(f"{'get_vehicle_advice':<28} {'':>10} {advice_ms:>10.3f}")
+    return 1 if mismatched else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+# bench_tesseract.py
+"""Tesseract arka uçları: pytesseract (ROI başına süreç) ile kalıcı motorun karşılaştırması.
+
+Korpustaki karelerden Tesseract modunun kontur ROI'lerini çıkarır, her arka
+uçla okur; kare başına süreyi, ROI başına süreyi ve iki yolun aynı metni
+okuyup okumadığını raporlar. Ayrıca kalıcı motorla ROI'leri tek sayfaya dizip
+(``recognize_stitched``) kare başına tek çağrıyla okumayı ve ``--workers N``
+ile N süreçli havuzda (``TesseractPool``) paralel okumayı ölçer. Yerel bir
+Tesseract kurulumu gerekir.
+
+Kullanım:
+    python benchmarks/bench_tesseract.py CORPUS_DIR [--tesseract PATH]
+                                         [--backend auto|tesserocr|capi] [--frames 100]
+                                         [--workers N]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2  # noqa: E402
+from config import BASELINE_RESOLUTION, _get_default_tesseract_path  # noqa: E402
+from frame_source import ImageDirFrameSource  # noqa: E402
+from tesseract_backend import (  # noqa: E402
+    PytesseractBackend, TesseractPool, create_tesseract_backend, recognize_stitched,
+)
+from vision import find_text_rois  # noqa: E402
+
+
+def load_rois(corpus: str, max_frames: int):
+    frames = []
+    with ImageDirFrameSource(corpus) as source:
+        while len(frames) < max_frames and (frame := source.grab()) is not None:
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGRA2GRAY)
+            scale = gray.shape[0] / BASELINE_RESOLUTION[1]
+            frames.append(find_text_rois(gray, scale))
+    return frames
+
+
+def run(backend, frames, stitch=False):
+    texts = []
+    start = time.perf_counter()
+    for rois in frames:
+        if not rois:
+            texts.append([])
+        elif stitch:
+            texts.append(recognize_stitched(backend, rois))
+        else:
+            texts.append(backend.recognize(rois))
+    return time.perf_counter() - start, texts
+
+
+def count_same(reference, candidate):
+    return sum(
+        a == b
+        for ref_texts, new_texts in zip(reference, candidate)
+        for a, b in zip(ref_texts, new_texts)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("corpus")
+    parser.add_argument("--tesseract", default=_get_default_tesseract_path())
+    parser.add_argument("--backend", default="auto", choices=["auto", "tesserocr", "capi"])
+    parser.add_argument("--frames", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=0, help="Havuz yolunu da bu kadar süreçle ölç")
+    args = parser.parse_args()
+
+    frames = load_rois(args.corpus, args.frames)
+    roi_count = sum(len(rois) for rois in frames)
+    print(f"Kare: {len(frames)}  ROI: {roi_count}")
+    if not roi_count:
+        return
+
+    legacy = PytesseractBackend(args.tesseract)
+    persistent = create_tesseract_backend(args.tesseract, args.backend)
+    if persistent.name == "pytesseract":
+        print("Kalıcı arka uç kurulamadı (tesserocr veya libtesseract bulunamadı).")
+        return
+
+    with persistent:
+        persistent.recognize(frames[0] or [])  # Isınma: motor zaten yüklü, ilk çağrı önbellekleri doldurur
+        results = {}
+        for label, backend, stitch in ((legacy.name, legacy, False),
+                                       (persistent.name, persistent, False),
+                                       (f"{persistent.name}+stitch", persistent, True)):
+            elapsed, texts = run(backend, frames, stitch)
+            results[label] = texts
+            print(f"{label:<18} {elapsed * 1000.0 / len(frames):8.2f} ms/kare  "
+                  f"{elapsed * 1000.0 / roi_count:8.2f} ms/ROI")
+
+    if args.workers > 0:
+        # Havuz açılışı (süreç başlatma + motor yükleme) ölçüme dahil edilmez
+        with TesseractPool(args.tesseract, args.workers, args.backend) as pool:
+            label = f"pool x{args.workers}"
+            elapsed, texts = run(pool, frames)
+            results[label] = texts
+            print(f"{label:<18} {elapsed * 1000.0 / len(frames):8.2f} ms/kare  "
+                  f"{elapsed * 1000.0 / roi_count:8.2f} ms/ROI")
+
+    reference = results[legacy.name]
+    for label, texts in results.items():
+        if label != legacy.name:
+            print(f"Aynı metin ({label}): {count_same(reference, texts)}/{roi_count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+# make_synthetic_corpus.py
+"""bench_ocr.py için sentetik, etiketli menü karesi korpusu üretir.
+
+Gerçek oyun kayıtları olmayan (ör. Linux CI) makinelerde tespit ve eşleştirme
+hattını ölçmek içindir. GTA menüsüne benzeyen bir liste çizer, ok tuşlarıyla
+gezinmeyi taklit eder ve arada menüsüz kareler ekler.
+
+Kullanım:
+    python benchmarks/make_synthetic_corpus.py OUT_DIR [--frames 200] [--seed 7]
+
+Çıktı: OUT_DIR/*.png ve OUT_DIR/labels.json
+    {"0001.png": {"expected": "Pegassi Toreador", "ocr": ["Toreador"], "header": "Mechanic",
+                  "rows": [{"y": 239.0, "ocr": "Toreador"}, ...]}, ...}
+
+"rows" görünen tüm menü satırlarının kayıtlı OCR metni ve y-merkezidir
+(sayfa düzeni önbelleği için tüm sütunun OCR'ı). "header" menü başlığının
+kayıtlı OCR metnidir; liste yalnızca Mechanic ile getirilebilen araçlardan oluşur.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+import cv2  # noqa: E402
+from database import load_vehicle_database  # noqa: E402
+from menu_context import vehicle_contexts  # noqa: E402
+
+FRAME_SIZE = (1440, 600)   # (yükseklik, genişlik) — canlı tarama şeridiyle aynı
+MENU_LEFT = 20
+MENU_WIDTH = 400
+ROW_HEIGHT = 38
+MENU_TOP = 220
+VISIBLE_ROWS = 12
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+
+# Kayıtlı OCR çıktılarında görülen tipik hatalar
+OCR_NOISE = [("O", "0"), ("l", "1"), ("I", "l"), ("S", "5"), ("-", "")]
+
+
+def _noisy(text: str, rng: random.Random) -> str:
+    if rng.random() < 0.25:
+        a, b = rng.choice(OCR_NOISE)
+        return text.replace(a, b, 1)
+    return text
+
+
+def _background(rng: random.Random) -> np.ndarray:
+    frame = np.full((*FRAME_SIZE, 3), rng.randint(20, 90), np.uint8)
+    noise = np.random.default_rng(rng.randint(0, 2 ** 31)).integers(0, 40, (*FRAME_SIZE, 3), dtype=np.uint8)
+    return cv2.add(frame, noise)
+
+
+def _draw_menu(frame: np.ndarray, rows, selected: int) -> None:
+    cv2.rectangle(frame, (MENU_LEFT, MENU_TOP - 60), (MENU_LEFT + MENU_WIDTH, MENU_TOP), (40, 90, 200), -1)
+    cv2.putText(frame, "Mechanic", (MENU_LEFT + 10, MENU_TOP - 20), FONT, 0.9, (255, 255, 255), 2)
+    for i, name in enumerate(rows):
+        top = MENU_TOP + i * ROW_HEIGHT
+        if i == selected:
+            cv2.rectangle(frame, (MENU_LEFT, top), (MENU_LEFT + MENU_WIDTH, top + ROW_HEIGHT - 2), (240, 240, 240), -1)
+            color = (10, 10, 10)
+        else:
+            cv2.rectangle(frame, (MENU_LEFT, top), (MENU_LEFT + MENU_WIDTH, top + ROW_HEIGHT - 2), (15, 15, 15), -1)
+            color = (235, 235, 235)
+        cv2.putText(frame, name, (MENU_LEFT + 12, top + 26), FONT, 0.7, color, 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("out_dir")
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    search_dict, _ = load_vehicle_database()
+    keys = sorted(k for k in search_dict
+                  if 3 <= len(k) <= 24 and "mechanic" in vehicle_contexts(search_dict[k]))
+    garage = rng.sample(keys, 40)
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    labels = {}
+    cursor, page_top = 0, 0
+    for i in range(args.frames):
+        name = f"{i + 1:04d}.png"
+        frame = _background(rng)
+
+        if rng.random() < 0.15:
+            # Menüsüz kare: beklenen araç yok, OCR'a hiçbir şey gitmemeli
+            labels[name] = {"expected": None, "ocr": [], "header": "", "rows": []}
+        else:
+            # Ok tuşu ile gezinme: çoğunlukla aynı satırda beklenir
+            step = rng.choice([0, 0, 0, 1, 1, -1])
+            cursor = max(0, min(len(garage) - 1, cursor + step))
+            if cursor < page_top:
+                page_top = cursor
+            elif cursor >= page_top + VISIBLE_ROWS:
+                page_top = cursor - VISIBLE_ROWS + 1
+            rows = garage[page_top:page_top + VISIBLE_ROWS]
+            _draw_menu(frame, rows, cursor - page_top)
+            key = garage[cursor]
+            labels[name] = {
+                "expected": search_dict[key].get("Vehicle Name"),
+                "ocr": [_noisy(key, rng)],
+                "header": "Mechanic",
+                "rows": [
+                    {"y": MENU_TOP + i * ROW_HEIGHT + (ROW_HEIGHT - 2) / 2, "ocr": _noisy(row, rng)}
+                    for i, row in enumerate(rows)
+                ],
+            }
+
+        cv2.imwrite(os.path.join(args.out_dir, name), frame)
+
+    with open(os.path.join(args.out_dir, "labels.json"), "w", encoding="utf-8") as f:
+        json.dump(labels, f, indent=2, ensure_ascii=False)
+    print(f"{args.frames} kare yazıldı: {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
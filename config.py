@@ -5,7 +5,8 @@ import os
 import sys
 import copy
 import tempfile
-from typing import Dict, Any
+import threading
+from typing import Dict, Any, Optional, Tuple
 import logging
 
 
@@ -13,7 +14,7 @@ VERSION = "04032026.04"
 
 def setup_logging() -> None:
     """Loglama yapılandırmasını başlatır (konsol + dosya)."""
-    log_dir = os.path.join(os.getenv('LOCALAPPDATA'), "GtaAsistan")
+    log_dir = DATA_DIR
     os.makedirs(log_dir, exist_ok=True)
 
     global LOG_FILE
@@ -59,7 +60,8 @@ def get_app_dir() -> str:
 
 APP_DIR = get_app_dir()
 # Kullanıcı verilerini LocalAppData içinde sakla
-DATA_DIR = os.path.join(os.getenv('LOCALAPPDATA'), "GtaAsistan")
+# (Windows dışı ortamlarda — ör. Linux'ta kayıttan oynatma/benchmark — ev dizinine düş)
+DATA_DIR = os.path.join(os.getenv('LOCALAPPDATA') or os.path.expanduser("~"), "GtaAsistan")
 os.makedirs(DATA_DIR, exist_ok=True)
 
 CONFIG_FILE = os.path.join(DATA_DIR, "config.json")
@@ -103,6 +105,29 @@ BASELINE_CONFIG: Dict[str, Any] = {
         "height": 1510
     },
     "autopilot": True,
+    "ocr": {
+        "active_fps": 8,     # Menü açıkken tarama hızı (kare/sn)
+        "idle_fps": 2,       # Menü yokken tarama hızı (kare/sn)
+        "idle_after": 3.0,   # Şerit bu kadar saniye görülmezse boşta hıza düş
+        "cpu_budget": 0.5,   # OCR döngüsünün bir çekirdekte kullanabileceği en fazla pay
+        "frame_source": "live",      # "live" (ekran) veya kayıtlı kare klasörü / video dosyası yolu
+        "replay_loop": False,        # Kayıtlı kaynak bitince başa sar
+        "require_gta_focus": True,   # False ise GTA pencere odağı kontrolü atlanır
+        "highlight_detector": "contour",  # Seçili satır tespiti: "contour" veya "projection" (satır izdüşümü)
+        "menu_layout_cache": False,  # Görünen menü satırlarını bir kez oku, seçimi konumdan çöz (WinOCR)
+        "track_highlight": True,     # Şeridi son konumu etrafındaki bantta ara (sayfa düzeni kapalıyken)
+        "full_scan_every": 15,       # Bant takibinde bu kadar karede bir tam yükseklik taraması
+        "tesseract_backend": "auto", # "auto", "tesserocr", "capi" (libtesseract) veya "pytesseract"
+        "tesseract_stitch": True,    # Karedeki tüm ROI'leri tek sayfaya dizip tek OCR çağrısıyla oku
+        "tesseract_workers": 0,      # >0 ise ROI'leri bu kadar işçi süreçte paralel oku (0 = kapalı)
+        "garage_first": True,        # Önce garajdaki araçlarla eşleştir, bulunamazsa tüm veritabanı
+        "match_engine": "trigram",   # Bulanık eşleştirme kısa listesi: "trigram" veya "tfidf" (vektörel)
+        "vote_window": 4,            # HUD oylaması: son bu kadar karede...
+        "vote_required": 2,          # ...en az bu kadar görülen araç yayınlanır (1 = oylama yok)
+        "vote_fast_score": 95,       # HUD boşken bu skor ve üzeri ilk eşleşme beklemeden yayınlanır
+        "menu_context": True,        # Menü başlığından (Pegasus/Mechanic/Interaction) aday kümesini daralt
+        "show_perf_stats": False     # StatusHUD'da etkin FPS ve OCR gecikmesini göster
+    },
     "last_resolution": [2560, 1600], # Son kullanılan çözünürlüğü takip et
     "ui_geometry": {
         "LauncherWindow": {"width": 700, "height": 500, "x": -1, "y": -1},
@@ -151,22 +176,65 @@ def get_scaled_default_config() -> Dict[str, Any]:
     print(f"[CONFIG] Çözünürlük algılandı: {current_w}x{current_h}. Ayarlar ölçeklendi.")
     return config
 
-def load_config() -> Dict[str, Any]:
-    """Config dosyasını yükler, yoksa oluşturur."""
+# Bellek içi config kopyası. Yalnızca dosya değişikliklerini bildiren bir
+# izleyici (file_watcher.FileWatcher) çalışan süreçte açılır; izleyicisiz
+# süreçler (ör. launcher) her çağrıda diski okumaya devam eder.
+_config_cache: Optional[str] = None  # JSON metni: json.loads her çağrıda deepcopy'den ucuz bağımsız kopya verir
+_config_cache_enabled = False
+_config_generation = 0  # Her geçersiz kılmada artar (eski okumanın önbelleğe yazılmasını engeller)
+_config_lock = threading.Lock()
+
+def enable_config_cache() -> None:
+    """load_config sonuçlarını, invalidate_config_cache çağrılana kadar bellekte tutar."""
+    global _config_cache_enabled
+    _config_cache_enabled = True
+
+def invalidate_config_cache() -> None:
+    """Config dosyası değişti: bir sonraki load_config diskten okur."""
+    global _config_cache, _config_generation
+    with _config_lock:
+        _config_cache = None
+        _config_generation += 1
+
+def _read_config() -> Tuple[Dict[str, Any], bool]:
+    """Config'i diskten okur; (ayarlar, önbelleğe yazılabilir mi).
+
+    Okuma/ayrıştırma hatasında dönen varsayılanlar geçicidir (dosya yazılırken
+    okunmuş olabilir); önbelleğe alınırsa dosya düzelse de geri dönülmez.
+    """
     if not os.path.exists(CONFIG_FILE):
         default_cfg = get_scaled_default_config()
         save_config(default_cfg)
-        return default_cfg
+        return default_cfg, True
     
     try:
         with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
+            return json.load(f), True
     except (json.JSONDecodeError, IOError) as e:
         print(f"[HATA] Config dosyası okunamadı: {e}")
-        return get_scaled_default_config()
+        return get_scaled_default_config(), False
+
+def load_config() -> Dict[str, Any]:
+    """Config dosyasını yükler, yoksa oluşturur.
+
+    Önbellek açıksa dosya yalnızca değiştikten sonra bir kez okunur; çağıran
+    sonucu değiştirip save_config'e verebilsin diye her seferinde kopya döner.
+    """
+    global _config_cache
+    with _config_lock:
+        if _config_cache_enabled and _config_cache is not None:
+            return json.loads(_config_cache)
+        generation = _config_generation
+    
+    config_data, cacheable = _read_config()
+    with _config_lock:
+        if _config_cache_enabled and cacheable and generation == _config_generation:
+            _config_cache = json.dumps(config_data, ensure_ascii=False)
+    return config_data
 
 def save_config(config_data: Dict[str, Any]) -> None:
-    """Config dosyasını atomik şekilde kaydeder."""
+    """Config dosyasını atomik şekilde kaydeder (önbellek açıksa onu da günceller)."""
+    global _config_cache, _config_generation
     temp_fd = None
     temp_path = None
     try:
@@ -182,6 +250,11 @@ def save_config(config_data: Dict[str, Any]) -> None:
             os.replace(temp_path, CONFIG_FILE)
         else:
             os.rename(temp_path, CONFIG_FILE)
+        
+        with _config_lock:
+            _config_generation += 1  # Kayıttan önce başlamış okumalar eski dosyayı önbelleğe yazmasın
+            if _config_cache_enabled:
+                _config_cache = json.dumps(config_data, ensure_ascii=False)
     except IOError as e:
         print(f"[HATA] Config kaydedilemedi: {e}")
         # Cleanup
@@ -1,95 +1,200 @@
 # database.py
 """Araç veritabanı ve garaj yönetimi modülü."""
 import json
+import logging
 import re
 import os
 import tempfile
 import threading
-from typing import Optional, Tuple, List, Dict
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+import numpy as np
 from config import APP_DIR, DATA_DIR
 
 # === Garaj Sistemi ===
 GARAGE_FILE = os.path.join(DATA_DIR, "garajim.json")
 
-# Basit dosya cache (Tekrar tekrar disk okumasını önler)
-_garage_cache: Optional[List[str]] = None
-_garage_mtime: float = 0
-_garage_lock = threading.RLock()  # Thread-safe erişim için (Reentrant)
+class GarageStore:
+    """Garajın bellekteki tek kopyası: sıralı liste, küme ve sürüm sayacı.
 
-def load_garage() -> List[str]:
-    """Kayıtlı araç listesini yükler (cache destekli, thread-safe)."""
-    global _garage_cache, _garage_mtime
-    
-    with _garage_lock:
-        if not os.path.exists(GARAGE_FILE):
-            _garage_cache = []
-            return []
-        
-        try:
-            current_mtime = os.path.getmtime(GARAGE_FILE)
-            # Cache hâlâ geçerliyse dosyadan tekrar okuma
-            if _garage_cache is not None and current_mtime <= _garage_mtime:
-                return list(_garage_cache)  # Kopya döndür
-            
-            with open(GARAGE_FILE, "r", encoding="utf-8") as f:
-                _garage_cache = json.load(f)
-                _garage_mtime = current_mtime
-                return list(_garage_cache)  # Kopya döndür
-        except (json.JSONDecodeError, IOError) as e:
-            print(f"[UYARI] Garaj dosyası okunamadı: {e}")
-            return []
+    Sıcak yollar (rozetler, filtreler, tavsiyeler) ``names()``, ``owned()`` ve
+    ``in`` ile disk erişimi olmadan okur; dosya yalnızca ``reload()`` ile
+    okunur. İçerik her değiştiğinde sürüm artar ve aboneler yeni sürümle
+    çağrılır. Bir ``pyqtSignal(int)``'in ``emit`` metodu abone olarak
+    verilirse bildirim, hangi thread'den gelirse gelsin Qt olay döngüsüne
+    sıraya alınır.
+    """
 
-def save_garage(garage_list: List[str]) -> None:
-    """Listeyi dosyaya atomik şekilde kaydeder ve cache'i günceller (thread-safe)."""
-    global _garage_cache, _garage_mtime
-    
-    with _garage_lock:
-        temp_fd = None
-        temp_path = None
-        try:
-            # Atomik yazma: temp file + rename
-            dir_path = os.path.dirname(GARAGE_FILE) or "."
-            temp_fd, temp_path = tempfile.mkstemp(dir=dir_path, prefix=".tmp_garage_", suffix=".json", text=True)
-            
-            with os.fdopen(temp_fd, 'w', encoding='utf-8') as f:
-                temp_fd = None  # fdopen aldı
-                json.dump(garage_list, f, indent=4, ensure_ascii=False)
-            
-            # Atomik taşıma
-            if os.path.exists(GARAGE_FILE):
-                os.replace(temp_path, GARAGE_FILE)
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.RLock()  # Thread-safe erişim için (Reentrant)
+        self._names: Tuple[str, ...] = ()
+        self._owned: FrozenSet[str] = frozenset()
+        self._version = 0
+        self._mtime = 0.0
+        self._loaded = False
+        self._subscribers: List[Callable[[int], None]] = []
+
+    @property
+    def version(self) -> int:
+        """İçerik her değiştiğinde artar (bağlı indeksler yeniden kurulur)."""
+        self._ensure_loaded()
+        return self._version
+
+    def names(self) -> Tuple[str, ...]:
+        """Eklenme sırasıyla garaj (değişmez anlık görüntü, kopyalanmaz)."""
+        self._ensure_loaded()
+        return self._names
+
+    def owned(self) -> FrozenSet[str]:
+        """O(1) üyelik kontrolü için garaj kümesi."""
+        self._ensure_loaded()
+        return self._owned
+
+    def __contains__(self, vehicle_name: str) -> bool:
+        return vehicle_name in self.owned()
+
+    def __len__(self) -> int:
+        return len(self.names())
+
+    def subscribe(self, callback: Callable[[int], None]) -> None:
+        """Garaj değiştiğinde ``callback(version)`` çağrılır."""
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[int], None]) -> None:
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            self.reload()
+
+    def _replace(self, names: List[str]) -> Optional[int]:
+        """Kilit altında çağrılır; içerik değiştiyse yeni sürümü döndürür."""
+        names = tuple(names)
+        if names == self._names:
+            return None
+        self._names = names
+        self._owned = frozenset(names)
+        self._version += 1
+        return self._version
+
+    def _notify(self, version: Optional[int]) -> None:
+        """Aboneleri kilit dışında çağırır (abone tekrar okuyabilsin)."""
+        if version is None:
+            return
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(version)
+            except Exception as e:
+                logging.error(f"[HATA] Garaj abonesi başarısız: {e}")
+
+    def reload(self) -> bool:
+        """Dosya değiştiyse yeniden okur; içerik değiştiyse True döner."""
+        with self._lock:
+            self._loaded = True
+            if not os.path.exists(self.path):
+                self._mtime = 0.0
+                version = self._replace([])
             else:
-                os.rename(temp_path, GARAGE_FILE)
-            
-            # Cache'i güncelle
-            _garage_cache = list(garage_list)
-            _garage_mtime = os.path.getmtime(GARAGE_FILE)
-        except IOError as e:
-            print(f"[HATA] Garaj kaydedilemedi: {e}")
-            # Cleanup
-            if temp_fd is not None:
-                try:
-                    os.close(temp_fd)
-                except:
-                    pass
-            if temp_path and os.path.exists(temp_path):
                 try:
-                    os.remove(temp_path)
-                except:
-                    pass
+                    current_mtime = os.path.getmtime(self.path)
+                    # Önbellek hâlâ geçerliyse dosyadan tekrar okuma
+                    if self._mtime and current_mtime <= self._mtime:
+                        return False
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        garage = json.load(f)
+                    self._mtime = current_mtime
+                    version = self._replace(garage)
+                except (json.JSONDecodeError, IOError) as e:
+                    print(f"[UYARI] Garaj dosyası okunamadı: {e}")
+                    return False
+        self._notify(version)
+        return version is not None
+
+    def save(self, garage_list: List[str]) -> None:
+        """Listeyi dosyaya atomik şekilde kaydeder ve bellekteki kopyayı günceller."""
+        self._notify(self._write(garage_list))
+
+    def _write(self, garage_list: List[str]) -> Optional[int]:
+        """Atomik kayıt; içerik değiştiyse yeni sürümü döndürür. Aboneleri çağırmaz."""
+        with self._lock:
+            temp_fd = None
+            temp_path = None
+            try:
+                # Atomik yazma: temp file + rename
+                dir_path = os.path.dirname(self.path) or "."
+                temp_fd, temp_path = tempfile.mkstemp(dir=dir_path, prefix=".tmp_garage_", suffix=".json", text=True)
+                
+                with os.fdopen(temp_fd, 'w', encoding='utf-8') as f:
+                    temp_fd = None  # fdopen aldı
+                    json.dump(list(garage_list), f, indent=4, ensure_ascii=False)
+                
+                # Atomik taşıma
+                if os.path.exists(self.path):
+                    os.replace(temp_path, self.path)
+                else:
+                    os.rename(temp_path, self.path)
+                
+                self._loaded = True
+                self._mtime = os.path.getmtime(self.path)
+                version = self._replace(garage_list)
+            except IOError as e:
+                print(f"[HATA] Garaj kaydedilemedi: {e}")
+                # Cleanup
+                if temp_fd is not None:
+                    try:
+                        os.close(temp_fd)
+                    except:
+                        pass
+                if temp_path and os.path.exists(temp_path):
+                    try:
+                        os.remove(temp_path)
+                    except:
+                        pass
+                return None
+        return version
+
+    def toggle(self, vehicle_name: str) -> bool:
+        """Aracı varsa siler, yoksa ekler. Sonuç: True=eklendi, False=silindi."""
+        with self._lock:
+            garage = list(self.names())
+            if vehicle_name in self._owned:
+                garage.remove(vehicle_name)
+                status = False
+            else:
+                garage.append(vehicle_name)
+                status = True
+            # Oku-değiştir-yaz kilit altında; aboneler kilit bırakıldıktan sonra çağrılır
+            version = self._write(garage)
+        self._notify(version)
+        return status
+
+# Uygulama genelinde paylaşılan garaj (main, ui, workers ve bu modül)
+garage_store = GarageStore(GARAGE_FILE)
+
+def get_garage_version() -> int:
+    """Garaj sürüm sayacı; içerik değiştikçe artar."""
+    return garage_store.version
+
+def load_garage() -> List[str]:
+    """Dosyayı değiştiyse yeniden okur ve garajın kopyasını döndürür.
+
+    Sıcak yollar bunun yerine ``garage_store.names()``/``owned()`` kullanır.
+    """
+    garage_store.reload()
+    return list(garage_store.names())
+
+def save_garage(garage_list: List[str]) -> None:
+    """Listeyi dosyaya atomik şekilde kaydeder (thread-safe)."""
+    garage_store.save(garage_list)
 
 def toggle_vehicle_ownership(vehicle_name: str) -> bool:
     """Aracı varsa siler, yoksa ekler. Sonuç: True=eklendi, False=silindi. Thread-safe."""
-    with _garage_lock:
-        garage = load_garage()
-        if vehicle_name in garage:
-            garage.remove(vehicle_name)
-            status = False
-        else:
-            garage.append(vehicle_name)
-            status = True
-        save_garage(garage)
-        return status
+    return garage_store.toggle(vehicle_name)
 
 def parse_number(text_val: Optional[str]) -> float:
     """Metin içinden sayısal değer çıkarır."""
@@ -98,31 +203,233 @@ def parse_number(text_val: Optional[str]) -> float:
     nums = re.findall(r"[-+]?\d*\.\d+|\d+", str(text_val).replace(',', ''))
     return float(nums[0]) if nums else 0.0
 
+def parse_lap_time(text_val: Optional[str]) -> float:
+    """"1:04.864" biçimindeki tur süresini saniyeye çevirir (yoksa 0)."""
+    if not text_val:
+        return 0.0
+    match = re.search(r"(?:(\d+):)?(\d+(?:\.\d+)?)", str(text_val))
+    if not match:
+        return 0.0
+    minutes, seconds = match.groups()
+    return int(minutes or 0) * 60 + float(seconds)
+
+# === Tipli Araç Kayıtları ===
+class VehicleRecord:
+    """Veritabanı satırının yükleme anında bir kez ayrıştırılmış sayısal/mantıksal alanları.
+
+    Sıralama, rozet ve analiz kodu bu alanları okur; görüntüleme için ham
+    sözlük ``raw`` olarak korunur.
+    """
+
+    __slots__ = ("raw", "name", "vehicle_class", "price", "top_speed", "acceleration",
+                 "lap_time", "seats", "mass", "bulletproof", "weaponized")
+
+    def __init__(self, car: Dict):
+        self.raw = car
+        self.name: str = car.get("Vehicle Name", "")
+        self.vehicle_class: str = car.get("Vehicle Class", "")
+        self.price = parse_number(car.get("GTA Online Price", "0"))
+        self.top_speed = parse_number(car.get("Top Speed (Broughy)", "0"))  # mph
+        self.acceleration = parse_number(car.get("Stat - Acceleration", "0"))
+        self.lap_time = parse_lap_time(car.get("Lap Time"))  # saniye
+        self.seats = int(parse_number(car.get("Seats", "0")))
+        self.mass = parse_number(car.get("Mass / Weight", "0"))  # kg
+        self.bulletproof = "Yes" in str(car.get("Bulletproof", "No"))
+        self.weaponized = "Weaponized" in str(car.get("Vehicle Features", ""))
+
+# "Vehicle Name" -> son yüklenen veritabanının kaydı
+_vehicle_records: Dict[str, VehicleRecord] = {}
+
+def vehicle_record(car: Dict) -> VehicleRecord:
+    """Araç sözlüğünün tipli kaydı; veritabanından gelmeyen sözlükler anında ayrıştırılır."""
+    record = _vehicle_records.get(car.get("Vehicle Name", ""))
+    if record is None or record.raw is not car:
+        record = VehicleRecord(car)
+    return record
+
+# === Sütunlu İstatistik Tablosu ===
+def _encode_labels(values: List[str]) -> Tuple[List[str], np.ndarray]:
+    """Metin sütununu tamsayı kodlarına çevirir; etiketler alfabetik sıradadır."""
+    labels = sorted(set(values))
+    codes = {label: code for code, label in enumerate(labels)}
+    return labels, np.fromiter((codes[v] for v in values), dtype=np.int32, count=len(values))
+
+class VehicleTable:
+    """Tüm veritabanının sütun tabanlı görünümü (satır i == db_data[i]).
+
+    Toplam, en büyük ve sıralama soruları her araç sözlüğünü dolaşmak yerine
+    NumPy dizileri üzerinde çalışır. Sınıf, üretici ve satıcı (``Acquisition``)
+    tamsayı kodlarıyla tutulur. Veritabanı her yüklendiğinde yeniden kurulur.
+    """
+
+    NUMERIC_COLUMNS = ("price", "top_speed", "acceleration", "braking", "handling", "overall")
+
+    def __init__(self, db_data: List[Dict]):
+        self.rows = db_data
+        records = [vehicle_record(car) for car in db_data]
+        count = len(records)
+        self.names: List[str] = [record.name for record in records]
+        # İsim -> satır (aynı isim tekrarlanırsa sonuncusu, eski isim->fiyat sözlüğü gibi)
+        self.positions: Dict[str, int] = {name: row for row, name in enumerate(self.names)}
+
+        self.price = np.fromiter((r.price for r in records), dtype=np.float64, count=count)
+        self.top_speed = np.fromiter((r.top_speed for r in records), dtype=np.float64, count=count)
+        self.acceleration = np.fromiter((r.acceleration for r in records), dtype=np.float64, count=count)
+        self.braking = np.fromiter((parse_number(car.get("Stat - Braking", "0")) for car in db_data),
+                                   dtype=np.float64, count=count)
+        self.handling = np.fromiter((parse_number(car.get("Stat - Handling", "0")) for car in db_data),
+                                    dtype=np.float64, count=count)
+        self.overall = np.fromiter((parse_number(car.get("Stat - Overall", "0")) for car in db_data),
+                                   dtype=np.float64, count=count)
+
+        self.class_labels, self.class_code = _encode_labels([r.vehicle_class for r in records])
+        self.manufacturer_labels, self.manufacturer_code = _encode_labels(
+            [car.get("Manufacturer", "") for car in db_data])
+        self.vendor_labels, self.vendor_code = _encode_labels(
+            [car.get("Acquisition", "") for car in db_data])
+        self.class_rankings = self._build_class_rankings()
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _build_class_rankings(self) -> Dict[str, "ClassRanking"]:
+        rankings = {}
+        for code, label in enumerate(self.class_labels):
+            ranked = self.sort_rows(np.flatnonzero(self.class_code == code), "top_speed", descending=True)
+            known = self.top_speed[ranked] > 0
+            # Her aracın önünde kalan hızı bilinen araç sayısı
+            ahead = np.cumsum(known) - known
+            ranks: Dict[str, int] = {}
+            for row, before in zip(ranked.tolist(), ahead.tolist()):
+                ranks.setdefault(self.names[row], before + 1)
+            rankings[label] = ClassRanking(ranked, ranks, int(np.count_nonzero(known)))
+        return rankings
+
+    def column(self, name: str) -> np.ndarray:
+        if name not in self.NUMERIC_COLUMNS:
+            raise KeyError(f"Bilinmeyen sütun: {name}")
+        return getattr(self, name)
+
+    def owned_rows(self, garage: Iterable[str]) -> np.ndarray:
+        """Adı garajda geçen satırlar (veritabanı sırasıyla)."""
+        owned = set(garage)
+        return np.fromiter((row for row, name in enumerate(self.names) if name in owned), dtype=np.intp)
+
+    def class_rows(self, vehicle_class: str) -> np.ndarray:
+        """Verilen sınıftaki satırlar (veritabanı sırasıyla)."""
+        try:
+            code = self.class_labels.index(vehicle_class)
+        except ValueError:
+            return np.empty(0, dtype=np.intp)
+        return np.flatnonzero(self.class_code == code)
+
+    def sort_rows(self, rows: Iterable[int], column: str, descending: bool = False) -> np.ndarray:
+        """Satırları sütuna göre kararlı sıralar (eşitlerde sıra korunur, ``sorted`` gibi)."""
+        rows = np.asarray(rows, dtype=np.intp)
+        values = self.column(column)[rows]
+        return rows[np.argsort(-values if descending else values, kind="stable")]
+
+    def top_row(self, rows: np.ndarray, column: str) -> int:
+        """Sütunu en büyük ilk satır (``max`` gibi eşitlikte önce gelen)."""
+        return int(rows[np.argmax(self.column(column)[rows])])
+
+    def total(self, rows: np.ndarray, column: str) -> float:
+        return float(self.column(column)[rows].sum())
+
+    def class_counts(self, rows: np.ndarray) -> List[Tuple[str, int]]:
+        """Satırların sınıf dağılımı; çoktan aza, eşitlikte ilk görülen önce."""
+        codes, first, counts = np.unique(self.class_code[rows], return_index=True, return_counts=True)
+        order = np.lexsort((first, -counts))
+        return [(self.class_labels[codes[i]], int(counts[i])) for i in order]
+
+    def garage_value(self, garage: Iterable[str]) -> float:
+        """Garajdaki araçların toplam fiyatı (veritabanında olmayanlar atlanır)."""
+        rows = [self.positions[name] for name in garage if name in self.positions]
+        return self.total(np.asarray(rows, dtype=np.intp), "price")
+
+class ClassRanking:
+    """Bir sınıfın hız sıralaması; tablo kurulurken bir kez hesaplanır."""
+
+    __slots__ = ("rows", "ranks", "total")
+
+    def __init__(self, rows: np.ndarray, ranks: Dict[str, int], total: int):
+        self.rows = rows      # Hıza göre azalan satırlar
+        self.ranks = ranks    # Araç adı -> sınıf içi hız sırası
+        self.total = total    # Hızı bilinen araç sayısı
+
+    def rank_of(self, vehicle_name: str) -> int:
+        """Sınıfta olmayan araç, hızı bilinen tüm araçların arkasına düşer."""
+        return self.ranks.get(vehicle_name, self.total + 1)
+
+class GarageOverlay:
+    """Garaja bağlı sınıf özetleri; garaj sürümü değişince yeniden kurulur."""
+
+    __slots__ = ("table", "version", "owned_in_class", "fastest_owned")
+
+    def __init__(self, table: VehicleTable, garage: Iterable[str], version: int):
+        self.table = table
+        self.version = version
+        rows = table.owned_rows(garage)
+        codes = table.class_code[rows]
+        # Sınıf, azalan hız, veritabanı sırası: her sınıfın ilk satırı en hızlı sahip olunan
+        order = np.lexsort((rows, -table.top_speed[rows], codes))
+        sorted_codes = codes[order]
+        class_codes, first, counts = np.unique(sorted_codes, return_index=True, return_counts=True)
+        labels = [table.class_labels[code] for code in class_codes.tolist()]
+        self.owned_in_class: Dict[str, int] = dict(zip(labels, counts.tolist()))
+        self.fastest_owned: Dict[str, str] = {
+            label: table.names[rows[order[i]]] for label, i in zip(labels, first.tolist())}
+
+# Son yüklenen veritabanının tablosu ve garaj katmanı
+_vehicle_table: Optional[VehicleTable] = None
+_garage_overlay: Optional[GarageOverlay] = None
+
+def vehicle_table(db_data: List[Dict]) -> VehicleTable:
+    """``db_data`` listesinin sütunlu tablosu; liste değiştiyse yeniden kurulur."""
+    global _vehicle_table
+    table = _vehicle_table
+    if table is None or table.rows is not db_data:
+        table = _vehicle_table = VehicleTable(db_data)
+    return table
+
+def garage_overlay(table: VehicleTable) -> GarageOverlay:
+    """Tablonun garaj katmanı; yalnızca garaj ya da tablo değiştiyse yeniden hesaplanır."""
+    global _garage_overlay
+    overlay = _garage_overlay
+    version = garage_store.version
+    if overlay is None or overlay.table is not table or overlay.version != version:
+        overlay = _garage_overlay = GarageOverlay(table, garage_store.names(), version)
+    return overlay
+
 # === Garaj İstatistikleri ===
 def get_garage_stats(db_data: List[Dict]) -> Tuple[int, str]:
     """Garajdaki araç sayısını ve toplam değerini hesaplar."""
-    my_garage = load_garage()
+    my_garage = garage_store.names()
     total_count = len(my_garage)
-    total_value = 0.0
-    
-    # Hızlandırmak için isim->fiyat sözlüğü oluştur
-    price_map = {car.get("Vehicle Name"): car.get("GTA Online Price", "0") for car in db_data}
-    
-    for v_name in my_garage:
-        if v_name in price_map:
-            price = parse_number(price_map[v_name])
-            total_value += price
+    total_value = vehicle_table(db_data).garage_value(my_garage)
             
     # Formatlı string döndür (Örn: $125,000,000)
     formatted_value = "${:,.0f}".format(total_value)
     return total_count, formatted_value
 
 # === Veritabanı Yükleme ===
+VEHICLE_DB_FILE = os.path.join(APP_DIR, "gta_tum_araclar.json")
+
+def get_vehicle_database_mtime() -> float:
+    """Veritabanı dosyasının son değişme zamanını döndürür (yoksa 0)."""
+    try:
+        return os.path.getmtime(VEHICLE_DB_FILE)
+    except OSError:
+        return 0.0
+
 def load_vehicle_database() -> Tuple[Dict, List[Dict]]:
-    """Ana araç veritabanını yükler."""
+    """Ana araç veritabanını yükler; tipli kayıtları ve sütunlu tabloyu bir kez kurar."""
+    global _vehicle_records, _vehicle_table
     try:
-        with open(os.path.join(APP_DIR, "gta_tum_araclar.json"), "r", encoding="utf-8") as f:
+        with open(VEHICLE_DB_FILE, "r", encoding="utf-8") as f:
             db_data = json.load(f)
+            _vehicle_records = {car.get("Vehicle Name", ""): VehicleRecord(car) for car in db_data}
+            _vehicle_table = VehicleTable(db_data)
             search_dict = {} 
             for car in db_data:
                 full_name = car.get("Vehicle Name", "")
@@ -134,7 +441,7 @@ def load_vehicle_database() -> Tuple[Dict, List[Dict]]:
             print(f"[DEBUG] Veritabanı yüklendi: {len(db_data)} araç, {len(search_dict)} aranabilir.")
             return search_dict, db_data
     except FileNotFoundError:
-        print(f"[HATA] gta_tum_araclar.json dosyası bulunamadı! Yol: {os.path.join(APP_DIR, 'gta_tum_araclar.json')}")
+        print(f"[HATA] gta_tum_araclar.json dosyası bulunamadı! Yol: {VEHICLE_DB_FILE}")
         return {}, []
     except (json.JSONDecodeError, IOError) as e:
         print(f"[HATA] Veritabanı okunamadı: {e}")
@@ -148,20 +455,19 @@ def get_smart_badges(vehicle_data: Dict, for_hud: bool = False) -> List[Tuple[st
         for_hud: True ise HUD (OCR) bağlamı — SAHİPSİN rozeti atlanır
                  çünkü menülerde sadece sahip olunan araçlar görünür.
     """
-    price = parse_number(vehicle_data.get("GTA Online Price", "0"))
-    speed = parse_number(vehicle_data.get("Top Speed (Broughy)", "0"))
-    accel = parse_number(vehicle_data.get("Stat - Acceleration", "0"))
-    bulletproof = str(vehicle_data.get("Bulletproof", "No"))
-    features = str(vehicle_data.get("Vehicle Features", ""))
+    record = vehicle_record(vehicle_data)
+    price = record.price
+    speed = record.top_speed
+    accel = record.acceleration
     
-    vehicle_name = vehicle_data.get("Vehicle Name", "")
+    vehicle_name = record.name
 
     badges = []
     
     # Araç özelliklerini kontrol et
-    if "Yes" in bulletproof:
+    if record.bulletproof:
         badges.append(("🛡️ ZIRHLI", "#0984e3"))
-    if "Weaponized" in features:
+    if record.weaponized:
         badges.append(("⚔️ SİLAHLI", "#d63031"))
     if price <= 1200000 and speed >= 115:
         badges.append(("🔥 F/P CANAVARI", "#e17055"))
@@ -177,8 +483,7 @@ def get_smart_badges(vehicle_data: Dict, for_hud: bool = False) -> List[Tuple[st
     # SAHİPLİK Durumu — Sadece Galeri'de göster (HUD'da gereksiz,
     # çünkü mekanik/pegasus menülerinde zaten sadece sahip olunan araçlar var)
     if not for_hud:
-        my_garage = load_garage()
-        if vehicle_name in my_garage:
+        if vehicle_name in garage_store:
             badges.insert(0, ("✅ SAHİPSİN", "#2ecc71"))
         
     return badges
@@ -194,35 +499,23 @@ def get_vehicle_advice(vehicle_data: Dict, db_data: List[Dict]) -> List[Tuple[st
     """
     advice = []
     
-    vehicle_name = vehicle_data.get("Vehicle Name", "")
-    vehicle_class = vehicle_data.get("Vehicle Class", "")
-    speed = parse_number(vehicle_data.get("Top Speed (Broughy)", "0"))
+    record = vehicle_record(vehicle_data)
+    vehicle_name = record.name
+    vehicle_class = record.vehicle_class
+    speed = record.top_speed
     
     if not vehicle_class or not vehicle_name:
         return advice
     
-    # Aynı sınıftaki TÜM araçları bul (veritabanından)
-    class_vehicles = [v for v in db_data if v.get("Vehicle Class") == vehicle_class]
+    # Sınıf sıralaması veritabanı yüklenirken hazırlanır
+    table = vehicle_table(db_data)
+    ranking = table.class_rankings.get(vehicle_class)
     
-    if not class_vehicles or speed <= 0:
+    if ranking is None or speed <= 0:
         return advice
     
-    # Sınıf içi hız sıralaması hesapla
-    class_speeds = sorted(
-        [(v.get("Vehicle Name", ""), parse_number(v.get("Top Speed (Broughy)", "0"))) 
-         for v in class_vehicles],
-        key=lambda x: x[1], reverse=True
-    )
-    
-    # Bu aracın sırasını bul
-    rank = 1
-    for name, spd in class_speeds:
-        if name == vehicle_name:
-            break
-        if spd > 0:
-            rank += 1
-    
-    total_in_class = len([s for s in class_speeds if s[1] > 0])
+    rank = ranking.rank_of(vehicle_name)
+    total_in_class = ranking.total
     
     # 1. Sınıfının en hızlısı mı?
     if rank == 1:
@@ -233,19 +526,14 @@ def get_vehicle_advice(vehicle_data: Dict, db_data: List[Dict]) -> List[Tuple[st
         advice.append((f"📊 Sınıf hız sırası: {rank}/{total_in_class}", "#AAAAAA"))
     
     # 2. Bu sınıfta kaç aracın var? (garajdakiler)
-    my_garage = load_garage()
-    owned_in_class = [v for v in class_vehicles if v.get("Vehicle Name", "") in my_garage]
-    if len(owned_in_class) > 1:
-        advice.append((f"🏠 Bu sınıfta {len(owned_in_class)} aracın var", "#636e72"))
+    overlay = garage_overlay(table)
+    owned_in_class = overlay.owned_in_class.get(vehicle_class, 0)
+    if owned_in_class > 1:
+        advice.append((f"🏠 Bu sınıfta {owned_in_class} aracın var", "#636e72"))
     
     # 3. Garajındaki en hızlı mı bu sınıfta?
-    if len(owned_in_class) > 1:
-        owned_speeds = sorted(
-            owned_in_class,
-            key=lambda v: parse_number(v.get("Top Speed (Broughy)", "0")),
-            reverse=True
-        )
-        fastest_owned = owned_speeds[0].get("Vehicle Name", "")
+    if owned_in_class > 1:
+        fastest_owned = overlay.fastest_owned[vehicle_class]
         if fastest_owned == vehicle_name:
             advice.append(("⭐ Garajındaki en hızlı!", "#ffeaa7"))
         else:
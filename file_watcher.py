@@ -0,0 +1,98 @@
+# file_watcher.py
+"""Veri dosyaları için değişiklik izleyicisi.
+
+Garaj, config ve araç veritabanı bellekte tutulur; dosya gerçekten
+değiştiğinde (mtime/boyut imzası) abonelere haber verilir, onlar da kendi
+kopyalarını yeniden yükler. Atomik kayıt (``os.replace``) dosyanın kendi
+izini düşürdüğü için dosyalar değil, bulundukları dizinler
+``QFileSystemWatcher`` ile izlenir. İzleyici bir dizini ekleyemezse o süreç
+için yoklamaya (QTimer) düşülür.
+"""
+import logging
+import os
+from typing import Callable, Dict, List, Optional, Tuple
+
+from PyQt5.QtCore import QFileSystemWatcher, QObject, QTimer, pyqtSignal
+
+POLL_INTERVAL_MS = 2000  # İzleyici kurulamazsa yoklama aralığı
+SETTLE_DELAY_MS = 150    # Tek kayıttaki ardışık dizin olaylarını birleştirme süresi
+
+FileSignature = Optional[Tuple[int, int]]  # (mtime_ns, boyut); dosya yoksa None
+
+
+def file_signature(path: str) -> FileSignature:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class FileWatcher(QObject):
+    """Kayıtlı dosyalar değiştiğinde geri çağırımları ve ``file_changed`` sinyalini tetikler.
+
+    Dizin olayları (geçici dosya oluşturma, yeniden adlandırma) kısa bir
+    bekleme ile birleştirilir; yalnızca imzası değişen dosyalar bildirilir.
+    """
+
+    file_changed = pyqtSignal(str)  # Değişen dosyanın tam yolu
+
+    def __init__(self, poll_interval_ms: int = POLL_INTERVAL_MS, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._callbacks: Dict[str, List[Callable[[], None]]] = {}
+        self._signatures: Dict[str, FileSignature] = {}
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._schedule_check)
+        self._watcher.fileChanged.connect(self._schedule_check)
+
+        self._settle_timer = QTimer(self)
+        self._settle_timer.setSingleShot(True)
+        self._settle_timer.setInterval(SETTLE_DELAY_MS)
+        self._settle_timer.timeout.connect(self.check)
+
+        self._poll_timer = QTimer(self)
+        self._poll_timer.setInterval(poll_interval_ms)
+        self._poll_timer.timeout.connect(self.check)
+
+    @property
+    def polling(self) -> bool:
+        """True ise en az bir dizin izlenemedi ve yoklama yapılıyor."""
+        return self._poll_timer.isActive()
+
+    def watch(self, path: str, callback: Optional[Callable[[], None]] = None) -> None:
+        """Dosyayı izlemeye alır; değiştiğinde ``callback()`` çağrılır."""
+        path = os.path.abspath(path)
+        callbacks = self._callbacks.setdefault(path, [])
+        if callback is not None:
+            callbacks.append(callback)
+        if path not in self._signatures:
+            self._signatures[path] = file_signature(path)
+
+        directory = os.path.dirname(path)
+        if directory in self._watcher.directories():
+            return
+        if not os.path.isdir(directory) or not self._watcher.addPath(directory):
+            logging.warning(f"[İZLEYİCİ] {directory} izlenemiyor, {self._poll_timer.interval()} ms yoklamaya geçildi.")
+            self._poll_timer.start()
+
+    def _schedule_check(self, _path: str = "") -> None:
+        self._settle_timer.start()  # Yeniden başlatma: olay fırtınası tek kontrole iner
+
+    def check(self) -> List[str]:
+        """İmzası değişen dosyaları bildirir ve listesini döndürür."""
+        changed = []
+        for path, previous in self._signatures.items():
+            current = file_signature(path)
+            if current != previous:
+                self._signatures[path] = current
+                changed.append(path)
+
+        for path in changed:
+            for callback in self._callbacks.get(path, ()):
+                try:
+                    callback()
+                except Exception as e:
+                    logging.error(f"[HATA] {os.path.basename(path)} değişikliği işlenemedi: {e}")
+            self.file_changed.emit(path)
+        return changed
@@ -0,0 +1,181 @@
+# frame_source.py
+"""OCR hattı için kare kaynakları: canlı ekran (mss), PNG klasörü ve video dosyası.
+
+Tüm kaynaklar mss ile aynı biçimde BGRA ``np.ndarray`` döndürür; böylece
+tespit ve eşleştirme hattı oyun olmadan (ör. Linux'ta) tekrar oynatılabilir.
+"""
+import glob
+import logging
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import cv2
+
+from vision import frame_from_buffer
+
+MAX_SCAN_WIDTH = 600     # Menü taraması için en fazla genişlik (px)
+SCAN_WIDTH_RATIO = 0.35  # ... veya ekran genişliğinin %35'i
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+def scan_width(screen_width: int) -> int:
+    """Ekranın sol tarafında taranacak şerit genişliği."""
+    return min(MAX_SCAN_WIDTH, int(screen_width * SCAN_WIDTH_RATIO))
+
+
+def _to_scan_frame(frame: np.ndarray) -> np.ndarray:
+    """Kaydedilmiş kareyi canlı yakalamayla aynı BGRA tarama bölgesine çevirir."""
+    if frame.ndim == 2:
+        frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2BGRA)
+    elif frame.shape[2] == 3:
+        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2BGRA)
+    # Tam ekran görüntüler sol şeride kırpılır; zaten kırpılmış kareler olduğu gibi kalır
+    if frame.shape[1] > MAX_SCAN_WIDTH:
+        frame = frame[:, :scan_width(frame.shape[1])]
+    return np.ascontiguousarray(frame)
+
+
+def _crop_band(frame: np.ndarray, band: Optional[Tuple[int, int]]) -> np.ndarray:
+    if band is None:
+        return frame
+    top, height = band
+    return frame[top:top + height]
+
+
+class FrameSource:
+    """Kare kaynağı arayüzü. ``with`` bloğu içinde kullanılır."""
+
+    #: Canlı kaynaklarda GTA pencere odağı kontrol edilir ve kareler zamanlayıcıyla alınır
+    live = False
+
+    def open(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def grab(self, band: Optional[Tuple[int, int]] = None) -> Optional[np.ndarray]:
+        """Sıradaki BGRA kareyi döndürür; kaynak bittiyse None.
+
+        ``band`` = (üst satır, yükseklik) verilirse yalnızca o satırlar döner.
+        """
+        raise NotImplementedError
+
+    def __enter__(self) -> "FrameSource":
+        self.open()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class MssFrameSource(FrameSource):
+    """Birincil monitörün sol şeridini mss ile canlı yakalar."""
+
+    live = True
+
+    def __init__(self, monitor_index: int = 1):
+        self.monitor_index = monitor_index
+        self.scan_rect: Dict[str, int] = {}
+        self._sct = None
+
+    def open(self) -> None:
+        import mss  # Sadece canlı kaynakta gerekli
+        self._sct = mss.mss()
+        monitor = self._sct.monitors[self.monitor_index]  # Birincil monitör
+        # Monitor alanı: {left, top, width, height}
+        self.scan_rect = {
+            "top": monitor["top"],
+            "left": monitor["left"],
+            "width": scan_width(monitor["width"]),  # Maksimum 600px veya ekranın %35'i
+            "height": monitor["height"]
+        }
+
+    def close(self) -> None:
+        if self._sct is not None:
+            self._sct.close()
+            self._sct = None
+
+    def grab(self, band: Optional[Tuple[int, int]] = None) -> Optional[np.ndarray]:
+        region = self.scan_rect
+        if band is not None:
+            # Yalnızca bandı kopyala: masaüstü çoğaltıcısından daha az bayt okunur
+            region = dict(region, top=region["top"] + band[0], height=band[1])
+        shot = self._sct.grab(region)
+        # Her ScreenShot kendi tamponunu taşır; kopyalamadan BGRA dizi olarak sar
+        return frame_from_buffer(shot.raw, shot.width, shot.height)
+
+
+class ImageDirFrameSource(FrameSource):
+    """Bir klasördeki ekran görüntülerini isim sırasıyla kare olarak verir."""
+
+    def __init__(self, directory: str, loop: bool = False):
+        self.directory = directory
+        self.loop = loop
+        self.paths: List[str] = sorted(
+            p for p in glob.glob(os.path.join(directory, "*"))
+            if p.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        self.current_path: Optional[str] = None
+        self._index = 0
+
+    def open(self) -> None:
+        self._index = 0
+        if not self.paths:
+            logging.warning(f"[FrameSource] Klasörde kare bulunamadı: {self.directory}")
+
+    def grab(self, band: Optional[Tuple[int, int]] = None) -> Optional[np.ndarray]:
+        while self._index < len(self.paths) or (self.loop and self.paths):
+            if self._index >= len(self.paths):
+                self._index = 0
+            path = self.paths[self._index]
+            self._index += 1
+            frame = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+            if frame is None:
+                logging.warning(f"[FrameSource] Kare okunamadı: {path}")
+                continue
+            self.current_path = path
+            return _crop_band(_to_scan_frame(frame), band)
+        return None
+
+
+class VideoFrameSource(FrameSource):
+    """Video dosyasındaki kareleri sırayla verir (ör. OBS kaydı)."""
+
+    def __init__(self, path: str, loop: bool = False):
+        self.path = path
+        self.loop = loop
+        self._cap = None
+
+    def open(self) -> None:
+        self._cap = cv2.VideoCapture(self.path)
+        if not self._cap.isOpened():
+            logging.warning(f"[FrameSource] Video açılamadı: {self.path}")
+
+    def close(self) -> None:
+        if self._cap is not None:
+            self._cap.release()
+            self._cap = None
+
+    def grab(self, band: Optional[Tuple[int, int]] = None) -> Optional[np.ndarray]:
+        ok, frame = self._cap.read()
+        if not ok and self.loop:
+            self._cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ok, frame = self._cap.read()
+        return _crop_band(_to_scan_frame(frame), band) if ok else None
+
+
+def open_frame_source(spec: str = "live", loop: bool = False) -> FrameSource:
+    """"live", bir klasör veya video dosyası yolundan kare kaynağı oluşturur."""
+    if not spec or spec == "live":
+        return MssFrameSource()
+    if os.path.isdir(spec):
+        return ImageDirFrameSource(spec, loop=loop)
+    return VideoFrameSource(spec, loop=loop)
+
+
+def create_frame_source(cfg: Dict[str, Any]) -> FrameSource:
+    """config.json'daki "ocr" -> "frame_source" değerine göre kaynak oluşturur."""
+    ocr_cfg = cfg.get("ocr", {})
+    return open_frame_source(ocr_cfg.get("frame_source", "live"), loop=ocr_cfg.get("replay_loop", False))
@@ -1,14 +1,17 @@
 # main.py
 """GTA Asistan - J.A.R.V.I.S Ana Modül"""
+import multiprocessing
 import sys
 from collections import OrderedDict
 from PyQt5.QtWidgets import QApplication, QSystemTrayIcon, QMenu, QAction
 from PyQt5.QtGui import QIcon, QPixmap, QPainter, QColor, QFont
-from PyQt5.QtCore import Qt
-from database import load_vehicle_database, toggle_vehicle_ownership
+from PyQt5.QtCore import Qt, QObject, pyqtSignal
+from database import (load_vehicle_database, toggle_vehicle_ownership, get_vehicle_database_mtime, garage_store,
+                      GARAGE_FILE, VEHICLE_DB_FILE)
+from file_watcher import FileWatcher
 from workers import OcrThread, HotkeyThread
 from ui import OverlayHUD, GalleryWindow, StatusHUD
-from config import load_config, setup_logging
+from config import CONFIG_FILE, enable_config_cache, invalidate_config_cache, load_config, setup_logging
 from history import VehicleHistory
 import i18n
 
@@ -42,6 +45,11 @@ class LRUCache:
         self.set(key, value)
 
 
+class GarageSignals(QObject):
+    """GarageStore bildirimlerini Qt sinyaline çevirir (her thread'den güvenli, kuyruklu)."""
+    changed = pyqtSignal(int)
+
+
 def create_tray_icon() -> QIcon:
     """Basit bir tray ikonu oluşturur (harici dosya gerekmez)."""
     pixmap = QPixmap(32, 32)
@@ -65,8 +73,11 @@ class JarvisApp:
         self.app = QApplication(sys.argv)
         self.app.setQuitOnLastWindowClosed(False)  # Tray'de çalışmaya devam etsin
         
+        # Config bellekte tutulur; dosya izleyicisi değişince geçersiz kılar
+        enable_config_cache()
         self.cfg = load_config()
         self.search_dict, self.db_data = load_vehicle_database()
+        self.db_mtime = get_vehicle_database_mtime()
         
         # O an hangi araca baktığımızı tutan değişken
         self.current_vehicle_data = None 
@@ -95,8 +106,21 @@ class JarvisApp:
         self.ocr_thread.vehicle_found_signal.connect(self.on_vehicle_found)
         self.ocr_thread.hide_hud_signal.connect(self.hud.hide) 
         self.ocr_thread.gta_window_active_signal.connect(self.toggle_windows_visibility) # YENİ: Akıllı Görünürlük Yönetimi
+        self.ocr_thread.stats_signal.connect(self.status_hud.update_perf_stats)
         self.ocr_thread.start()
         
+        # Garaj değişince HUD ve galeri yenilenir (F9, kart menüsü ya da dosya düzenlemesi)
+        self.garage_signals = GarageSignals()
+        self.garage_signals.changed.connect(self.on_garage_changed)
+        self.garage_signals.changed.connect(self.gallery.on_garage_changed)
+        garage_store.subscribe(self.garage_signals.changed.emit)
+        
+        # Dosya değişiklikleri: launcher ayarları, VeriÇek güncellemesi, elle düzenlenen garaj
+        self.file_watcher = FileWatcher()
+        self.file_watcher.watch(CONFIG_FILE, self.on_config_changed)
+        self.file_watcher.watch(GARAGE_FILE, garage_store.reload)
+        self.file_watcher.watch(VEHICLE_DB_FILE, self.check_database_update)
+        
         self.hotkey_thread = HotkeyThread()
         self.hotkey_thread.toggle_gallery_signal.connect(self.toggle_gallery)
         self.hotkey_thread.toggle_ownership_signal.connect(self.toggle_ownership)
@@ -221,9 +245,10 @@ class JarvisApp:
         """Uygulamadan tamamen çıkar. Thread'leri düzgün kapatır."""
         print(i18n.t("main.app_closing"))
         
-        # OCR thread'ini durdur
+        # OCR thread'ini durdur (döngü biterken Tesseract işçi havuzunu da kapatır)
         self.ocr_thread.running = False
-        self.ocr_thread.wait(2000)  # 2 saniye bekle
+        if not self.ocr_thread.wait(5000):  # 5 saniye bekle
+            print("[Main] OCR thread'i zamanında kapanmadı")
         
         # Hotkey thread'ini durdur
         self.hotkey_thread.stop()
@@ -245,6 +270,32 @@ class JarvisApp:
         if vehicle_name:
             self.vehicle_history.add(vehicle_name, vehicle_data)
 
+    def on_config_changed(self) -> None:
+        """config.json değişti (launcher ya da ayarlar penceresi): bağlı bileşenleri yeniler."""
+        invalidate_config_cache()
+        self.cfg = load_config()
+        self.ocr_thread.reload_config()
+        self.hud.apply_config()
+        self.status_hud.update_shortcut_text()
+        print("[BİLGİ] Ayarlar yeniden yüklendi.")
+
+    def check_database_update(self) -> None:
+        """Veritabanı dosyası değiştiyse yeniden yükler ve bağlı önbellekleri sıfırlar."""
+        mtime = get_vehicle_database_mtime()
+        if mtime == self.db_mtime:
+            return
+        
+        search_dict, db_data = load_vehicle_database()
+        if not search_dict:
+            return  # Dosya yazılırken okunduysa yazma bitince gelen olayda tekrar dene
+        
+        self.db_mtime = mtime
+        self.search_dict, self.db_data = search_dict, db_data
+        self.hud.db_data = db_data
+        self.gallery.db_data = db_data
+        self.ocr_thread.set_database(search_dict)
+        print(f"[BİLGİ] Araç veritabanı yeniden yüklendi ({len(db_data)} araç).")
+
     def toggle_gallery(self) -> None:
         """Galeri penceresini açar/kapatır."""
         if self.gallery.isVisible():
@@ -264,8 +315,14 @@ class JarvisApp:
                 state = i18n.t("main.garage_added") if is_added else i18n.t("main.garage_removed")
                 print(i18n.t("main.garage_toggle", name=name, state=state))
                 
-                # Arayüzü anında güncelle
-                self.hud.update_ui(self.current_vehicle_data)
+                # Görünür HUD'u garaj sinyali yeniler; gizliyse sonucu göstermek için aç
+                if not self.hud.isVisible():
+                    self.hud.update_ui(self.current_vehicle_data)
+
+    def on_garage_changed(self, version: int) -> None:
+        """Garaj değişti: gösterilen aracın rozet ve tavsiyelerini yeniler."""
+        if self.current_vehicle_data and self.hud.isVisible():
+            self.hud.update_ui(self.current_vehicle_data)
 
     def run(self) -> None:
         """Uygulamayı başlatır."""
@@ -273,6 +330,8 @@ class JarvisApp:
 
 
 if __name__ == "__main__" or getattr(sys, 'frozen', False):
+    # Tesseract işçi havuzu süreçleri exe içinde uygulamayı yeniden başlatmasın
+    multiprocessing.freeze_support()
     setup_logging()
     try:
         # Normal Python veya PyInstaller frozen mod (exe)
@@ -0,0 +1,623 @@
+# matcher.py
+"""OCR metni -> araç eşleştirme: metin temizleme, trigram indeksli bulanık eşleştirici ve önbellek."""
+import heapq
+import logging
+import re
+import threading
+from collections import OrderedDict, defaultdict, deque
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from rapidfuzz import fuzz as rfuzz
+from rapidfuzz import process as rprocess
+from thefuzz import fuzz, utils
+
+from menu_context import build_context_keys
+from metrics import StageMetrics, clock
+
+
+# OCR sonuçlarını filtreleyen kara liste
+BLACKLIST = [
+    "garage", "request", "delivery", "return", "mechanic",
+    "apartment", "suite", "facility", "arcade", "nightclub",
+    "bunker", "empty", "property", "boss", "health", "ammo",
+    "clubhouse", "office", "arena", "casino", "penthouse",
+    "auto shop", "agency", "eclipse", "hawick", "blvd", "free",
+    "select", "manage", "transporter", "storage", "organization",
+    "call", "personal", "vehicle", "special", "mansions",
+    "garment", "factory", "bail", "reservoir", "land act"
+]
+
+
+def clean_ocr_text(raw_text: str, blacklist: Iterable[str] = BLACKLIST) -> Optional[str]:
+    """Ham OCR metnini temizler ve filtreler."""
+    if not raw_text or len(raw_text.strip()) < 3:
+        return None
+
+    text = raw_text.strip()
+
+    # Regex: "Request Personal Aircraft < Cargobob >" -> "Cargobob"
+    bracket_match = re.search(r'<(.+?)>', text)
+    if bracket_match:
+        clean = bracket_match.group(1).strip()
+        return clean if len(clean) >= 3 else None
+
+    # Temizlik
+    clean = text.replace('<', '').replace('>', '').replace('|', '')
+    clean = clean.replace('_', '').replace('«', '').replace('»', '').strip()
+
+    if len(clean) < 3:
+        return None
+    if any(b in clean.lower() for b in blacklist):
+        return None
+    if not re.search(r'[a-zA-Z0-9]', clean):
+        return None
+
+    # Dosya uzantılarını ele (örn. main.py, setup.exe)
+    if re.search(r'\.[a-zA-Z]{2,4}$', clean):
+        return None
+
+    return clean
+
+
+# OCR'ın sistematik olarak karıştırdığı karakterler -> ortak temsil (küçük harfe çevrildikten sonra)
+CONFUSION_FOLD = str.maketrans({"0": "o", "1": "l", "i": "l", "|": "l", "5": "s"})
+_NON_ALNUM = re.compile(r"[^a-z0-9]")
+
+
+def fold_vehicle_key(text: str) -> str:
+    """Karışan karakterleri katlar; boşluk, tire ve noktalamayı atar ("Mk II" == "MkII", "RM-IO" == "RM-10")."""
+    return _NON_ALNUM.sub("", text.lower().translate(CONFUSION_FOLD))
+
+
+def _trigrams(text: str) -> Set[str]:
+    """Metnin karakter trigramlarını döndürür (thefuzz ile aynı normalizasyon)."""
+    processed = utils.full_process(text)
+    if not processed:
+        return set()
+    padded = f"  {processed} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class VehicleNameIndex:
+    """Araç isimleri için trigram ters indeksi + çok aşamalı thefuzz skorlaması.
+
+    WRatio önce trigram örtüşmesi en yüksek ``shortlist_size`` aday üzerinde
+    çalışır. Kısa liste dışındaki isimler ancak WRatio üst sınırı
+    (``_wratio_bounds``: ortak karakter/kelime sayısından, tek vektörel
+    işlemle) eşiğe ya da o ana kadarki 10. en iyi skora ulaşabiliyorsa
+    skorlanır. Böylece ilk 10 aday ve son karar eski tam taramayla
+    (``process.extract(limit=10)``) birebir aynıdır; maliyet ise çoğu sorguda
+    kısa listeyle sınırlı kalır.
+
+    Katlanmış anahtarı (``fold_vehicle_key``) bir isimle birebir aynı olan
+    metinler hiç skorlanmadan O(1) çözülür; birden fazla isme katlanan
+    anahtarlar belirsiz sayılır ve bulanık eşleştirmeye bırakılır.
+    """
+
+    SHORTLIST_SIZE = 48
+    WRATIO_LIMIT = 10      # Eski process.extract(limit=10) davranışı
+    MIN_WRATIO = 60        # Çok kötü eşleşmeleri ele
+    EXACT_SCORE = 100      # Katlanmış anahtar eşleşmesinin skoru
+
+    def __init__(self, keys: Iterable[str], shortlist_size: int = SHORTLIST_SIZE):
+        self.keys: List[str] = list(keys)
+        self.shortlist_size = shortlist_size
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        self._gram_counts: List[int] = []
+        self._folded: Dict[str, Optional[str]] = {}  # Katlanmış anahtar -> isim (belirsizse None)
+        # WRatio'nun gördüğü (process.extract ile aynı işlenmiş) isimler ve üst sınır tabloları
+        self._processed: List[str] = [utils.full_process(key, force_ascii=True) for key in self.keys]
+        self._token_postings: Dict[str, List[int]] = defaultdict(list)
+
+        for idx, key in enumerate(self.keys):
+            folded = fold_vehicle_key(key)
+            if folded:
+                self._folded[folded] = None if folded in self._folded else key
+            grams = _trigrams(key)
+            self._gram_counts.append(len(grams))
+            for gram in grams:
+                self._postings[gram].append(idx)
+            for token in set(self._processed[idx].split()):
+                self._token_postings[token].append(idx)
+
+        chars = sorted({ch for text in self._processed for ch in text if ch != " "})
+        self._char_columns = {ch: col for col, ch in enumerate(chars)}
+        self._char_counts = np.zeros((len(self.keys), len(chars)), dtype=np.int32)
+        for idx, text in enumerate(self._processed):
+            for ch in text:
+                if ch != " ":
+                    self._char_counts[idx, self._char_columns[ch]] += 1
+        shapes = np.array([self._text_shape(text) for text in self._processed], dtype=np.float64).reshape(-1, 4)
+        self._lengths, self._spaces, self._token_counts, self._set_lengths = shapes.T
+
+    @classmethod
+    def from_search_dict(cls, search_dict: Dict[str, dict], **kwargs) -> "VehicleNameIndex":
+        """load_vehicle_database() çıktısındaki search_dict'ten indeks kurar."""
+        return cls(search_dict.keys(), **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def shortlist(self, text: str) -> List[int]:
+        """Trigram Dice benzerliği en yüksek aday indekslerini döndürür (indeks sırasıyla)."""
+        query = _trigrams(text)
+        if not query:
+            return []
+
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in query:
+            for idx in self._postings.get(gram, ()):
+                shared[idx] += 1
+
+        q_len = len(query)
+        best = heapq.nlargest(
+            self.shortlist_size,
+            shared.items(),
+            key=lambda item: (2.0 * item[1] / (q_len + self._gram_counts[item[0]]), -item[0])
+        )
+        return sorted(idx for idx, _ in best)
+
+    @staticmethod
+    def _text_shape(text: str) -> Tuple[int, int, int, int]:
+        """(uzunluk, boşluk, kelime sayısı, tekil kelimelerin birleşik uzunluğu)."""
+        tokens = text.split()
+        unique = set(tokens)
+        return len(text), text.count(" "), len(tokens), sum(map(len, unique)) + max(len(unique) - 1, 0)
+
+    def _wratio_bounds(self, query: str) -> np.ndarray:
+        """İşlenmiş sorgunun her isimle alabileceği en yüksek WRatio (float).
+
+        ``C`` iki metnin ortak karakter sayısı (boşluklar dahil) olsun. ratio
+        ``200*C/(la+lb)``'yi, kısmi karşılaştırmalar ve ortak kelimeli
+        token_set ``200*C/(C+m)``'yi (m: kısa metin) aşamaz. Ortak kelime
+        yoksa token_set/sort da ``200*C/(la+lb)`` ile sınırlıdır. Her sınır
+        WRatio'nun dalına göre (uzunluk oranı 1.5/8) aynı katsayılarla ölçeklenir.
+        """
+        counts = np.zeros(len(self._char_columns), dtype=np.int32)
+        for ch in query:
+            col = self._char_columns.get(ch)
+            if col is not None:
+                counts[col] += 1
+        common = np.minimum(self._char_counts, counts).sum(axis=1).astype(np.float64)
+        length, spaces, token_count, set_length = (float(v) for v in self._text_shape(query))
+
+        shared_tokens = np.zeros(len(self.keys), dtype=bool)
+        for token in set(query.split()):
+            shared_tokens[self._token_postings.get(token, [])] = True
+
+        def ratio(shared, total):
+            return np.minimum(200.0 * shared / np.maximum(total, 1.0), 100.0)
+
+        def partial(shared, shorter):
+            return np.minimum(200.0 * shared / np.maximum(shared + shorter, 1.0), 100.0)
+
+        # Ham metinler (ratio, partial_ratio) ve tekil kelimelerle kurulan metinler (token_*)
+        raw_shared = common + np.minimum(self._spaces, spaces)
+        token_shared = common + np.maximum(np.minimum(self._token_counts, token_count) - 1, 0)
+        plain = ratio(raw_shared, self._lengths + length)
+        raw_partial = partial(raw_shared, np.minimum(self._lengths, length))
+        token_partial = partial(token_shared, np.minimum(self._set_lengths, set_length))
+        token_plain = ratio(token_shared, self._set_lengths + set_length)
+
+        len_ratio = np.maximum(self._lengths, length) / np.maximum(np.minimum(self._lengths, length), 1.0)
+        # len_ratio < 1.5: max(ratio, token_ratio * 0.95)
+        short = np.maximum(plain, 0.95 * np.where(shared_tokens, token_partial, token_plain))
+        # len_ratio >= 1.5: max(ratio, partial_ratio * PS, partial_token_ratio * 0.95 * PS)
+        scale = np.where(len_ratio <= 8.0, 0.9, 0.6)
+        long = np.maximum(plain, scale * np.maximum(raw_partial, 0.95 * np.where(shared_tokens, 100.0, token_partial)))
+        return np.where(len_ratio < 1.5, short, long)
+
+    def top_candidates(self, clean_text: str) -> List[Tuple[str, int]]:
+        """Eski ``process.extract(clean_text, keys, scorer=WRatio, limit=10)`` ile aynı liste.
+
+        Eşiğin (MIN_WRATIO) altındaki adaylar sonradan elendiği için listede yer almaz.
+        """
+        # process.extract: sorgu önce varsayılan, sonra ASCII'ye zorlanmış full_process'ten geçer
+        query = utils.full_process(utils.full_process(clean_text), force_ascii=True)
+        if not query:
+            return []
+
+        floor = self.MIN_WRATIO - 0.5  # round() sonrası MIN_WRATIO'ya ulaşabilen en düşük skor
+        shortlist = self.shortlist(clean_text)
+        scored = self._score(query, shortlist, floor)
+        # Kısa listenin 10. skorunu geçemeyecek isimler skorlanmaz (eşitlikte düşük indeks kazanabilir)
+        limit = floor
+        if len(scored) >= self.WRATIO_LIMIT:
+            limit = heapq.nlargest(self.WRATIO_LIMIT, scored.values())[-1]
+        reachable = np.flatnonzero(self._wratio_bounds(query) + 1e-6 >= limit)
+        skip = set(shortlist)
+        scored.update(self._score(query, [idx for idx in reachable.tolist() if idx not in skip], limit))
+
+        # process.extract ile aynı: float skora göre azalan, eşitlikte orijinal sıra; skor yuvarlanır
+        best = sorted(scored.items(), key=lambda item: (-item[1], item[0]))[:self.WRATIO_LIMIT]
+        return [(self.keys[idx], int(round(score))) for idx, score in best]
+
+    def _score(self, query: str, indices: List[int], cutoff: float) -> Dict[int, float]:
+        """Verilen isimlerin ``cutoff`` ve üzeri WRatio skorları (tek rapidfuzz çağrısı)."""
+        if not indices:
+            return {}
+        choices = [self._processed[idx] for idx in indices]
+        results = rprocess.extract(query, choices, scorer=rfuzz.WRatio, processor=None,
+                                   limit=None, score_cutoff=max(cutoff - 1e-6, 0.0))
+        return {indices[pos]: score for _, score, pos in results}
+
+    def lookup_exact(self, clean_text: str) -> Optional[str]:
+        """Katlanmış anahtarı tek bir isme denk gelen metnin ismini döndürür."""
+        return self._folded.get(fold_vehicle_key(clean_text))
+
+    def match(self, clean_text: str) -> Optional[Tuple[str, int]]:
+        """Metni veritabanıyla eşleştirir (Çok aşamalı filtreleme)."""
+        # 0. Karışan karakterler katlandığında birebir aynı isim varsa skorlamaya gerek yok
+        exact = self.lookup_exact(clean_text)
+        if exact is not None:
+            return exact, self.EXACT_SCORE
+
+        # 1. Geniş kapsamlı arama (WRatio) - Tüm veritabanındaki ilk 10 aday (kısa liste + üst sınır)
+        # Eşik değeri düşük tutuyoruz ki "RM-IO" gibi hatalı okumaları yakalayalım
+        return self.rank_candidates(clean_text, self.top_candidates(clean_text))
+
+    @classmethod
+    def rank_candidates(cls, clean_text: str, candidates: List[Tuple[str, int]]) -> Optional[Tuple[str, int]]:
+        """WRatio adaylarını yeniden skorlar ve son kararı verir."""
+        # 2. Çok kötü eşleşmeleri ele (WRatio < 60)
+        valid_candidates = [c for c in candidates if c[1] >= cls.MIN_WRATIO]
+        if not valid_candidates:
+            return None
+
+        # 3. Gelişmiş Skorlama
+        scored_candidates = []
+        for match_text, w_score in valid_candidates:
+            # TokenSet: Kelime kümesi alt-küme ise (örn "Vigero" içinde "Vigero ZX" yok ama tersi var)
+            set_ratio = fuzz.token_set_ratio(clean_text, match_text)
+            # TokenSort: Tüm kelimeler aynı mı (Uzunluk farkını cezalandırır)
+            sort_ratio = fuzz.token_sort_ratio(clean_text, match_text)
+            # Ratio: Tam bir Levenshtein mesafesi (Harfi harfine aynılık)
+            exact_ratio = fuzz.ratio(clean_text, match_text)
+
+            scored_candidates.append((match_text, w_score, set_ratio, sort_ratio, exact_ratio))
+
+        # 4. Sıralama Stratejisi:
+        # Önceki sürümde TokenSet 1. sıradaydı. Bu durum "Vigero ZX Convertible" araması yapıldığında
+        # veritabanındaki "Vigero" kelimesi ile TokenSet=100 çıkarıyordu çünkü "Vigero" kelimesi aranan metnin tam alt kümesiydi.
+        # ÇÖZÜM: Öncelik 1'e EXACT RATIO (Birebir eşleşme) veya TOKEN SORT koyuyoruz.
+        # Sıralama Önceliği:
+        # 1. exact_ratio (Birebir eşleşmeye en yakın olan, harf sayısı tutan)
+        # 2. sort_ratio (Aynı kelimeleri içeren ama sırası karışık olan)
+        # 3. set_ratio (Eksik kelimesi olan ama alakasız olmayan)
+        scored_candidates.sort(key=lambda x: (x[4], x[3], x[2], x[1]), reverse=True)
+
+        best = scored_candidates[0]
+        best_match, w_score, set_ratio, sort_ratio, exact_ratio = best
+
+        # 5. Son Karar Eşiği
+        # TokenSet veya Exact Ratio çok düşükse reddet
+        if set_ratio < 85 and exact_ratio < 70:
+            return None
+
+        # Skor olarak güvenilir bir ortalama döndür
+        final_score = (exact_ratio + sort_ratio) // 2
+        if final_score < 50:
+            final_score = w_score  # Fallback
+
+        return best_match, final_score
+
+
+class TfidfNameIndex(VehicleNameIndex):
+    """Kısa listeyi karakter trigram TF-IDF kosinüs benzerliğiyle seçen indeks.
+
+    Tüm isimler bir kez seyrek bir matrise (trigram sütunları; satır
+    indeksleri ve L2-normalize ağırlıklar düz NumPy dizilerinde) kodlanır.
+    Sorgu tek bir vektörel çarpımla (``np.bincount``) bütün isimlere karşı
+    skorlanır; WRatio önce en iyi ``shortlist_size`` aday üzerinde çalışır.
+    Üst sınırla genişletme, skorlama ve son karar ``VehicleNameIndex`` ile
+    aynıdır (sonuçlar eski tam taramayla birebir aynı kalır).
+    """
+
+    SHORTLIST_SIZE = 16
+
+    def __init__(self, keys: Iterable[str], shortlist_size: int = SHORTLIST_SIZE):
+        super().__init__(keys, shortlist_size)
+        grams = list(self._postings)
+        self._columns = {gram: col for col, gram in enumerate(grams)}
+        lengths = np.fromiter((len(self._postings[gram]) for gram in grams), dtype=np.int64, count=len(grams))
+        self._indptr = np.zeros(len(grams) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=self._indptr[1:])
+        self._rows = np.fromiter(chain.from_iterable(self._postings[gram] for gram in grams),
+                                 dtype=np.int64, count=int(self._indptr[-1]))
+        # Trigramlar küme olduğu için tf = 1; ağırlık yumuşatılmış idf, satır başına L2-normalize
+        self._idf = np.log((1.0 + len(self.keys)) / (1.0 + lengths)) + 1.0
+        col_weights = np.repeat(self._idf, lengths)
+        norms = np.sqrt(np.bincount(self._rows, weights=col_weights ** 2, minlength=len(self.keys)))
+        self._weights = col_weights / norms[self._rows] if self._rows.size else col_weights
+
+    def shortlist(self, text: str) -> List[int]:
+        """Kosinüs benzerliği en yüksek aday indekslerini döndürür (indeks sırasıyla)."""
+        cols = [self._columns[gram] for gram in _trigrams(text) if gram in self._columns]
+        if not cols:
+            return []
+        starts, ends = self._indptr[cols], self._indptr[np.array(cols) + 1]
+        spans = np.concatenate([np.arange(s, e) for s, e in zip(starts, ends)])
+        # Sorgu normu tüm isimler için aynı olduğundan sıralamayı etkilemez
+        query_weights = np.repeat(self._idf[cols], ends - starts)
+        scores = np.bincount(self._rows[spans], weights=self._weights[spans] * query_weights,
+                             minlength=len(self.keys))
+        candidates = np.flatnonzero(scores)
+        if candidates.size > self.shortlist_size:
+            # Eşit skorda düşük indeks önce (trigram kısa listesiyle aynı kural)
+            order = np.lexsort((candidates, -scores[candidates]))
+            candidates = candidates[order[:self.shortlist_size]]
+        return sorted(candidates.tolist())
+
+
+# Eşleştirme motorları (config: ocr.match_engine)
+MATCH_ENGINES = {
+    "trigram": VehicleNameIndex,
+    "tfidf": TfidfNameIndex,
+}
+
+
+class MatchMemo:
+    """OCR satırı -> eşleşme sonucu için sınırlı LRU önbellek.
+
+    Negatif sonuçlar (kara liste, çöp metin, eşleşmeyen isim) da ``None``
+    olarak saklanır; böylece temizleme regex'leri ve kara liste taraması
+    tekrar eden satırlarda hiç çalışmaz.
+    """
+
+    def __init__(self, max_size: int = 512):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Optional[tuple]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, text: str) -> Tuple[bool, Optional[tuple]]:
+        """(bulundu_mu, sonuç) döndürür. Sonuç negatif kayıtlar için None'dır."""
+        if text in self._entries:
+            self._entries.move_to_end(text)
+            self.hits += 1
+            return True, self._entries[text]
+        self.misses += 1
+        return False, None
+
+    def store(self, text: str, result: Optional[tuple]) -> None:
+        self._entries[text] = result
+        self._entries.move_to_end(text)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / total) if total else 0.0,
+            "size": len(self._entries),
+        }
+
+
+class MatchDebouncer:
+    """HUD'a yeni araç göndermeden önce son karelerde oylama (k/n uyuşma).
+
+    Tek bir gürültülü kare ``vehicle_found_signal``'ı yanlış araca çevirip
+    geri döndürmesin diye yeni araç ancak son ``window`` karenin en az
+    ``required`` tanesinde görüldüğünde yayınlanır. HUD boşken skoru
+    ``fast_score`` ve üzeri olan ilk eşleşme beklemeden yayınlanır.
+
+    ``raw_emits`` oylamasız (her değişimde) yapılacak yayın sayısıdır; farkı
+    gereksiz HUD yeniden çizimidir.
+
+    Eşleştirme thread'i oy eklerken hat hataları ``reset`` çağırabildiği için
+    durum bir kilitle korunur.
+    """
+
+    def __init__(self, window: int = 4, required: int = 2, fast_score: int = 95):
+        self.window = max(1, window)
+        self.required = max(1, min(required, self.window))
+        self.fast_score = fast_score
+        self._votes: "deque[Optional[str]]" = deque(maxlen=self.window)
+        self.current: Optional[str] = None   # HUD'da gösterilen araç
+        self._raw_last: Optional[str] = None  # Oylamasız yolun son yayını
+        self.emits = 0
+        self.raw_emits = 0
+        self._started = clock()
+        self._lock = threading.Lock()
+
+    def push(self, match: Optional[str], score: int = 0) -> Optional[str]:
+        """Karenin eşleşmesini (yoksa None) oya ekler; yayınlanacak yeni araç varsa döndürür."""
+        with self._lock:
+            self._votes.append(match)
+            if match is None:
+                return None
+            if match != self._raw_last:
+                self._raw_last = match
+                self.raw_emits += 1
+            if match == self.current:
+                return None
+            fast = self.current is None and score >= self.fast_score
+            if not fast and self._votes.count(match) < self.required:
+                return None
+            self.current = match
+            self.emits += 1
+            return match
+
+    def confirmed(self, match: Optional[str]) -> bool:
+        """Eşleşme son ``window`` karenin en az ``required`` tanesinde görüldü mü.
+
+        Hızlı yayından bağımsızdır; ROI/sayfa düzeni önbelleğine yalnızca oylamayı
+        geçmiş okumalar yazılsın diye kullanılır (``required=1``: her eşleşme onaylı).
+        """
+        if match is None:
+            return False
+        with self._lock:
+            return self._votes.count(match) >= self.required
+
+    def reset(self) -> None:
+        """HUD gizlendi: oylar ve gösterilen araç sıfırlanır."""
+        with self._lock:
+            self._votes.clear()
+            self.current = None
+            self._raw_last = None
+
+    def stats(self) -> Dict[str, float]:
+        """Yayın sayıları ve dakika başına önlenen (gereksiz) HUD yeniden çizimi."""
+        minutes = (clock() - self._started) / 60.0
+        with self._lock:
+            emits, raw_emits = self.emits, self.raw_emits
+        wasted = raw_emits - emits
+        return {
+            "emits": emits,
+            "raw_emits": raw_emits,
+            "wasted": wasted,
+            "wasted_per_min": round(wasted / minutes, 1) if minutes > 0 else 0.0,
+        }
+
+
+class VehicleResolver:
+    """Ham OCR satırı -> araç çözümleyici: temizleme + isim indeksi + LRU önbellek.
+
+    Garaj verilirse önce yalnızca sahip olunan araçların küçük indeksinde
+    aranır (Mechanic/Pegasus/etkileşim menüleri yalnızca bunları listeler);
+    hiçbir garaj adayı eşikleri geçmezse tam indekse düşülür.
+
+    Menü bağlamı (``set_context``) biliniyorsa arama önce o menüde
+    listelenebilen araçlarla (yine garaj önce) yapılır. Bağlamda eşikleri
+    geçen aday yoksa (yanlış sınıflanan başlık, hiçbir menüden
+    getirilemeyen araçlar) bağlamsız garaj ve tam indekse düşülür.
+
+    ``engine`` kısa liste yöntemini seçer (``MATCH_ENGINES``: "trigram" veya
+    "tfidf"); garaj ve bağlam indeksleri de aynı motorla kurulur.
+
+    Qt'ye bağımlı değildir; OcrThread ve kayıttan oynatma/benchmark araçları
+    aynı mantığı paylaşır.
+    """
+
+    def __init__(self, search_dict: Dict[str, dict], memo_size: int = 512,
+                 blacklist: Iterable[str] = BLACKLIST, metrics: Optional[StageMetrics] = None,
+                 garage: Iterable[str] = (), engine: str = "trigram"):
+        self.search_dict = search_dict
+        self.blacklist = list(blacklist)
+        if engine not in MATCH_ENGINES:
+            logging.warning(f"[Matcher] Bilinmeyen eşleştirme motoru '{engine}', 'trigram' kullanılıyor.")
+        self.index_class = MATCH_ENGINES.get(engine, VehicleNameIndex)
+        self.index = self.index_class.from_search_dict(search_dict)
+        self.garage_index: Optional[VehicleNameIndex] = None
+        self._garage_keys: Set[str] = set()
+        self.context: Optional[str] = None
+        self._context_keys = build_context_keys(search_dict)
+        # Bağlam -> (garaj ∩ bağlam indeksi, bağlam indeksi); ilk kullanımda kurulur
+        self._context_indexes: Dict[str, Tuple[Optional[VehicleNameIndex], VehicleNameIndex]] = {}
+        self.memo = MatchMemo(memo_size)
+        self.metrics = metrics  # Verilirse "clean" ve "match" süreleri kaydedilir
+        self.exact_hits = 0       # Katlanmış anahtarla skorlamasız çözülen eşleştirmeler
+        self.fuzzy_matches = 0    # Bulanık skorlamaya giden eşleştirmeler
+        self.garage_hits = 0      # Garaj indeksinden çözülen eşleştirmeler
+        self.full_fallbacks = 0   # Garajda bulunamayıp tam indekse düşenler
+        self.context_fallbacks = 0  # Bağlamda bulunamayıp bağlamsız indekslere düşenler
+        self.set_garage(garage)
+
+    def set_garage(self, garage: Iterable[str]) -> None:
+        """Garaj indeksini ("Vehicle Name" listesinden) yeniden kurar; önbelleği sıfırlar."""
+        owned = set(garage)
+        keys = [key for key, car in self.search_dict.items() if car.get("Vehicle Name") in owned]
+        self._garage_keys = set(keys)
+        self.garage_index = self.index_class(keys) if keys else None
+        self._context_indexes.clear()
+        # Önbellekteki sonuçlar eski garaja göre verilmiş olabilir
+        self.memo.clear()
+
+    def set_context(self, context: Optional[str]) -> None:
+        """Menü bağlamını ("pegasus", "mechanic", "interaction" veya None) ayarlar."""
+        if context not in self._context_keys:
+            context = None
+        if context == self.context:
+            return
+        self.context = context
+        self.memo.clear()
+
+    def _active_indexes(self) -> Tuple[Optional[VehicleNameIndex], VehicleNameIndex]:
+        """Etkin bağlam için (garaj indeksi, tam indeks) çifti."""
+        context = self.context
+        if context is None:
+            return self.garage_index, self.index
+        indexes = self._context_indexes.get(context)
+        if indexes is None:
+            keys = self._context_keys[context]
+            owned = [key for key in keys if key in self._garage_keys]
+            indexes = (self.index_class(owned) if owned else None, self.index_class(keys))
+            self._context_indexes[context] = indexes
+        return indexes
+
+    def match(self, clean_text: str) -> Optional[Tuple[str, int]]:
+        """Temizlenmiş metni önce garajla, olmazsa tüm veritabanıyla eşleştirir.
+
+        Menü bağlamı varsa önce bağlamın (garaj, tam) indeksleri denenir,
+        sonuç çıkmazsa bağlamsız indekslere düşülür.
+        """
+        result = self._match_in(clean_text, *self._active_indexes())
+        if result is None and self.context is not None:
+            self.context_fallbacks += 1
+            result = self._match_in(clean_text, self.garage_index, self.index)
+        return result
+
+    def _match_in(self, clean_text: str, garage_index: Optional[VehicleNameIndex],
+                  index: VehicleNameIndex) -> Optional[Tuple[str, int]]:
+        # Hızlı yol: katlanmış anahtar (garaj da bu indeksin alt kümesidir)
+        exact = index.lookup_exact(clean_text)
+        if exact is None and garage_index is not None:
+            exact = garage_index.lookup_exact(clean_text)
+        if exact is not None:
+            self.exact_hits += 1
+            return exact, VehicleNameIndex.EXACT_SCORE
+
+        self.fuzzy_matches += 1
+        if garage_index is not None:
+            result = garage_index.match(clean_text)
+            if result:
+                self.garage_hits += 1
+                return result
+            self.full_fallbacks += 1
+        return index.match(clean_text)
+
+    def stats(self) -> Dict[str, object]:
+        """Garaj indeksi boyutu, menü bağlamı ve isabet sayaçları."""
+        attempts = self.exact_hits + self.fuzzy_matches
+        return {
+            "garage_size": len(self.garage_index) if self.garage_index is not None else 0,
+            "context": self.context,
+            "context_size": len(self._active_indexes()[1]),
+            "exact_hits": self.exact_hits,
+            "fuzzy_matches": self.fuzzy_matches,
+            "exact_hit_rate": round(self.exact_hits / attempts, 4) if attempts else 0.0,
+            "garage_hits": self.garage_hits,
+            "full_fallbacks": self.full_fallbacks,
+            "context_fallbacks": self.context_fallbacks,
+        }
+
+    def resolve(self, raw_text: str) -> Optional[Tuple[str, int, str]]:
+        """Ham OCR satırını (araç, skor, temiz metin) sonucuna çözer (önbellekli)."""
+        key = raw_text.strip() if raw_text else ""
+        found, result = self.memo.lookup(key)
+        if found:
+            return result
+
+        metrics = self.metrics
+        start = clock()
+        result = None
+        clean = clean_ocr_text(key, self.blacklist)
+        if metrics is not None:
+            start = metrics.since("clean", start)
+        if clean:
+            match_result = self.match(clean)
+            if metrics is not None:
+                metrics.since("match", start)
+            if match_result:
+                match, score = match_result
+                result = (match, score, clean)
+
+        self.memo.store(key, result)
+        return result
@@ -0,0 +1,109 @@
+# menu_context.py
+"""Menü bağlamı: açık menünün türüne göre aday araç kümesini daraltır.
+
+Mechanic, Pegasus ve etkileşim menüleri farklı araçları listeler
+(veritabanındaki ``Delivery Method``). Menü açıldığında satır listesinin
+üstündeki başlık şeridi bir kez OCR'lanır, anahtar kelimelerle bağlam
+bulunur ve eşleştirme öncelikle o bağlamın araçları üzerinde yapılır.
+"""
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+import numpy as np
+import cv2
+
+from vision import HIGHLIGHT_TEXT_THRESHOLD, Rect
+
+MENU_CONTEXTS = ("pegasus", "mechanic", "interaction")
+
+# Başlık metnindeki anahtar kelimeler (büyük harf; sıra önceliktir)
+HEADER_KEYWORDS = (
+    ("pegasus", ("PEGASUS",)),
+    ("mechanic", ("MECHANIC", "PERSONAL VEHICLE")),
+    ("interaction", ("INTERACTION", "SERVICES", "CEO", "VIP", "MOTORCYCLE CLUB")),
+)
+
+# Bağlam -> "Delivery Method" içinde aranan ifade
+DELIVERY_KEYWORDS = {
+    "pegasus": "Pegasus",
+    "mechanic": "Mechanic",
+    "interaction": "Interaction Menu",
+}
+# Teslimat bilgisi olmayan araçlar hiçbir bağlamdan dışlanmaz
+UNKNOWN_DELIVERY = ("", "Veri Yok")
+
+MENU_CLOSED_FRAMES = 5   # Şerit bu kadar ardışık karede görünmezse menü kapandı sayılır
+HEADER_MIN_HEIGHT = 20   # Bundan kısa başlık bölgesi okunmaz (px)
+HEADER_BAND_ROWS = 2     # Başlık şeridi: satır listesinin üstünde bu kadar satır yüksekliği
+ROW_BACKGROUND_MAX = 40  # Menü satırı zemini (yarı saydam siyah) bundan koyudur (gri)
+ROW_DARK_FRACTION = 0.6  # Satır içindeki bir tarama çizgisinde en az bu oranda koyu piksel (metin hariç)
+ROW_GAP_MAX = 4          # Liste içinde satırlar arası en büyük boşluk (px)
+
+
+def classify_menu_header(lines: Iterable[str]) -> Optional[str]:
+    """Başlık OCR satırlarından menü bağlamını bulur (bilinmiyorsa None)."""
+    text = " ".join(lines).upper()
+    for context, keywords in HEADER_KEYWORDS:
+        if any(keyword in text for keyword in keywords):
+            return context
+    return None
+
+
+def vehicle_contexts(car: dict) -> FrozenSet[str]:
+    """Aracın hangi menü bağlamlarında listelenebileceği."""
+    delivery = (car.get("Delivery Method") or "").strip()
+    if delivery in UNKNOWN_DELIVERY:
+        return frozenset(MENU_CONTEXTS)
+    return frozenset(context for context, keyword in DELIVERY_KEYWORDS.items() if keyword in delivery)
+
+
+def build_context_keys(search_dict: Dict[str, dict]) -> Dict[str, List[str]]:
+    """Bağlam başına arama anahtarları (search_dict sırasıyla)."""
+    keys: Dict[str, List[str]] = {context: [] for context in MENU_CONTEXTS}
+    for key, car in search_dict.items():
+        for context in vehicle_contexts(car):
+            keys[context].append(key)
+    return keys
+
+
+def menu_list_top(gray_column: np.ndarray, y: int) -> int:
+    """Seçili satırın üstündeki koyu satırları yukarı doğru izler; listenin üst y'sini döndürür."""
+    dark = (gray_column[:y] < ROW_BACKGROUND_MAX).mean(axis=1) >= ROW_DARK_FRACTION
+    top, gap = y, 0
+    for row in range(y - 1, -1, -1):
+        if dark[row]:
+            top, gap = row, 0
+        else:
+            gap += 1
+            if gap > ROW_GAP_MAX:
+                break
+    return top
+
+
+def menu_header_rect(frame_bgra: np.ndarray, highlight_rect: Rect) -> Optional[Tuple[int, int, int, int]]:
+    """Menü başlık şeridi: satır listesinin hemen üstündeki sabit yükseklikte bant.
+
+    Seçili satırın üstündeki diğer menü satırları (ör. "Services", "VIP Work")
+    banda girmez; yalnızca başlık anahtar kelimelerle sınıflandırılır.
+    """
+    x, y, w, h = highlight_rect
+    x_start = max(0, x + 5)
+    x_end = min(frame_bgra.shape[1], x + w)
+    if y < HEADER_MIN_HEIGHT or x_end <= x_start:
+        return None
+    gray = cv2.cvtColor(frame_bgra[:y, x_start:x_end], cv2.COLOR_BGRA2GRAY)
+    list_top = menu_list_top(gray, y)
+    band_top = max(0, list_top - HEADER_BAND_ROWS * h)
+    if list_top - band_top < HEADER_MIN_HEIGHT:
+        return None
+    return x_start, band_top, x_end - x_start, list_top - band_top
+
+
+def menu_header_binary(frame_bgra: np.ndarray, highlight_rect: Rect) -> Optional[np.ndarray]:
+    """Başlık şeridinin ikili görüntüsü (beyaz metin/siyah zemin); bulunamazsa None."""
+    rect = menu_header_rect(frame_bgra, highlight_rect)
+    if rect is None:
+        return None
+    x, y, w, h = rect
+    gray = cv2.cvtColor(frame_bgra[y:y + h, x:x + w], cv2.COLOR_BGRA2GRAY)
+    _, binary = cv2.threshold(gray, HIGHLIGHT_TEXT_THRESHOLD, 255, cv2.THRESH_BINARY)
+    return binary
@@ -0,0 +1,105 @@
+# menu_layout.py
+"""Menü sayfa düzeni önbelleği: görünen tüm satırları bir kez oku, seçimi konumdan çöz.
+
+Mechanic/Pegasus listesinde ok tuşlarıyla gezinirken seçili satırın üstündeki
+ve altındaki satırlar zaten ekrandadır. Sayfa (menü sütunu) bir kez OCR'lanır
+ve satır y-merkezi -> araç eşlemesi saklanır. Liste kaymadığı sürece yeni
+``highlight_rect`` bu eşlemeden çözülür; OCR çağrılmaz. Kaymayı, sütunun
+küçültülmüş ikili görüntüsünün parmak izi (Hamming mesafesi) yakalar.
+"""
+import threading
+from typing import List, Optional, Tuple
+
+import numpy as np
+import cv2
+
+from vision import HIGHLIGHT_TEXT_THRESHOLD, Fingerprint, Rect, fingerprint_distance
+
+# Sayfa parmak izi ızgarası: 128 sütun x 240 satır (1440px'de satır başına ~6 hücre,
+# harf başına birkaç hücre; tek satırlık kayma tüm metni kaydırıp belirgin fark yaratır)
+PAGE_FINGERPRINT_SIZE = (128, 240)
+# Seçimin yer değiştirmesi iki satırın ikileştirmesini hafifçe bozar (korpusta <= 90 bit),
+# kayma ise yüzlerce bit değiştirir (korpusta >= 320 bit)
+PAGE_MAX_DISTANCE = 160
+
+PageLine = Tuple[str, float]  # (OCR satır metni, karedeki y-merkezi)
+
+
+def menu_column_binary(frame_bgra: np.ndarray, highlight_rect: Rect) -> np.ndarray:
+    """Seçili satırın sütununu tam yükseklikte kırpar; tüm satırlar beyaz metin/siyah zemin olur.
+
+    Normal satırlarda metin beyaz, zemin koyudur (düz eşik); seçili satırda
+    zemin beyaz, metin siyahtır (ters eşik). Böylece hangi satırın seçili
+    olduğundan bağımsız, benzer bir sayfa görüntüsü elde edilir.
+    """
+    x, y, w, h = highlight_rect
+    x_start = max(0, x + 5)
+    x_end = min(frame_bgra.shape[1], x + w)
+    gray = cv2.cvtColor(frame_bgra[:, x_start:x_end], cv2.COLOR_BGRA2GRAY)
+    _, binary = cv2.threshold(gray, HIGHLIGHT_TEXT_THRESHOLD, 255, cv2.THRESH_BINARY)
+
+    y_start = max(0, y - 2)
+    y_end = min(frame_bgra.shape[0], y + h + 2)
+    cv2.threshold(gray[y_start:y_end], HIGHLIGHT_TEXT_THRESHOLD, 255, cv2.THRESH_BINARY_INV,
+                  dst=binary[y_start:y_end])
+    return binary
+
+
+def page_fingerprint(column_binary: np.ndarray, highlight_rect: Rect) -> Fingerprint:
+    """Sütun görüntüsünün bit imzası; geometri olarak sütunun x ve genişliği kullanılır."""
+    small = cv2.resize(column_binary, PAGE_FINGERPRINT_SIZE, interpolation=cv2.INTER_AREA)
+    bits = np.packbits(small > 127)
+    x, _, w, _ = highlight_rect
+    geometry = (x // 2, w // 2, column_binary.shape[0], 0)
+    return geometry, bits.tobytes()
+
+
+class MenuLayout:
+    """Bir menü sayfasının y-merkezi -> aday eşlemesi."""
+
+    def __init__(self, fingerprint: Fingerprint, rows: List[Tuple[float, object]]):
+        self.fingerprint = fingerprint
+        self.rows = sorted(rows, key=lambda row: row[0])  # (y-merkezi, aday)
+
+    def matches(self, fingerprint: Fingerprint) -> bool:
+        """Sayfa kaymadı mı? (aynı sütun ve parmak izi yeterince yakın)"""
+        distance = fingerprint_distance(fingerprint, self.fingerprint)
+        return distance is not None and distance <= PAGE_MAX_DISTANCE
+
+    def lookup(self, highlight_rect: Rect) -> Optional[object]:
+        """Seçili şeridin içine düşen satırın adayını döndürür (yoksa None)."""
+        _, y, _, h = highlight_rect
+        for center, candidate in self.rows:
+            if y <= center <= y + h:
+                return candidate
+        return None
+
+
+class MenuLayoutCache:
+    """Son okunan sayfa düzeni ve isabet sayaçları (tespit ve eşleştirme thread'leri paylaşır)."""
+
+    def __init__(self):
+        self._layout: Optional[MenuLayout] = None
+        self._lock = threading.Lock()
+        self.pages = 0   # OCR'lanan sayfa sayısı
+        self.hits = 0    # OCR'sız konumdan çözülen seçimler
+
+    def lookup(self, fingerprint: Fingerprint, highlight_rect: Rect) -> Tuple[bool, Optional[object]]:
+        """(sayfa geçerli mi, aday). Sayfa geçerli ama satır okunamamışsa aday None olur."""
+        with self._lock:
+            layout = self._layout
+        if layout is None or not layout.matches(fingerprint):
+            return False, None
+        candidate = layout.lookup(highlight_rect)
+        if candidate is not None:
+            self.hits += 1
+        return True, candidate
+
+    def store(self, layout: MenuLayout) -> None:
+        with self._lock:
+            self._layout = layout
+            self.pages += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._layout = None
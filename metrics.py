@@ -0,0 +1,105 @@
+# metrics.py
+"""OCR hattı için düşük maliyetli aşama zamanlayıcıları.
+
+Her aşamanın son ``capacity`` ölçümü önceden ayrılmış bir halka tamponda
+tutulur; kare başına yalnızca bir dizi ataması yapılır, log/sinyal yoktur.
+Yüzdelikler yalnızca ``snapshot()`` çağrıldığında (ör. saniyede bir) hesaplanır.
+"""
+import time
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+# OcrThread döngüsünün aşamaları (sıra StatusHUD/log çıktısındaki sıradır)
+OCR_STAGES = ("capture", "convert", "mask", "ocr", "clean", "match", "emit")
+
+# Monotonik saat; aşama süreleri bu saatin farkıyla ölçülür
+clock = time.perf_counter
+
+
+class StageMetrics:
+    """Aşama başına halka tamponlu süre ölçümleri ve kare hızı sayacı.
+
+    Her aşamaya tek bir thread yazar (tespit, OCR ve eşleştirme aşamaları
+    farklı satırlara yazar); okuma tarafı yaklaşık bir anlık görüntü alır.
+    """
+
+    def __init__(self, stages: Iterable[str] = OCR_STAGES, capacity: int = 256):
+        self.stages = tuple(stages)
+        self.capacity = capacity
+        self._slots = {name: i for i, name in enumerate(self.stages)}
+        self._samples = np.zeros((len(self.stages), capacity), dtype=np.float64)
+        self._counts = [0] * len(self.stages)
+        self._totals = [0.0] * len(self.stages)  # Aşama başına toplam süre (sn), zamanlayıcı bütçesi için
+        # Tamamlanan karelerin zaman damgaları (etkin FPS için)
+        self._frame_times = np.zeros(capacity, dtype=np.float64)
+        self._frame_count = 0
+
+    def record(self, stage: str, seconds: float) -> None:
+        """Bir aşama süresini (saniye) halka tampona yazar."""
+        slot = self._slots[stage]
+        count = self._counts[slot]
+        self._samples[slot, count % self.capacity] = seconds
+        self._counts[slot] = count + 1
+        self._totals[slot] += seconds
+
+    def since(self, stage: str, start: float) -> float:
+        """``start`` anından bu yana geçen süreyi kaydeder; şimdiki zamanı döndürür."""
+        now = clock()
+        self.record(stage, now - start)
+        return now
+
+    def total(self, stages: Iterable[str]) -> float:
+        """Verilen aşamalarda şimdiye kadar harcanan toplam süre (sn)."""
+        return sum(self._totals[self._slots[name]] for name in stages)
+
+    def frame_done(self, now: Optional[float] = None) -> None:
+        """Hattın sonuna ulaşan bir kareyi sayar."""
+        self._frame_times[self._frame_count % self.capacity] = clock() if now is None else now
+        self._frame_count += 1
+
+    def fps(self) -> float:
+        """Halka tampondaki son karelere göre etkin kare hızı."""
+        n = min(self._frame_count, self.capacity)
+        if n < 2:
+            return 0.0
+        times = self._frame_times[:n]
+        span = float(times.max() - times.min())
+        return (n - 1) / span if span > 0 else 0.0
+
+    def samples_ms(self, stage: str) -> np.ndarray:
+        """Halka tampondaki son ölçümler (ms, sırasız)."""
+        slot = self._slots[stage]
+        n = min(self._counts[slot], self.capacity)
+        return self._samples[slot, :n] * 1000.0
+
+    def snapshot(self) -> Dict[str, object]:
+        """Aşama başına sayı ve p50/p95/maks süreleri (ms) ile etkin FPS."""
+        stages = {}
+        for slot, name in enumerate(self.stages):
+            count = self._counts[slot]
+            if count == 0:
+                stages[name] = {"count": 0}
+                continue
+            ms = self.samples_ms(name)
+            p50, p95 = np.percentile(ms, (50, 95))
+            stages[name] = {
+                "count": count,
+                "p50": round(float(p50), 2),
+                "p95": round(float(p95), 2),
+                "max": round(float(ms.max()), 2),
+            }
+        return {
+            "fps": round(self.fps(), 1),
+            "frames": self._frame_count,
+            "stages": stages,
+        }
+
+
+def format_summary(snapshot: Dict[str, object]) -> str:
+    """Anlık görüntüyü tek satırlık log özetine çevirir."""
+    parts = [f"fps={snapshot['fps']:.1f}", f"kare={snapshot['frames']}"]
+    for name, st in snapshot["stages"].items():
+        if st["count"]:
+            parts.append(f"{name}={st['p50']:.1f}/{st['p95']:.1f}ms")
+    return " ".join(parts)
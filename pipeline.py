@@ -0,0 +1,444 @@
+# pipeline.py
+"""Kademeli OCR hattı: yakala -> tespit -> OCR -> eşleştir.
+
+Her aşama kendi thread'inde çalışır. Aşamalar arasındaki kuyruklar tek
+elemanlıdır ("en yeni kazanır"): OCR meşgulken yakalanan eski kareler
+birikmek yerine düşürülür, OCR her zaman en taze şerit üzerinde çalışır.
+"""
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import cv2
+
+from menu_context import MENU_CLOSED_FRAMES, classify_menu_header, menu_header_binary
+from menu_layout import MenuLayout, MenuLayoutCache, PageLine, menu_column_binary, page_fingerprint
+from metrics import StageMetrics, clock
+from vision import (
+    HIGHLIGHT_DETECTORS, Band, Fingerprint, FusedHighlightMask, HighlightTracker, Rect,
+    RoiFingerprintCache, extract_highlight_roi, find_highlight_rect, fingerprint_distance,
+    roi_fingerprint
+)
+
+Candidate = Tuple[str, int, str]  # (araç anahtarı, skor, temiz metin)
+PageJob = Tuple[Fingerprint, np.ndarray]  # (sayfa parmak izi, menü sütunu ikili görüntüsü)
+
+
+class LatestQueue:
+    """Tek elemanlı, "en yeni kazanır" kuyruk. Dolu iken put eskisinin üzerine yazar.
+
+    ``keep=True`` ile konan eleman yalnızca başka bir ``keep`` elemanıyla
+    ezilebilir; bu sırada gelen sıradan elemanlar düşürülür. OCR sonuçları
+    böyle konur: düşerlerse bekleyen şerit hiç temizlenmez.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._item = None
+        self._has_item = False
+        self._keep = False
+        self._closed = False
+        self.dropped = 0  # Tüketilmeden üzerine yazılan veya korunan eleman yüzünden düşen sayısı
+
+    def put(self, item, keep: bool = False) -> bool:
+        """Elemanı koyar; korunan bir eleman yüzünden düşürüldüyse False döndürür."""
+        with self._cond:
+            if self._has_item:
+                self.dropped += 1
+                if self._keep and not keep:
+                    return False
+            self._item = item
+            self._has_item = True
+            self._keep = keep
+            self._cond.notify()
+            return True
+
+    def get(self, timeout: Optional[float] = None):
+        """Elemanı alır; süre dolarsa veya kuyruk kapandıysa None döndürür."""
+        with self._cond:
+            if not self._has_item and not self._closed:
+                self._cond.wait(timeout)
+            if not self._has_item:
+                return None
+            item = self._item
+            self._item = None
+            self._has_item = False
+            self._keep = False
+            return item
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+class HighlightPipeline:
+    """Highlight şeridi tespiti, OCR ve eşleştirmeyi ayrı thread'lerde yürütür.
+
+    Args:
+        recognize: İkili ROI (2x) -> OCR satır metinleri.
+        resolve: Ham satır metni -> (araç, skor, temiz metin) veya None.
+        on_result: Her işlenen kare için aday listesi ile çağrılır ([] = araç yok).
+        on_error: Bir aşama hata verdiğinde çağrılır.
+        on_highlight: Karede şerit bulunduğunda çağrılır (zamanlayıcı için).
+        metrics: Aşama sürelerinin yazılacağı ölçüm tamponu.
+        detector: Seçili satır tespit yöntemi ("contour" veya "projection").
+        recognize_page: Verilirse sayfa düzeni önbelleği açılır. Menü sütunu (2x)
+            -> (satır metni, görüntüdeki y-merkezi) listesi.
+        layout_cache: Sayfa düzeni önbelleği (veritabanı değişince temizlenebilsin diye dışarıdan).
+        tracker: Verilirse kareler yalnızca son şeridin etrafındaki bantta taranır
+            (yakalayan taraf ``tracker.band()`` ile bandı alıp ``submit``'e verir).
+            Sayfa düzeni önbelleği tam yükseklikte sütuna ihtiyaç duyduğundan birlikte kullanılamaz.
+        on_menu_context: Verilirse her menü açılışında satır listesinin üstündeki başlık şeridi bir kez
+            OCR'lanır ve bulunan bağlamla (veya None) eşleştirme thread'inde, çözümlemeden
+            önce çağrılır.
+        recognize_header: Başlık bölgesi (2x) -> OCR satırları (verilmezse ``recognize``).
+        confirm: Verilirse taze OCR sonucu ROI ve sayfa düzeni önbelleklerine ancak
+            ``on_result``'tan sonra True döndürdüğünde yazılır (ör. HUD oylaması aracı
+            onayladığında). Onaylanmayan satır sonraki karede yeniden OCR'lanır; tek bir
+            yanlış okuma önbellekten her karede tekrar oylanmaz.
+    """
+
+    STAGE_TIMEOUT = 0.2  # Aşama thread'lerinin durma bayrağını kontrol aralığı (sn)
+    ERROR_BACKOFF = 1.0  # Hata sonrası aşamanın bekleme süresi (sn)
+
+    def __init__(self,
+                 recognize: Callable[[np.ndarray], List[str]],
+                 resolve: Callable[[str], Optional[Candidate]],
+                 on_result: Callable[[List[Candidate]], None],
+                 on_error: Optional[Callable[[], None]] = None,
+                 on_highlight: Optional[Callable[[], None]] = None,
+                 roi_cache: Optional[RoiFingerprintCache] = None,
+                 metrics: Optional[StageMetrics] = None,
+                 detector: str = "contour",
+                 recognize_page: Optional[Callable[[np.ndarray], List[PageLine]]] = None,
+                 layout_cache: Optional[MenuLayoutCache] = None,
+                 tracker: Optional[HighlightTracker] = None,
+                 on_menu_context: Optional[Callable[[Optional[str]], None]] = None,
+                 recognize_header: Optional[Callable[[np.ndarray], List[str]]] = None,
+                 confirm: Optional[Callable[[List[Candidate]], bool]] = None):
+        self.recognize = recognize
+        self.resolve = resolve
+        self.on_result = on_result
+        self.on_error = on_error
+        self.on_highlight = on_highlight
+        self.roi_cache = roi_cache if roi_cache is not None else RoiFingerprintCache()
+        self.metrics = metrics if metrics is not None else StageMetrics()
+        self._masker = FusedHighlightMask()  # Yalnızca tespit aşaması kullanır
+        if detector not in HIGHLIGHT_DETECTORS:
+            logging.warning(f"[OcrPipeline] Bilinmeyen tespit yöntemi '{detector}', 'contour' kullanılıyor.")
+        self.find_rect = HIGHLIGHT_DETECTORS.get(detector, find_highlight_rect)
+        self.recognize_page = recognize_page
+        self.layout_cache = None
+        if recognize_page is not None:
+            self.layout_cache = layout_cache if layout_cache is not None else MenuLayoutCache()
+        self.tracker = tracker
+        if tracker is not None and self.layout_cache is not None:
+            logging.warning("[OcrPipeline] Bant takibi sayfa düzeni önbelleğiyle kullanılamaz, kapatıldı.")
+            self.tracker = None
+        self.on_menu_context = on_menu_context
+        self.recognize_header = recognize_header if recognize_header is not None else recognize
+        self.confirm = confirm
+        self._menu_misses = MENU_CLOSED_FRAMES  # Şeridin görünmediği ardışık kare sayısı
+        self._header_pending = False  # Menü yeni açıldı, başlık henüz okunmadı
+
+        self._frames = LatestQueue()
+        self._rois = LatestQueue()
+        self._results = LatestQueue()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._pending: Optional[Fingerprint] = None  # OCR'da bekleyen şeridin parmak izi
+
+    # =====================================================
+    # Aşama fonksiyonları (thread'siz, sırayla da çağrılabilir)
+    # =====================================================
+    def detect(self, frame: np.ndarray, band: Optional[Band] = None) -> Optional[Tuple[Rect, np.ndarray]]:
+        """Karede seçili satırı bulur; (highlight_rect, ikili ROI) veya None döndürür.
+
+        ``frame`` bir bant ise ``highlight_rect`` tam kare koordinatına çevrilir.
+        """
+        start = clock()
+        # HSV'ye çevirmeden tek geçişte maske (renk dönüşümü aşaması)
+        mask = self._masker(frame)
+        start = self.metrics.since("convert", start)
+        local_rect = self.find_rect(mask)
+        detected = highlight_rect = None
+        if local_rect is not None:
+            x, y, w, h = local_rect
+            highlight_rect = (x, y + band[0], w, h) if band is not None else local_rect
+            detected = highlight_rect, extract_highlight_roi(frame, local_rect)
+        if self.tracker is not None:
+            self.tracker.observe(highlight_rect, band, frame.shape[0])
+        self._observe_menu(highlight_rect is not None)
+        self.metrics.since("mask", start)
+        return detected
+
+    def _observe_menu(self, visible: bool) -> None:
+        """Menü açılışlarını (uzun bir yokluktan sonra görünen şerit) başlık okuması için işaretler."""
+        if not visible:
+            self._menu_misses += 1
+            return
+        if self._menu_misses >= MENU_CLOSED_FRAMES and self.on_menu_context is not None:
+            self._header_pending = True
+        self._menu_misses = 0
+
+    def header_job(self, frame: np.ndarray, highlight_rect: Rect,
+                   band: Optional[Band]) -> Optional[np.ndarray]:
+        """Başlık bekleniyorsa ve kare tam yükseklikteyse başlık bölgesinin ikili görüntüsü."""
+        if not self._header_pending or band is not None:
+            return None
+        return menu_header_binary(frame, highlight_rect)
+
+    def read_header(self, header_binary: np.ndarray) -> List[str]:
+        """Başlık bölgesini OCR'lar (menü açılışında bir kez)."""
+        start = clock()
+        header_2x = cv2.resize(header_binary, None, fx=2, fy=2, interpolation=cv2.INTER_CUBIC)
+        lines = self.recognize_header(header_2x)
+        self.metrics.since("ocr", start)
+        self._header_pending = False
+        return lines
+
+    def apply_header(self, header_lines: Optional[List[str]]) -> None:
+        """Okunan başlıktan menü bağlamını bulup bildirir (eşleştirme thread'inde)."""
+        if header_lines is not None and self.on_menu_context is not None:
+            self.on_menu_context(classify_menu_header(header_lines))
+
+    def read(self, roi_binary: np.ndarray) -> List[str]:
+        """ROI'yi büyütüp OCR motoruna gönderir."""
+        # Metni okumayı kolaylaştırmak için 2 kat büyüt
+        start = clock()
+        roi_2x = cv2.resize(roi_binary, None, fx=2, fy=2, interpolation=cv2.INTER_CUBIC)
+        lines = self.recognize(roi_2x)
+        self.metrics.since("ocr", start)
+        return lines
+
+    def read_page(self, column_binary: np.ndarray) -> List[PageLine]:
+        """Menü sütununu tek seferde OCR'lar; satır y-merkezleri kare koordinatına çevrilir."""
+        start = clock()
+        page_2x = cv2.resize(column_binary, None, fx=2, fy=2, interpolation=cv2.INTER_CUBIC)
+        lines = [(text, center / 2.0) for text, center in self.recognize_page(page_2x)]
+        self.metrics.since("ocr", start)
+        return lines
+
+    def build_layout(self, page_fp: Fingerprint, lines: List[PageLine]) -> MenuLayout:
+        """Sayfa OCR satırlarını çözer ve y-merkezi -> aday düzenini kurar (önbelleğe ``remember`` koyar)."""
+        rows = []
+        for text, center in lines:
+            resolved = self.resolve(text)
+            if resolved:
+                rows.append((center, resolved))
+        return MenuLayout(page_fp, rows)
+
+    def resolve_lines(self, lines: List[str]) -> List[Candidate]:
+        """OCR satırlarını araç adaylarına çevirir."""
+        candidates = []
+        for text in lines:
+            resolved = self.resolve(text)
+            if resolved:
+                candidates.append(resolved)
+        return candidates
+
+    def lookup_cached(self, frame: np.ndarray, highlight_rect: Rect,
+                      fingerprint: Fingerprint) -> Tuple[Optional[List[Candidate]], Optional[PageJob]]:
+        """OCR'sız sonuç arar: önce ROI önbelleği, sonra sayfa düzeni.
+
+        (adaylar, None) -> sonuç bulundu; (None, sayfa) -> liste kaymış, sayfa
+        OCR'lanmalı; (None, None) -> yalnızca seçili şerit OCR'lanmalı.
+        """
+        cached = self.roi_cache.lookup(fingerprint)
+        if cached is not None:
+            return list(cached), None
+        if self.layout_cache is None:
+            return None, None
+
+        column_binary = menu_column_binary(frame, highlight_rect)
+        page_fp = page_fingerprint(column_binary, highlight_rect)
+        valid, candidate = self.layout_cache.lookup(page_fp, highlight_rect)
+        if candidate is not None:
+            self.roi_cache.store(fingerprint, (candidate,))
+            return [candidate], None
+        if valid:
+            return None, None  # Sayfa güncel ama bu satır okunamamış
+        return None, (page_fp, column_binary)
+
+    def resolve_page(self, page_fp: Fingerprint, lines: List[PageLine],
+                     highlight_rect: Rect) -> Tuple[List[Candidate], MenuLayout]:
+        """Sayfa OCR'ından düzeni kurar; seçili satırın adayını ve düzeni döndürür."""
+        layout = self.build_layout(page_fp, lines)
+        candidate = layout.lookup(highlight_rect)
+        return ([candidate] if candidate is not None else []), layout
+
+    def remember(self, fingerprint: Fingerprint, candidates: List[Candidate],
+                 layout: Optional[MenuLayout] = None, store_roi: bool = True) -> bool:
+        """Taze OCR sonucunu önbelleklere yazar; ``confirm`` reddederse hiçbir şey yazmaz.
+
+        ``on_result``'tan sonra çağrılmalıdır ki oylama bu okumayı görmüş olsun.
+        """
+        if self.confirm is not None and not self.confirm(candidates):
+            return False
+        if layout is not None:
+            self.layout_cache.store(layout)
+        if store_roi:
+            self.roi_cache.store(fingerprint, tuple(candidates))
+        return True
+
+    def _deliver(self, fingerprint: Fingerprint, candidates: List[Candidate],
+                 layout: Optional[MenuLayout] = None, store_roi: bool = True) -> List[Candidate]:
+        """Taze OCR sonucunu yayınlar, sonra (onaylanırsa) önbelleklere yazar."""
+        self.on_result(candidates)
+        self.remember(fingerprint, candidates, layout, store_roi)
+        return candidates
+
+    def process(self, frame: np.ndarray, band: Optional[Band] = None) -> List[Candidate]:
+        """Tek bir kareyi tüm aşamalardan sırayla geçirir (tekrar oynatma / benchmark için).
+
+        Thread'li hat gibi her kare için ``on_result`` çağrılır; adaylar ayrıca döndürülür.
+        """
+        detected = self.detect(frame, band)
+        if detected is None:
+            self.on_result([])
+            return []
+        highlight_rect, roi_binary = detected
+        header = self.header_job(frame, highlight_rect, band)
+        if header is not None:
+            self.apply_header(self.read_header(header))
+        fingerprint = roi_fingerprint(roi_binary, highlight_rect)
+        cached, page = self.lookup_cached(frame, highlight_rect, fingerprint)
+        if cached is not None:
+            self.on_result(cached)
+            return cached
+        layout = None
+        if page is not None:
+            candidates, layout = self.resolve_page(page[0], self.read_page(page[1]), highlight_rect)
+            if candidates:
+                return self._deliver(fingerprint, candidates, layout)
+        lines = self.read(roi_binary)
+        # Boş sonuç OCR hatası da olabilir, yalnızca okunan satırları sakla
+        return self._deliver(fingerprint, self.resolve_lines(lines), layout, store_roi=bool(lines))
+
+    # =====================================================
+    # Thread'li çalışma
+    # =====================================================
+    def start(self) -> None:
+        """Tespit, OCR ve eşleştirme thread'lerini başlatır."""
+        self._stop.clear()
+        self._pending = None
+        self._menu_misses = MENU_CLOSED_FRAMES
+        self._header_pending = False
+        stages = [
+            ("detect", self._frames, self._detect_stage),
+            ("ocr", self._rois, self._ocr_stage),
+            ("match", self._results, self._match_stage),
+        ]
+        self._threads = [
+            threading.Thread(target=self._stage_loop, args=(name, queue, handler),
+                             name=f"OcrPipeline-{name}", daemon=True)
+            for name, queue, handler in stages
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, frame: np.ndarray, band: Optional[Band] = None) -> None:
+        """Yakalanan kareyi (veya ``band`` bandını) hatta verir; önceki işlenmemiş kare düşürülür."""
+        self._frames.put((frame, band))
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Aşama thread'lerini durdurur ve bitmelerini bekler."""
+        self._stop.set()
+        for queue in (self._frames, self._rois, self._results):
+            queue.close()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def stats(self) -> Dict[str, int]:
+        """Aşama kuyruklarında düşürülen eleman sayıları ve sayfa düzeni sayaçları."""
+        stats = {
+            "dropped_frames": self._frames.dropped,
+            "dropped_rois": self._rois.dropped,
+            "dropped_results": self._results.dropped,
+        }
+        if self.layout_cache is not None:
+            stats["layout_pages"] = self.layout_cache.pages
+            stats["layout_hits"] = self.layout_cache.hits
+        if self.tracker is not None:
+            stats.update(self.tracker.stats())
+        return stats
+
+    def _stage_loop(self, name: str, queue: LatestQueue, handler: Callable) -> None:
+        while not self._stop.is_set():
+            item = queue.get(self.STAGE_TIMEOUT)
+            if item is None:
+                continue
+            try:
+                handler(item)
+            except Exception:
+                logging.exception(f"[OcrPipeline:{name}] Aşama hatası")
+                if self.on_error:
+                    self.on_error()
+                time.sleep(self.ERROR_BACKOFF)
+
+    def _detect_stage(self, item: Tuple[np.ndarray, Optional[Band]]) -> None:
+        frame, band = item
+        detected = self.detect(frame, band)
+        if detected is None:
+            self._results.put((None, None, [], None, None))
+            return
+
+        if self.on_highlight:
+            self.on_highlight()
+
+        highlight_rect, roi_binary = detected
+        fingerprint = roi_fingerprint(roi_binary, highlight_rect)
+        cached, page = self.lookup_cached(frame, highlight_rect, fingerprint)
+        if cached is not None:
+            self._results.put((None, None, cached, None, None))
+            return
+
+        # Aynı şerit zaten OCR'da ise tekrar gönderme, sonucunu bekle
+        pending = self._pending
+        if pending is not None:
+            distance = fingerprint_distance(fingerprint, pending)
+            if distance is not None and distance <= self.roi_cache.max_distance:
+                return
+
+        self._pending = fingerprint
+        # Liste kaydıysa şerit yerine tüm sayfa OCR'lanır; menü yeni açıldıysa başlık da okunur
+        header = self.header_job(frame, highlight_rect, band)
+        self._rois.put((fingerprint, highlight_rect, roi_binary, page, header))
+
+    def _ocr_stage(self, item: Tuple[Fingerprint, Rect, np.ndarray, Optional[PageJob], Optional[np.ndarray]]) -> None:
+        fingerprint, highlight_rect, roi_binary, page, header = item
+        try:
+            header_lines = self.read_header(header) if header is not None else None
+            if page is not None:
+                lines = self.read_page(page[1])
+            else:
+                lines = self.read(roi_binary)
+        except Exception:
+            self._pending = None
+            raise
+        # Tespit aşamasının boş/önbellek sonuçları bunu ezemez; aksi halde _pending hiç temizlenmez
+        self._results.put((fingerprint, lines, None, (page, highlight_rect) if page is not None else None,
+                           header_lines), keep=True)
+
+    def _match_stage(self, item) -> None:
+        # (parmak izi, OCR satırları, hazır adaylar, (sayfa, highlight_rect) veya None, başlık satırları)
+        fingerprint, lines, candidates, page, header_lines = item
+        self.apply_header(header_lines)
+        if candidates is None:
+            try:
+                if page is not None:
+                    candidates, layout = self.resolve_page(page[0][0], lines, page[1])
+                    self._deliver(fingerprint, candidates, layout, store_roi=bool(candidates))
+                else:
+                    # Boş sonuç OCR hatası da olabilir, yalnızca okunan satırları sakla
+                    self._deliver(fingerprint, self.resolve_lines(lines), store_roi=bool(lines))
+            finally:
+                # Önbelleğe yazıldıktan sonra: aynı şerit araya girip yeniden OCR'a gönderilmez
+                if self._pending == fingerprint:
+                    self._pending = None
+            return
+        self.on_result(candidates)
@@ -0,0 +1,78 @@
+# scheduler.py
+"""OCR döngüsü için uyarlanabilir kare zamanlayıcısı."""
+import time
+from typing import Any, Dict, Optional
+
+# config.json -> "ocr" bölümündeki anahtarların varsayılanları
+DEFAULT_ACTIVE_FPS = 8.0    # Menü (highlight şeridi) görülürken hedef hız
+DEFAULT_IDLE_FPS = 2.0      # Menü yokken boşta hız
+DEFAULT_IDLE_AFTER = 3.0    # Şerit bu kadar saniye görülmezse boşta hıza düş
+DEFAULT_CPU_BUDGET = 0.5    # Döngünün bir çekirdekte kullanabileceği en fazla pay (0-1]
+
+
+class FrameScheduler:
+    """Kare aralığını menü durumuna ve iş süresine göre ayarlar.
+
+    - Highlight şeridi yakın zamanda görüldüyse ``active_fps`` ile çalışır.
+    - ``idle_after`` saniye boyunca şerit görülmezse ``idle_fps``'e düşer.
+    - Bir karenin işi uzun sürerse bekleme, iş süresi / ``cpu_budget`` oranını
+      aşmayacak şekilde uzar; yavaş OCR çağrıları üst üste binmez.
+    - OCR başka thread'lerde (kademeli hat) yapılıyorsa o süre ``add_work`` ile
+      bildirilir; bütçe yalnızca yakalama döngüsünü değil, tüm işi kapsar.
+    """
+
+    def __init__(self, active_fps: float = DEFAULT_ACTIVE_FPS, idle_fps: float = DEFAULT_IDLE_FPS,
+                 idle_after: float = DEFAULT_IDLE_AFTER, cpu_budget: float = DEFAULT_CPU_BUDGET):
+        self.active_interval = 1.0 / max(0.1, active_fps)
+        self.idle_interval = 1.0 / max(0.1, min(idle_fps, active_fps))
+        self.idle_after = idle_after
+        self.cpu_budget = min(1.0, max(0.05, cpu_budget))
+        self._frame_start = time.monotonic()
+        self._offloaded = 0.0  # Bu karede başka thread'lerde harcanan süre (sn)
+        self._last_highlight: Optional[float] = None
+
+    @classmethod
+    def from_config(cls, cfg: Dict[str, Any]) -> "FrameScheduler":
+        """config.json'daki "ocr" bölümünden zamanlayıcı oluşturur."""
+        ocr_cfg = cfg.get("ocr", {})
+        return cls(
+            active_fps=float(ocr_cfg.get("active_fps", DEFAULT_ACTIVE_FPS)),
+            idle_fps=float(ocr_cfg.get("idle_fps", DEFAULT_IDLE_FPS)),
+            idle_after=float(ocr_cfg.get("idle_after", DEFAULT_IDLE_AFTER)),
+            cpu_budget=float(ocr_cfg.get("cpu_budget", DEFAULT_CPU_BUDGET)),
+        )
+
+    @property
+    def is_active(self) -> bool:
+        """Şerit son ``idle_after`` saniye içinde görüldü mü?"""
+        if self._last_highlight is None:
+            return False
+        return (time.monotonic() - self._last_highlight) < self.idle_after
+
+    def begin_frame(self) -> None:
+        """Karenin iş süresini ölçmek için başlangıç zamanını kaydeder."""
+        self._frame_start = time.monotonic()
+        self._offloaded = 0.0
+
+    def add_work(self, seconds: float) -> None:
+        """Bu kare için hat aşamalarında (tespit, OCR, eşleştirme) harcanan süreyi bütçeye ekler."""
+        self._offloaded += max(0.0, seconds)
+
+    def mark_highlight(self) -> None:
+        """Bu karede menü şeridi bulunduğunu bildirir (hızlı moda geçer)."""
+        self._last_highlight = time.monotonic()
+
+    def next_delay(self) -> float:
+        """Bir sonraki kareye kadar beklenecek süreyi hesaplar."""
+        work = time.monotonic() - self._frame_start
+        interval = self.active_interval if self.is_active else self.idle_interval
+        # İş süresi bütçeyi aşıyorsa aralığı uzat: (work + offloaded) / (work + delay) <= cpu_budget
+        budget_delay = (work + self._offloaded) / self.cpu_budget - work
+        return max(interval - work, budget_delay, 0.0)
+
+    def wait(self) -> float:
+        """Hesaplanan süre kadar uyur, uyunan süreyi döndürür."""
+        delay = self.next_delay()
+        if delay > 0:
+            time.sleep(delay)
+        return delay
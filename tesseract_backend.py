@@ -0,0 +1,399 @@
+# tesseract_backend.py
+"""Tesseract OCR arka uçları.
+
+pytesseract her görüntü için ``tesseract.exe`` başlatır, görüntüyü geçici bir
+PNG'ye yazar ve traineddata'yı yeniden yükler. Kalıcı arka uçlar motoru bir
+kez yükleyip görüntü tamponlarını doğrudan verir:
+
+- ``tesserocr`` (pip paketi kuruluysa)
+- libtesseract C API (tesseract kurulumundaki DLL/so, ctypes ile; ek paket gerekmez)
+- pytesseract (yedek: süreç başına bir görüntü, eski davranış)
+
+Tüm arka uçlar tek istekte birden fazla ROI kabul eder. Kalıcı motorlar
+thread'e bağlıdır; oluşturan thread kullanmalı ve ``close()`` çağırmalıdır.
+
+``TesseractPool`` her işçi süreçte bir kalıcı motor tutar ve bir karenin
+ROI'lerini paralel okur; sonuçlar kontur sırasıyla döner.
+
+``recognize_stitched`` bir karedeki tüm ROI'leri alt alta tek sayfaya dizer,
+motoru bir kez satır bölütlemeli modda çalıştırır ve satırları y-konumuna
+göre kaynak ROI'lere geri dağıtır.
+"""
+import bisect
+import concurrent.futures
+import ctypes
+import ctypes.util
+import glob
+import logging
+import os
+from collections import OrderedDict
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+PSM_SINGLE_LINE = 7  # Tek satır metin (--psm 7)
+PSM_SINGLE_BLOCK = 6  # Tek tip metin bloğu, satırlara bölünür (--psm 6)
+RIL_TEXTLINE = 2      # tesseract::PageIteratorLevel::RIL_TEXTLINE
+STITCH_GAP = 24       # Birleştirilmiş sayfada ROI'ler arası boşluk (px, beyaz)
+
+TextLine = Tuple[str, int, int]  # (metin, üst y, alt y) sayfa koordinatında
+
+
+class TesseractBackend:
+    """Tesseract arka uç arayüzü. ``with`` bloğu ile de kullanılabilir."""
+
+    name = "base"
+
+    def recognize(self, images: Sequence[np.ndarray]) -> List[str]:
+        """Her gri/ikili görüntü için okunan metni (okunamazsa "") döndürür."""
+        raise NotImplementedError
+
+    def recognize_lines(self, page: np.ndarray) -> List[TextLine]:
+        """Çok satırlı sayfayı satır bölütlemeli modda okur; satır metni ve dikey sınırları."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "TesseractBackend":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class PytesseractBackend(TesseractBackend):
+    """Eski yol: pytesseract ile görüntü başına bir tesseract süreci."""
+
+    name = "pytesseract"
+
+    def __init__(self, tesseract_cmd: str, lang: str = "eng", psm: int = PSM_SINGLE_LINE):
+        import pytesseract
+        self._pytesseract = pytesseract
+        pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+        self.lang = lang
+        self.config = f"--oem 3 --psm {psm}"
+
+    def recognize(self, images: Sequence[np.ndarray]) -> List[str]:
+        texts = []
+        for image in images:
+            try:
+                texts.append(self._pytesseract.image_to_string(image, lang=self.lang, config=self.config).strip())
+            except Exception:
+                texts.append("")
+        return texts
+
+    def recognize_lines(self, page: np.ndarray) -> List[TextLine]:
+        try:
+            data = self._pytesseract.image_to_data(
+                page, lang=self.lang, config=f"--oem 3 --psm {PSM_SINGLE_BLOCK}",
+                output_type=self._pytesseract.Output.DICT,
+            )
+        except Exception:
+            return []
+        # Kelimeleri (blok, paragraf, satır) numarasına göre satırlara topla
+        lines: "OrderedDict[Tuple[int, int, int], List[int]]" = OrderedDict()
+        for i, word in enumerate(data["text"]):
+            if word and word.strip():
+                key = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+                lines.setdefault(key, []).append(i)
+        result = []
+        for indices in lines.values():
+            text = " ".join(data["text"][i].strip() for i in indices)
+            top = min(data["top"][i] for i in indices)
+            bottom = max(data["top"][i] + data["height"][i] for i in indices)
+            result.append((text, top, bottom))
+        return result
+
+
+class TesserocrBackend(TesseractBackend):
+    """tesserocr bağlaması ile kalıcı motor."""
+
+    name = "tesserocr"
+
+    def __init__(self, tessdata_dir: Optional[str], lang: str = "eng", psm: int = PSM_SINGLE_LINE):
+        import tesserocr
+        self._tesserocr = tesserocr
+        self.psm = psm
+        kwargs = {"lang": lang, "psm": psm}
+        if tessdata_dir:
+            kwargs["path"] = tessdata_dir
+        self._api = tesserocr.PyTessBaseAPI(**kwargs)
+
+    def _set_image(self, image: np.ndarray) -> None:
+        image = np.ascontiguousarray(image, dtype=np.uint8)
+        height, width = image.shape[:2]
+        self._api.SetImageBytes(image.tobytes(), width, height, 1, width)
+
+    def recognize(self, images: Sequence[np.ndarray]) -> List[str]:
+        texts = []
+        for image in images:
+            self._set_image(image)
+            texts.append((self._api.GetUTF8Text() or "").strip())
+        return texts
+
+    def recognize_lines(self, page: np.ndarray) -> List[TextLine]:
+        level = self._tesserocr.RIL.TEXTLINE
+        self._api.SetPageSegMode(PSM_SINGLE_BLOCK)
+        try:
+            self._set_image(page)
+            self._api.Recognize()
+            result = []
+            iterator = self._api.GetIterator()
+            if iterator is None:
+                return result
+            for line in self._tesserocr.iterate_level(iterator, level):
+                text = (line.GetUTF8Text(level) or "").strip()
+                box = line.BoundingBox(level)
+                if text and box:
+                    result.append((text, box[1], box[3]))
+            return result
+        finally:
+            self._api.SetPageSegMode(self.psm)
+
+    def close(self) -> None:
+        if self._api is not None:
+            self._api.End()
+            self._api = None
+
+
+class CApiBackend(TesseractBackend):
+    """libtesseract C API'sine ctypes ile bağlanan kalıcı motor."""
+
+    name = "capi"
+
+    def __init__(self, library_path: str, tessdata_dir: Optional[str], lang: str = "eng",
+                 psm: int = PSM_SINGLE_LINE):
+        lib = ctypes.CDLL(library_path)
+        lib.TessBaseAPICreate.restype = ctypes.c_void_p
+        lib.TessBaseAPIInit3.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_char_p]
+        lib.TessBaseAPIInit3.restype = ctypes.c_int
+        lib.TessBaseAPISetPageSegMode.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        lib.TessBaseAPISetImage.argtypes = [ctypes.c_void_p, ctypes.c_void_p,
+                                            ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int]
+        lib.TessBaseAPIGetUTF8Text.argtypes = [ctypes.c_void_p]
+        lib.TessBaseAPIGetUTF8Text.restype = ctypes.c_void_p  # TessDeleteText ile serbest bırakılır
+        lib.TessDeleteText.argtypes = [ctypes.c_void_p]
+        lib.TessBaseAPIEnd.argtypes = [ctypes.c_void_p]
+        lib.TessBaseAPIDelete.argtypes = [ctypes.c_void_p]
+        # Satır bölütlemeli okuma için sonuç yineleyicisi
+        lib.TessBaseAPIRecognize.argtypes = [ctypes.c_void_p, ctypes.c_void_p]
+        lib.TessBaseAPIRecognize.restype = ctypes.c_int
+        lib.TessBaseAPIGetIterator.argtypes = [ctypes.c_void_p]
+        lib.TessBaseAPIGetIterator.restype = ctypes.c_void_p
+        lib.TessResultIteratorGetPageIterator.argtypes = [ctypes.c_void_p]
+        lib.TessResultIteratorGetPageIterator.restype = ctypes.c_void_p
+        lib.TessResultIteratorGetUTF8Text.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        lib.TessResultIteratorGetUTF8Text.restype = ctypes.c_void_p
+        lib.TessPageIteratorBoundingBox.argtypes = [ctypes.c_void_p, ctypes.c_int] + [ctypes.POINTER(ctypes.c_int)] * 4
+        lib.TessPageIteratorBoundingBox.restype = ctypes.c_int
+        lib.TessPageIteratorNext.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        lib.TessPageIteratorNext.restype = ctypes.c_int
+        lib.TessResultIteratorDelete.argtypes = [ctypes.c_void_p]
+        self._lib = lib
+        self.psm = psm
+
+        self._api = lib.TessBaseAPICreate()
+        datapath = tessdata_dir.encode("utf-8") if tessdata_dir else None
+        if lib.TessBaseAPIInit3(self._api, datapath, lang.encode("utf-8")) != 0:
+            lib.TessBaseAPIDelete(self._api)
+            self._api = None
+            raise RuntimeError(f"libtesseract başlatılamadı (tessdata: {tessdata_dir}, dil: {lang})")
+        lib.TessBaseAPISetPageSegMode(self._api, psm)
+
+    def _set_image(self, image: np.ndarray) -> np.ndarray:
+        image = np.ascontiguousarray(image, dtype=np.uint8)
+        height, width = image.shape[:2]
+        self._lib.TessBaseAPISetImage(self._api, image.ctypes.data, width, height, 1, image.strides[0])
+        return image  # Tampon tanınma bitene kadar canlı kalmalı
+
+    def _take_text(self, text_ptr) -> str:
+        if not text_ptr:
+            return ""
+        try:
+            return ctypes.string_at(text_ptr).decode("utf-8", "replace").strip()
+        finally:
+            self._lib.TessDeleteText(text_ptr)
+
+    def recognize(self, images: Sequence[np.ndarray]) -> List[str]:
+        texts = []
+        for image in images:
+            image = self._set_image(image)
+            texts.append(self._take_text(self._lib.TessBaseAPIGetUTF8Text(self._api)))
+        return texts
+
+    def recognize_lines(self, page: np.ndarray) -> List[TextLine]:
+        lib = self._lib
+        lib.TessBaseAPISetPageSegMode(self._api, PSM_SINGLE_BLOCK)
+        try:
+            page = self._set_image(page)
+            if lib.TessBaseAPIRecognize(self._api, None) != 0:
+                return []
+            iterator = lib.TessBaseAPIGetIterator(self._api)
+            if not iterator:
+                return []
+            result = []
+            try:
+                page_iterator = lib.TessResultIteratorGetPageIterator(iterator)
+                box = [ctypes.c_int() for _ in range(4)]
+                while True:
+                    text = self._take_text(lib.TessResultIteratorGetUTF8Text(iterator, RIL_TEXTLINE))
+                    if text and lib.TessPageIteratorBoundingBox(page_iterator, RIL_TEXTLINE,
+                                                                *[ctypes.byref(v) for v in box]):
+                        result.append((text, box[1].value, box[3].value))
+                    if not lib.TessPageIteratorNext(page_iterator, RIL_TEXTLINE):
+                        break
+            finally:
+                lib.TessResultIteratorDelete(iterator)
+            return result
+        finally:
+            lib.TessBaseAPISetPageSegMode(self._api, self.psm)
+
+    def close(self) -> None:
+        if self._api is not None:
+            self._lib.TessBaseAPIEnd(self._api)
+            self._lib.TessBaseAPIDelete(self._api)
+            self._api = None
+
+
+def stitch_images(images: Sequence[np.ndarray], gap: int = STITCH_GAP) -> Tuple[np.ndarray, List[int]]:
+    """ROI'leri beyaz boşluklarla alt alta tek sayfaya dizer; her ROI'nin üst y'sini döndürür."""
+    width = max(image.shape[1] for image in images)
+    height = sum(image.shape[0] for image in images) + gap * (len(images) + 1)
+    page = np.full((height, width), 255, dtype=np.uint8)
+    tops = []
+    y = gap
+    for image in images:
+        h, w = image.shape[:2]
+        page[y:y + h, :w] = image
+        tops.append(y)
+        y += h + gap
+    return page, tops
+
+
+def recognize_stitched(backend: TesseractBackend, images: Sequence[np.ndarray],
+                       gap: int = STITCH_GAP) -> List[str]:
+    """Tüm ROI'leri tek OCR çağrısıyla okur; satırları y-merkezine göre ROI'lere dağıtır.
+
+    Sonuç ``backend.recognize(images)`` ile aynı sırada, ROI başına bir metindir.
+    """
+    if len(images) <= 1:
+        return backend.recognize(images)
+    page, tops = stitch_images(images, gap)
+    bottoms = [top + image.shape[0] for top, image in zip(tops, images)]
+    texts = [""] * len(images)
+    for text, top, bottom in backend.recognize_lines(page):
+        center = (top + bottom) / 2.0
+        index = bisect.bisect_right(tops, center) - 1
+        # Boşluğa düşen satırlar (ör. kenarlık gürültüsü) hiçbir ROI'ye ait değildir
+        if index >= 0 and center <= bottoms[index]:
+            texts[index] = f"{texts[index]} {text}".strip()
+    return texts
+
+
+# İşçi süreçteki motor (_init_pool_worker kurar, süreç kapanana kadar yaşar)
+_worker_backend: Optional[TesseractBackend] = None
+
+
+def _init_pool_worker(tesseract_cmd: str, preferred: str, lang: str, psm: int) -> None:
+    global _worker_backend
+    _worker_backend = create_tesseract_backend(tesseract_cmd, preferred, lang, psm)
+
+
+def _pool_recognize(image: np.ndarray) -> str:
+    return _worker_backend.recognize([image])[0]
+
+
+def _pool_recognize_lines(page: np.ndarray) -> List[TextLine]:
+    return _worker_backend.recognize_lines(page)
+
+
+class TesseractPool(TesseractBackend):
+    """N işçi süreçli Tesseract: her süreç kendi motorunu bir kez yükler.
+
+    ``recognize`` ROI'leri işçilere dağıtır ve sonuçları giriş (kontur)
+    sırasıyla döndürür. ``close`` bekleyen işleri iptal eder ve süreçlerin
+    çıkmasını bekler (o an okunan ROI'ler tamamlanır).
+    """
+
+    name = "pool"
+
+    def __init__(self, tesseract_cmd: str, workers: int, preferred: str = "auto",
+                 lang: str = "eng", psm: int = PSM_SINGLE_LINE):
+        self.workers = workers
+        self._executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_pool_worker,
+            initargs=(tesseract_cmd, preferred, lang, psm),
+        )
+        # İşçileri şimdi başlat: motor yükleme süresi ilk kareye yansımasın
+        # ve kurulum hatası döngü başında görülsün
+        for future in [self._executor.submit(_pool_recognize, np.full((8, 8), 255, np.uint8))
+                       for _ in range(workers)]:
+            future.result()
+        logging.info(f"[Tesseract] İşçi havuzu: {workers} süreç")
+
+    def recognize(self, images: Sequence[np.ndarray]) -> List[str]:
+        if not images:
+            return []
+        return list(self._executor.map(_pool_recognize, images))
+
+    def recognize_lines(self, page: np.ndarray) -> List[TextLine]:
+        return self._executor.submit(_pool_recognize_lines, page).result()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+def _find_tessdata(tesseract_cmd: str) -> Optional[str]:
+    """TESSDATA_PREFIX veya tesseract.exe yanındaki tessdata klasörü."""
+    prefix = os.getenv("TESSDATA_PREFIX")
+    if prefix and os.path.isdir(prefix):
+        return prefix
+    candidate = os.path.join(os.path.dirname(tesseract_cmd), "tessdata")
+    return candidate if os.path.isdir(candidate) else None
+
+
+def _find_libtesseract(tesseract_cmd: str) -> Optional[str]:
+    """Kurulum klasöründeki (Windows: libtesseract-5.dll) veya sistemdeki libtesseract."""
+    install_dir = os.path.dirname(tesseract_cmd)
+    if install_dir:
+        for pattern in ("libtesseract*.dll", "tesseract*.dll", "libtesseract*.so*", "libtesseract*.dylib"):
+            matches = sorted(glob.glob(os.path.join(install_dir, pattern)))
+            if matches:
+                return matches[-1]
+    return ctypes.util.find_library("tesseract")
+
+
+def create_tesseract_backend(tesseract_cmd: str, preferred: str = "auto",
+                             lang: str = "eng", psm: int = PSM_SINGLE_LINE) -> TesseractBackend:
+    """Kullanılabilir en hızlı arka ucu oluşturur.
+
+    ``preferred``: "auto" (tesserocr -> capi -> pytesseract sırası), "tesserocr",
+    "capi" veya "pytesseract". İstenen kurulamazsa sıradaki denenir.
+    """
+    order = ["tesserocr", "capi", "pytesseract"]
+    if preferred in order:
+        order.remove(preferred)
+        order.insert(0, preferred)
+    tessdata_dir = _find_tessdata(tesseract_cmd)
+
+    for name in order:
+        try:
+            if name == "tesserocr":
+                backend = TesserocrBackend(tessdata_dir, lang, psm)
+            elif name == "capi":
+                library = _find_libtesseract(tesseract_cmd)
+                if not library:
+                    continue
+                backend = CApiBackend(library, tessdata_dir, lang, psm)
+            else:
+                backend = PytesseractBackend(tesseract_cmd, lang, psm)
+        except Exception as e:
+            logging.debug(f"[Tesseract] '{name}' arka ucu kullanılamıyor: {e}")
+            continue
+        logging.info(f"[Tesseract] Arka uç: {backend.name}")
+        return backend
+    raise RuntimeError("Hiçbir Tesseract arka ucu kurulamadı")
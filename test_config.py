@@ -0,0 +1,89 @@
+# test_config.py
+"""config: izleyicili süreçler için bellek içi config önbelleği."""
+import json
+
+import pytest
+
+import config
+
+
+@pytest.fixture
+def config_file(tmp_path, monkeypatch):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"autopilot": True, "ocr": {"active_fps": 8}}), encoding="utf-8")
+    monkeypatch.setattr(config, "CONFIG_FILE", str(path))
+    monkeypatch.setattr(config, "_config_cache", None)
+    monkeypatch.setattr(config, "_config_cache_enabled", False)
+    return path
+
+
+def write(path, data):
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+def test_without_cache_reads_disk_every_time(config_file):
+    assert config.load_config()["ocr"]["active_fps"] == 8
+    write(config_file, {"ocr": {"active_fps": 4}})
+    assert config.load_config()["ocr"]["active_fps"] == 4
+
+
+def test_cache_serves_until_invalidated(config_file):
+    config.enable_config_cache()
+    assert config.load_config()["ocr"]["active_fps"] == 8
+    write(config_file, {"ocr": {"active_fps": 4}})
+    assert config.load_config()["ocr"]["active_fps"] == 8
+    config.invalidate_config_cache()
+    assert config.load_config()["ocr"]["active_fps"] == 4
+
+
+def test_cached_copies_are_independent(config_file):
+    config.enable_config_cache()
+    first = config.load_config()
+    first["ocr"]["active_fps"] = 30
+    assert config.load_config()["ocr"]["active_fps"] == 8
+
+
+def test_save_updates_cache(config_file):
+    config.enable_config_cache()
+    cfg = config.load_config()
+    cfg["autopilot"] = False
+    config.save_config(cfg)
+    assert config.load_config()["autopilot"] is False
+    assert json.loads(config_file.read_text(encoding="utf-8"))["autopilot"] is False
+
+
+def test_stale_read_is_not_cached(config_file, monkeypatch):
+    config.enable_config_cache()
+    read_config = config._read_config
+
+    def read_then_change():
+        data = read_config()
+        config.invalidate_config_cache()  # Okuma sürerken dosya değişti
+        return data
+
+    monkeypatch.setattr(config, "_read_config", read_then_change)
+    config.load_config()
+    assert config._config_cache is None
+
+
+def test_read_overtaken_by_save_is_not_cached(config_file, monkeypatch):
+    config.enable_config_cache()
+    read_config = config._read_config
+
+    def read_then_save():
+        result = read_config()
+        config.save_config({"ocr": {"active_fps": 4}})  # Okuma sürerken başka yerden kaydedildi
+        return result
+
+    monkeypatch.setattr(config, "_read_config", read_then_save)
+    assert config.load_config()["ocr"]["active_fps"] == 8
+    assert config.load_config()["ocr"]["active_fps"] == 4
+
+
+def test_fallback_defaults_are_not_cached(config_file):
+    config.enable_config_cache()
+    config_file.write_text("{bozuk", encoding="utf-8")  # Yazılırken yarım okunan dosya
+    assert config.load_config() == config.get_scaled_default_config()
+    assert config._config_cache is None
+    write(config_file, {"ocr": {"active_fps": 4}})
+    assert config.load_config()["ocr"]["active_fps"] == 4
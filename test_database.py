@@ -0,0 +1,234 @@
+# test_database.py
+"""database: GarageStore sürüm sayacı ve abone bildirimi; küçük sabit veritabanında kayıtlar ve istatistikler."""
+import json
+import os
+import threading
+
+import pytest
+
+import database
+from database import (GarageStore, get_garage_stats, get_smart_badges, get_vehicle_advice, load_vehicle_database,
+                      vehicle_record, vehicle_table)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return GarageStore(str(tmp_path / "garajim.json"))
+
+
+def test_missing_file_is_empty(store):
+    assert store.names() == ()
+    assert "Adder" not in store
+    assert len(store) == 0
+
+
+def test_save_bumps_version_and_notifies(store):
+    seen = []
+    store.subscribe(seen.append)
+    start = store.version
+    store.save(["Adder", "T20"])
+    assert store.names() == ("Adder", "T20")
+    assert store.owned() == frozenset({"Adder", "T20"})
+    assert store.version == start + 1
+    assert seen == [start + 1]
+    with open(store.path, "r", encoding="utf-8") as f:
+        assert json.load(f) == ["Adder", "T20"]
+
+
+def test_same_content_does_not_bump_version(store):
+    seen = []
+    store.save(["Adder"])
+    store.subscribe(seen.append)
+    version = store.version
+    store.save(["Adder"])
+    assert store.version == version
+    assert seen == []
+
+
+def test_toggle_adds_and_removes(store):
+    seen = []
+    store.subscribe(seen.append)
+    assert store.toggle("Adder") is True
+    assert store.toggle("T20") is True
+    assert store.toggle("Adder") is False
+    assert store.names() == ("T20",)
+    assert len(seen) == 3
+
+
+@pytest.mark.parametrize("action", ["save", "toggle"])
+def test_subscribers_run_outside_the_lock(store, action):
+    # Abone (ör. Qt sinyali) başka bir thread'i beklerse kilit serbest olmalı
+    free = []
+
+    def try_lock():
+        acquired = store._lock.acquire(timeout=0.5)
+        if acquired:
+            store._lock.release()
+        free.append(acquired)
+
+    def probe(version):
+        worker = threading.Thread(target=try_lock)
+        worker.start()
+        worker.join()
+
+    store.subscribe(probe)
+    if action == "save":
+        store.save(["Adder"])
+    else:
+        store.toggle("Adder")
+    assert free == [True]
+
+
+def test_unsubscribe(store):
+    seen = []
+    store.subscribe(seen.append)
+    store.unsubscribe(seen.append)
+    store.save(["Adder"])
+    assert seen == []
+
+
+def test_reload_picks_up_external_change(store):
+    store.save(["Adder"])
+    version = store.version
+    assert not store.reload()  # Dosya değişmedi
+    with open(store.path, "w", encoding="utf-8") as f:
+        json.dump(["Adder", "Zentorno"], f)
+    mtime = os.path.getmtime(store.path) + 5
+    os.utime(store.path, (mtime, mtime))
+    assert store.reload()
+    assert store.version == version + 1
+    assert "Zentorno" in store
+
+
+# Küçük sabit veritabanı: beklenen değerler elle hesaplanmıştır
+FIXTURE_DB = [
+    {"Vehicle Name": "Truffade Adder", "Manufacturer": "Truffade", "Vehicle Class": "Super",
+     "GTA Online Price": "$1,000,000", "Top Speed (Broughy)": "123.50 mph", "Stat - Acceleration": "85",
+     "Lap Time": "1:04.864", "Seats": "2", "Mass / Weight": "1,800 kg"},
+    {"Vehicle Name": "Pegassi Zentorno", "Manufacturer": "Pegassi", "Vehicle Class": "Super",
+     "GTA Online Price": "$725,000", "Top Speed (Broughy)": "125.00 mph", "Stat - Acceleration": "91"},
+    {"Vehicle Name": "Grotti Turismo R", "Manufacturer": "Grotti", "Vehicle Class": "Super",
+     "GTA Online Price": "$500,000", "Top Speed (Broughy)": "120.25 mph"},
+    {"Vehicle Name": "Grotti Cheetah", "Manufacturer": "Grotti", "Vehicle Class": "Super",
+     "GTA Online Price": "$650,000", "Top Speed (Broughy)": "110.00 mph"},
+    {"Vehicle Name": "Progen T20", "Manufacturer": "Progen", "Vehicle Class": "Super",
+     "GTA Online Price": "$2,200,000", "Top Speed (Broughy)": ""},
+    {"Vehicle Name": "Ocelot Pariah", "Manufacturer": "Ocelot", "Vehicle Class": "Sports",
+     "GTA Online Price": "$1,420,000", "Top Speed (Broughy)": "136.00 mph"},
+    {"Vehicle Name": "Karin Sultan", "Manufacturer": "Karin", "Vehicle Class": "Sports",
+     "GTA Online Price": "$12,000", "Top Speed (Broughy)": "105.00 mph"},
+    {"Vehicle Name": "Pegassi Oppressor", "Manufacturer": "Pegassi", "Vehicle Class": "Motorcycles",
+     "GTA Online Price": "$3,524,500", "Vehicle Features": "Weaponized, Flight"},
+    {"Vehicle Name": "Benefactor Schafter V12 (Armored)", "Manufacturer": "Benefactor", "Vehicle Class": "Sedans",
+     "GTA Online Price": "$325,000", "Top Speed (Broughy)": "110.00 mph", "Bulletproof": "Yes"},
+]
+FIXTURE_GARAGE = ["Truffade Adder", "Pegassi Zentorno", "Grotti Turismo R", "Karin Sultan", "Silinmiş Araç"]
+
+
+@pytest.fixture
+def fixture_db(tmp_path, monkeypatch):
+    """Sabit veritabanını gerçek yükleme yolundan yükler; garaj geçici dosyada."""
+    db_file = tmp_path / "gta_tum_araclar.json"
+    db_file.write_text(json.dumps(FIXTURE_DB), encoding="utf-8")
+    monkeypatch.setattr(database, "VEHICLE_DB_FILE", str(db_file))
+    monkeypatch.setattr(database, "garage_store", GarageStore(str(tmp_path / "garajim.json")))
+    monkeypatch.setattr(database, "_vehicle_records", {})
+    monkeypatch.setattr(database, "_vehicle_table", None)
+    monkeypatch.setattr(database, "_garage_overlay", None)
+    database.garage_store.save(FIXTURE_GARAGE)
+    return load_vehicle_database()
+
+
+def test_records_parse_fixture_fields(fixture_db):
+    search_dict, db_data = fixture_db
+    assert len(db_data) == 9
+    # Arama anahtarlarında üretici öneki atılır
+    assert {"Adder", "Zentorno", "Schafter V12 (Armored)"} <= set(search_dict)
+    adder = vehicle_record(search_dict["Adder"])
+    assert (adder.price, adder.top_speed, adder.acceleration) == (1000000.0, 123.5, 85.0)
+    assert (adder.lap_time, adder.seats, adder.mass) == (pytest.approx(64.864), 2, 1800.0)
+    assert not adder.bulletproof and not adder.weaponized
+    t20 = vehicle_record(search_dict["T20"])
+    assert (t20.top_speed, t20.lap_time, t20.seats) == (0.0, 0.0, 0)
+    assert vehicle_record(search_dict["Oppressor"]).weaponized
+    assert vehicle_record(search_dict["Schafter V12 (Armored)"]).bulletproof
+    # Yüklenen sözlüklerin kaydı yeniden ayrıştırılmaz
+    assert vehicle_record(search_dict["Adder"]) is adder
+
+
+def test_badges_for_fixture_vehicles(fixture_db):
+    search_dict, _ = fixture_db
+    assert get_smart_badges(search_dict["Zentorno"]) == [
+        ("✅ SAHİPSİN", "#2ecc71"), ("🔥 F/P CANAVARI", "#e17055"), ("⚡ ROKET", "#6c5ce7")]
+    assert get_smart_badges(search_dict["Zentorno"], for_hud=True) == [
+        ("🔥 F/P CANAVARI", "#e17055"), ("⚡ ROKET", "#6c5ce7")]
+    assert get_smart_badges(search_dict["Pariah"]) == [("🚙 STANDART", "#636e72")]  # Hızlı ama F/P sınırının üstünde
+    assert get_smart_badges(search_dict["Oppressor"]) == [("⚔️ SİLAHLI", "#d63031"), ("💎 LÜKS", "#fdcb6e")]
+    assert get_smart_badges(search_dict["Schafter V12 (Armored)"]) == [("🛡️ ZIRHLI", "#0984e3")]
+    assert get_smart_badges(search_dict["Sultan"], for_hud=True) == [("🚙 STANDART", "#636e72")]
+
+
+def test_garage_stats_for_fixture(fixture_db):
+    _, db_data = fixture_db
+    # Veritabanında olmayan araç sayılır ama değeri yoktur
+    assert get_garage_stats(db_data) == (5, "$2,237,000")
+    database.garage_store.toggle("Karin Sultan")
+    assert get_garage_stats(db_data) == (4, "$2,225,000")
+
+
+def test_analytics_summary_for_fixture(fixture_db):
+    _, db_data = fixture_db
+    table = vehicle_table(db_data)
+    owned_rows = table.owned_rows(database.garage_store.names())
+    assert owned_rows.tolist() == [0, 1, 2, 6]
+    assert table.total(owned_rows, "price") == 2237000.0
+    assert table.names[table.top_row(owned_rows, "price")] == "Truffade Adder"
+    assert table.names[table.top_row(owned_rows, "top_speed")] == "Pegassi Zentorno"
+    assert table.class_counts(owned_rows) == [("Super", 3), ("Sports", 1)]
+    assert table.class_labels == ["Motorcycles", "Sedans", "Sports", "Super"]
+    assert table.vendor_labels == [""]
+
+
+def test_table_sorts_like_sorted_for_fixture(fixture_db):
+    _, db_data = fixture_db
+    table = vehicle_table(db_data)
+    rows = range(len(db_data))
+    assert table.sort_rows(rows, "price", descending=True).tolist() == [7, 4, 5, 0, 1, 3, 2, 8, 6]
+    # Eşit hızlar (Cheetah/Schafter, hızı bilinmeyenler) veritabanı sırasını korur
+    assert table.sort_rows(rows, "top_speed", descending=True).tolist() == [5, 1, 0, 2, 3, 8, 6, 4, 7]
+    assert table.sort_rows([6, 2, 0], "price").tolist() == [6, 2, 0]
+
+
+def test_vehicle_advice_for_fixture(fixture_db):
+    search_dict, db_data = fixture_db
+    # Super hız sırası: Zentorno, Adder, Turismo R, Cheetah (T20'nin hızı bilinmiyor)
+    assert get_vehicle_advice(search_dict["Zentorno"], db_data) == [
+        ("🏅 SINIFININ EN HIZLISI!", "#00b894"),
+        ("🏠 Bu sınıfta 3 aracın var", "#636e72"),
+        ("⭐ Garajındaki en hızlı!", "#ffeaa7"),
+    ]
+    assert get_vehicle_advice(search_dict["Adder"], db_data) == [
+        ("🥈 Sınıf hız sırası: 2/4", "#74b9ff"),
+        ("🏠 Bu sınıfta 3 aracın var", "#636e72"),
+        ("💨 Daha hızlın var: Pegassi Zentorno", "#ffeaa7"),
+    ]
+    assert get_vehicle_advice(search_dict["Cheetah"], db_data) == [
+        ("📊 Sınıf hız sırası: 4/4", "#AAAAAA"),
+        ("🏠 Bu sınıfta 3 aracın var", "#636e72"),
+        ("💨 Daha hızlın var: Pegassi Zentorno", "#ffeaa7"),
+    ]
+    # Sınıfta tek araç: garaj karşılaştırması yok; hızı bilinmeyen araç için tavsiye yok
+    assert get_vehicle_advice(search_dict["Sultan"], db_data) == [("🥈 Sınıf hız sırası: 2/2", "#74b9ff")]
+    assert get_vehicle_advice(search_dict["T20"], db_data) == []
+    assert get_vehicle_advice(search_dict["Oppressor"], db_data) == []
+
+
+def test_vehicle_advice_follows_garage_changes(fixture_db):
+    search_dict, db_data = fixture_db
+    get_vehicle_advice(search_dict["Adder"], db_data)
+    database.garage_store.toggle("Pegassi Zentorno")  # Katman garaj sürümüyle yenilenir
+    assert get_vehicle_advice(search_dict["Adder"], db_data) == [
+        ("🥈 Sınıf hız sırası: 2/4", "#74b9ff"),
+        ("🏠 Bu sınıfta 2 aracın var", "#636e72"),
+        ("⭐ Garajındaki en hızlı!", "#ffeaa7"),
+    ]
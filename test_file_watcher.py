@@ -0,0 +1,93 @@
+# test_file_watcher.py
+"""file_watcher: dizin izleme, imza karşılaştırması ve yoklama yedeği."""
+import json
+import os
+import time
+
+import pytest
+
+pytest.importorskip("PyQt5")
+from PyQt5.QtCore import QCoreApplication  # noqa: E402
+
+from file_watcher import FileWatcher, file_signature  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+def atomic_write(path, data):
+    """Uygulamanın kaydettiği gibi: geçici dosya + os.replace."""
+    temp = f"{path}.tmp"
+    with open(temp, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(temp, path)
+
+
+def wait_until(app, predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        app.processEvents()
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_file_signature(tmp_path):
+    path = tmp_path / "garajim.json"
+    assert file_signature(str(path)) is None
+    path.write_text("[]", encoding="utf-8")
+    assert file_signature(str(path))[1] == 2
+
+
+def test_atomic_save_triggers_callback(app, tmp_path):
+    path = str(tmp_path / "garajim.json")
+    atomic_write(path, [])
+    calls = []
+    watcher = FileWatcher()
+    watcher.watch(path, lambda: calls.append(path))
+    assert not watcher.polling
+
+    atomic_write(path, ["Adder"])
+    assert wait_until(app, lambda: calls)
+    assert calls == [path]
+
+
+def test_unchanged_signature_is_not_reported(app, tmp_path):
+    path = str(tmp_path / "config.json")
+    atomic_write(path, {})
+    calls = []
+    watcher = FileWatcher()
+    watcher.watch(path, lambda: calls.append(path))
+    # Aynı dizindeki başka bir dosya olay üretir ama izlenen dosya değişmedi
+    atomic_write(str(tmp_path / "other.json"), {})
+    wait_until(app, lambda: False, timeout=0.4)
+    assert calls == []
+    assert watcher.check() == []
+
+
+def test_failing_callback_does_not_block_others(app, tmp_path):
+    path = str(tmp_path / "config.json")
+    atomic_write(path, {})
+    calls = []
+    watcher = FileWatcher()
+    watcher.watch(path, lambda: 1 / 0)
+    watcher.watch(path, lambda: calls.append(path))
+    atomic_write(path, {"autopilot": False})
+    assert watcher.check() == [path]
+    assert calls == [path]
+
+
+def test_missing_directory_falls_back_to_polling(app, tmp_path):
+    directory = tmp_path / "sonra"
+    path = str(directory / "garajim.json")
+    calls = []
+    watcher = FileWatcher(poll_interval_ms=50)
+    watcher.watch(path, lambda: calls.append(path))
+    assert watcher.polling
+
+    directory.mkdir()
+    atomic_write(path, ["Adder"])
+    assert wait_until(app, lambda: calls)
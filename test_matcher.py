@@ -0,0 +1,245 @@
+# test_matcher.py
+"""matcher: HUD oylaması (k/n), önbellek onayı ve indeksli eşleştirici vs eski tam tarama."""
+import os
+import random
+import sys
+import threading
+
+import pytest
+from thefuzz import fuzz, process
+
+from database import load_vehicle_database
+from matcher import MatchDebouncer, TfidfNameIndex, VehicleNameIndex, VehicleResolver
+
+
+def test_single_read_does_not_switch_hud():
+    debouncer = MatchDebouncer(window=4, required=2, fast_score=101)
+    assert debouncer.push("adder", 90) is None
+    assert debouncer.current is None
+    assert debouncer.push("adder", 90) == "adder"
+    assert debouncer.current == "adder"
+
+
+def test_noisy_frame_is_outvoted():
+    debouncer = MatchDebouncer(window=4, required=2, fast_score=101)
+    for match in ("adder", "adder", "t20", "adder", "adder"):
+        debouncer.push(match, 90)
+    assert debouncer.current == "adder"
+    assert debouncer.emits == 1
+    assert debouncer.raw_emits == 3
+
+
+def test_votes_outside_window_expire():
+    debouncer = MatchDebouncer(window=3, required=2, fast_score=101)
+    for match in ("t20", None, None, "t20"):
+        debouncer.push(match, 90)
+    assert debouncer.current is None
+
+
+def test_fast_score_emits_on_empty_hud():
+    debouncer = MatchDebouncer(window=4, required=2, fast_score=95)
+    assert debouncer.push("adder", 97) == "adder"
+    # HUD doluyken yüksek skor da oylamaya tabidir
+    assert debouncer.push("t20", 100) is None
+
+
+def test_confirmed_requires_k_of_n_even_after_fast_emit():
+    debouncer = MatchDebouncer(window=4, required=2, fast_score=95)
+    debouncer.push("adder", 100)
+    assert debouncer.current == "adder"
+    assert not debouncer.confirmed("adder")
+    debouncer.push("adder", 100)
+    assert debouncer.confirmed("adder")
+    assert not debouncer.confirmed(None)
+
+
+def test_no_voting_confirms_every_match():
+    debouncer = MatchDebouncer(window=1, required=1)
+    assert debouncer.push("adder", 50) == "adder"
+    assert debouncer.confirmed("adder")
+
+
+def test_reset_clears_votes():
+    debouncer = MatchDebouncer(window=4, required=2, fast_score=101)
+    debouncer.push("adder", 90)
+    debouncer.reset()
+    assert debouncer.push("adder", 90) is None
+    assert debouncer.current is None
+
+
+def test_reset_from_another_thread_waits_for_push():
+    # Hat hatası reset'i başka thread'den çağırır; oy eklenirken durum yarıda silinmemeli
+    debouncer = MatchDebouncer(window=4, required=2, fast_score=101)
+    debouncer.push("adder", 90)
+    worker = threading.Thread(target=debouncer.reset)
+    with debouncer._lock:
+        worker.start()
+        worker.join(timeout=0.2)
+        assert worker.is_alive()
+        assert debouncer._votes.count("adder") == 1
+    worker.join()
+    assert not debouncer.confirmed("adder")
+    assert debouncer.push("adder", 90) is None
+
+
+# Eski tam taramayla karşılaştırma (benchmarks/bench_matcher.py ile aynı örnekler)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks"))
+from bench_matcher import DEFAULT_SAMPLES, legacy_match, load_samples  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def search_dict():
+    search_dict, _ = load_vehicle_database()
+    return search_dict
+
+
+@pytest.mark.parametrize("index_class", [VehicleNameIndex, TfidfNameIndex])
+def test_index_matches_legacy_full_scan(search_dict, index_class):
+    keys = list(search_dict.keys())
+    index = index_class.from_search_dict(search_dict)
+    mismatches = []
+    for text in load_samples(DEFAULT_SAMPLES):
+        old = legacy_match(text, keys)
+        new = index.match(text)
+        # Katlanmış anahtarla çözülenler 100 skor alır; yalnızca seçilen araç karşılaştırılır
+        if (old and old[0]) != (new and new[0]):
+            mismatches.append((text, old, new))
+    assert mismatches == []
+
+
+def noisy_variants(keys, count, seed=5):
+    """Gürültülü OCR okumaları: karışan/eksik/fazla harf, büyük-küçük harf, menü önek/sonekleri."""
+    rng = random.Random(seed)
+    swaps = {"o": "0", "l": "1", "i": "l", "s": "5", "e": "c", "a": "o", "t": "f", "r": "n", "m": "rn", "u": "v"}
+    prefixes = ["", "", "", "Sell ", "Request ", "< ", "Personal Vehicle "]
+    suffixes = ["", "", "", " 2", " >", " $1,250,000", " (Arena)"]
+    variants = []
+    for _ in range(count):
+        text = list(rng.choice(keys))
+        for _ in range(rng.randint(1, 3)):
+            if not text:
+                break
+            i, op = rng.randrange(len(text)), rng.random()
+            if op < 0.35:
+                text[i] = swaps.get(text[i].lower(), text[i])
+            elif op < 0.6:
+                del text[i]
+            elif op < 0.8:
+                text.insert(i, rng.choice("abcdeqkjHI|."))
+            else:
+                text[i] = text[i].swapcase()
+        variants.append(rng.choice(prefixes) + "".join(text) + rng.choice(suffixes))
+    return variants
+
+
+@pytest.fixture(scope="module")
+def noisy_legacy(search_dict):
+    keys = list(search_dict.keys())
+    texts = noisy_variants(keys, 1500) + ["esedr", "jHlster", "Sell Impcqrakor (Arena) 2",
+                                          "Request Utillty Truck (Contender) 2"]
+    return [(text, legacy_match(text, keys)) for text in texts]
+
+
+@pytest.mark.parametrize("index_class", [VehicleNameIndex, TfidfNameIndex])
+def test_noisy_reads_rank_like_legacy_full_scan(search_dict, noisy_legacy, index_class):
+    index = index_class.from_search_dict(search_dict)
+    # Katlanmış anahtar kısa yolu atlanır: yalnızca bulanık sıralama karşılaştırılır
+    mismatches = []
+    for text, old in noisy_legacy:
+        new = index.rank_candidates(text, index.top_candidates(text))
+        if new != old:
+            mismatches.append((text, old, new))
+    assert mismatches == []
+
+
+def test_top_candidates_match_process_extract(search_dict):
+    keys = list(search_dict.keys())
+    index = VehicleNameIndex.from_search_dict(search_dict)
+    for text in noisy_variants(keys, 200, seed=9):
+        expected = [c for c in process.extract(text, keys, scorer=fuzz.WRatio, limit=10)
+                    if c[1] >= VehicleNameIndex.MIN_WRATIO]
+        assert [c for c in index.top_candidates(text) if c[1] >= VehicleNameIndex.MIN_WRATIO] == expected
+
+
+SMALL_DB = {
+    "Adder": {"Vehicle Name": "Truffade Adder", "Delivery Method": "Mechanic"},
+    "Zentorno": {"Vehicle Name": "Pegassi Zentorno", "Delivery Method": "Mechanic"},
+    "Buzzard": {"Vehicle Name": "Buzzard Attack Chopper", "Delivery Method": "Pegasus"},
+    "Oppressor": {"Vehicle Name": "Pegassi Oppressor", "Delivery Method": "Interaction Menu"},
+    "Tug": {"Vehicle Name": "Buckingham Tug", "Delivery Method": "Cannot be requested"},
+}
+
+
+def test_context_restricts_then_falls_back():
+    resolver = VehicleResolver(SMALL_DB, garage=["Truffade Adder"])
+    resolver.set_context("pegasus")
+    assert resolver.match("Buzzard") == ("Buzzard", 100)
+    assert resolver.context_fallbacks == 0
+    # Yanlış sınıflanan başlık: Mechanic aracı yine bulunur
+    assert resolver.match("Zentorn0") == ("Zentorno", 100)
+    assert resolver.match("Adderr")[0] == "Adder"
+    assert resolver.context_fallbacks == 2
+
+
+def test_vehicle_without_context_resolves_while_context_is_active():
+    resolver = VehicleResolver(SMALL_DB)
+    resolver.set_context("mechanic")
+    assert resolver.match("Tug") == ("Tug", 100)
+    assert resolver.match("xqzv") is None
+    assert resolver.stats()["context_fallbacks"] == 2
+
+
+# Karışan karakter katlaması (skorlamasız hızlı yol)
+FOLD_KEYS = ["RM-10 Bombushka", "Oppressor Mk II", "Sultan", "Sultan RS", "Sultan R5", "Zentorno"]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("RM-IO Bombushka", "RM-10 Bombushka"),  # I/O -> 1/0
+    ("RM-1O Bombushka", "RM-10 Bombushka"),
+    ("0ppressor Mk II", "Oppressor Mk II"),  # 0/O
+    ("Oppressor Mk 11", "Oppressor Mk II"),  # 1/I
+    ("Oppressor Mk |l", "Oppressor Mk II"),  # |/l/I
+    ("Oppressor MkII", "Oppressor Mk II"),   # boşluk yok sayılır
+    ("5ultan", "Sultan"),                    # 5/S
+])
+def test_confused_characters_fold_to_exact_name(text, expected):
+    index = VehicleNameIndex(FOLD_KEYS)
+    assert index.lookup_exact(text) == expected
+    assert index.match(text) == (expected, VehicleNameIndex.EXACT_SCORE)
+
+
+def test_ambiguous_folded_key_falls_through_to_fuzzy_scoring():
+    # "Sultan RS" ve "Sultan R5" aynı anahtara katlanır: hızlı yol hiçbirini seçmemeli
+    index = VehicleNameIndex(FOLD_KEYS)
+    assert index.lookup_exact("Sultan RS") is None
+    assert index.lookup_exact("Sultan R5") is None
+    resolver = VehicleResolver({key: {} for key in FOLD_KEYS})
+    assert resolver.match("Sultan R5") == ("Sultan R5", 100)
+    assert resolver.match("Sultan RS") == ("Sultan RS", 100)
+    assert resolver.match("Zentorn0") == ("Zentorno", 100)
+    assert (resolver.exact_hits, resolver.fuzzy_matches) == (1, 2)
+
+
+# Garaj öncelikli eşleştirme
+GARAGE_DB = {
+    "Sultan": {"Vehicle Name": "Karin Sultan"},
+    "Sultan RS": {"Vehicle Name": "Karin Sultan RS"},
+    "Zentorno": {"Vehicle Name": "Pegassi Zentorno"},
+}
+
+
+def test_owned_vehicle_resolves_from_garage_index():
+    # Garajsız "Sultan R" tam indekste "Sultan RS"e gider; sahip olunan araç önce denenir
+    assert VehicleResolver(GARAGE_DB).match("Sultan R")[0] == "Sultan RS"
+    resolver = VehicleResolver(GARAGE_DB, garage=["Karin Sultan"])
+    assert resolver.match("Sultan R")[0] == "Sultan"
+    assert (resolver.garage_hits, resolver.full_fallbacks) == (1, 0)
+
+
+def test_vehicle_not_owned_resolves_through_full_index():
+    resolver = VehicleResolver(GARAGE_DB, garage=["Karin Sultan"])
+    assert resolver.match("Zentornoo")[0] == "Zentorno"
+    assert (resolver.garage_hits, resolver.full_fallbacks) == (0, 1)
+    # Katlanmış anahtar garajda olmayan araçları da skorlamasız bulur
+    assert resolver.match("Sultan R5") == ("Sultan RS", 100)
+    assert resolver.stats()["garage_size"] == 1
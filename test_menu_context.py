@@ -0,0 +1,59 @@
+# test_menu_context.py
+"""menu_context: başlık şeridi kırpması ve başlık sınıflandırması."""
+import cv2
+import numpy as np
+
+from menu_context import classify_menu_header, menu_header_binary, menu_header_rect
+
+MENU_LEFT, MENU_WIDTH, MENU_TOP, ROW_HEIGHT = 20, 400, 220, 38
+
+
+def menu_frame(rows, selected, title="Mechanic"):
+    """Başlık bloğu + koyu satırlar; seçili satır açık renkli (sentetik korpus düzeni)."""
+    frame = np.full((900, 600, 4), 70, np.uint8)
+    cv2.rectangle(frame, (MENU_LEFT, MENU_TOP - 60), (MENU_LEFT + MENU_WIDTH, MENU_TOP), (40, 90, 200, 255), -1)
+    cv2.putText(frame, title, (MENU_LEFT + 10, MENU_TOP - 20), cv2.FONT_HERSHEY_SIMPLEX, 0.9,
+                (255, 255, 255, 255), 2)
+    for i, name in enumerate(rows):
+        top = MENU_TOP + i * ROW_HEIGHT
+        selected_row = i == selected
+        background = (240, 240, 240, 255) if selected_row else (15, 15, 15, 255)
+        color = (10, 10, 10, 255) if selected_row else (235, 235, 235, 255)
+        cv2.rectangle(frame, (MENU_LEFT, top), (MENU_LEFT + MENU_WIDTH, top + ROW_HEIGHT - 2), background, -1)
+        cv2.putText(frame, name, (MENU_LEFT + 12, top + 26), cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
+    highlight = (MENU_LEFT, MENU_TOP + selected * ROW_HEIGHT, MENU_WIDTH, ROW_HEIGHT - 2)
+    return frame, highlight
+
+
+def test_header_band_excludes_rows_above_selection():
+    rows = ["SecuroServ CEO", "VIP Work", "Services", "Personal Vehicle", "Adder"]
+    frame, highlight = menu_frame(rows, selected=4)
+    x, y, w, h = menu_header_rect(frame, highlight)
+    assert y + h == MENU_TOP  # Bant satır listesinin üstünde biter
+    assert h == 2 * highlight[3]
+    assert menu_header_binary(frame, highlight).shape == (h, w)
+
+
+def test_header_band_is_the_same_for_every_selection():
+    rows = ["Adder", "T20", "Zentorno", "Entity XF"]
+    rects = {menu_header_rect(*menu_frame(rows, selected)) for selected in range(len(rows))}
+    assert len(rects) == 1
+
+
+def test_header_band_contains_the_title_text():
+    frame, highlight = menu_frame(["Adder", "T20"], selected=1)
+    binary = menu_header_binary(frame, highlight)
+    assert np.count_nonzero(binary) > 0
+
+
+def test_no_room_for_header():
+    frame = np.full((200, 600, 4), 70, np.uint8)
+    assert menu_header_rect(frame, (20, 10, 400, 36)) is None
+    assert menu_header_binary(frame, (20, 10, 400, 36)) is None
+
+
+def test_classify_menu_header():
+    assert classify_menu_header(["PEGASUS LIFESTYLE MANAGEMENT"]) == "pegasus"
+    assert classify_menu_header(["Mechanic"]) == "mechanic"
+    assert classify_menu_header(["Interaction Menu"]) == "interaction"
+    assert classify_menu_header(["Adder"]) is None
@@ -0,0 +1,74 @@
+# test_menu_layout.py
+"""menu_layout: sayfa parmak izi isabeti (seçim kaydı) ve ıskası (liste kayması)."""
+import cv2
+import numpy as np
+
+from menu_layout import MenuLayout, MenuLayoutCache, menu_column_binary, page_fingerprint
+
+NAMES = ["Adder", "Banshee 900R", "Cheetah", "Deveste Eight", "Emerus", "Entity XF",
+         "FMJ", "Furia", "Ignus", "Infernus", "Krieger", "Nero", "Osiris", "Pariah", "Reaper"]
+MENU_TOP, ROW_HEIGHT, VISIBLE_ROWS = 220, 38, 10
+
+
+def render_page(first, selected):
+    """Sentetik Mechanic listesi: ``first``'ten başlayan satırlar, ``selected`` satırı seçili."""
+    frame = np.full((900, 600, 4), 70, np.uint8)
+    rect = None
+    for i, name in enumerate(NAMES[first:first + VISIBLE_ROWS]):
+        y = MENU_TOP + i * ROW_HEIGHT
+        background, ink = (15, 15, 15, 255), (240, 240, 240, 255)
+        if i == selected:
+            background, ink = ink, (15, 15, 15, 255)
+            rect = (20, y, 400, ROW_HEIGHT - 2)
+        cv2.rectangle(frame, (20, y), (420, y + ROW_HEIGHT - 2), background, -1)
+        cv2.putText(frame, name, (32, y + 26), cv2.FONT_HERSHEY_SIMPLEX, 0.7, ink, 2)
+    return frame, rect
+
+
+def page_of(first, selected):
+    frame, rect = render_page(first, selected)
+    return page_fingerprint(menu_column_binary(frame, rect), rect), rect
+
+
+def layout_of(first, selected):
+    fingerprint, _ = page_of(first, selected)
+    rows = [(MENU_TOP + i * ROW_HEIGHT + ROW_HEIGHT / 2, name)
+            for i, name in enumerate(NAMES[first:first + VISIBLE_ROWS])]
+    return MenuLayout(fingerprint, rows)
+
+
+def test_same_page_hits_and_reuses_layout():
+    cache = MenuLayoutCache()
+    cache.store(layout_of(0, 3))
+    # Seçim aynı sayfada iki satır aşağı indi: OCR'sız konumdan çözülür
+    fingerprint, rect = page_of(0, 5)
+    assert cache.lookup(fingerprint, rect) == (True, NAMES[5])
+    fingerprint, rect = page_of(0, 3)
+    assert cache.lookup(fingerprint, rect) == (True, NAMES[3])
+    assert (cache.pages, cache.hits) == (1, 2)
+
+
+def test_scrolled_page_misses():
+    cache = MenuLayoutCache()
+    cache.store(layout_of(0, 9))
+    # Liste bir satır kaydı: seçili şerit aynı yerde ama altındaki isim değişti
+    fingerprint, rect = page_of(1, 9)
+    assert cache.lookup(fingerprint, rect) == (False, None)
+    assert cache.hits == 0
+
+
+def test_row_outside_layout_is_valid_but_unresolved():
+    cache = MenuLayoutCache()
+    layout = layout_of(0, 3)
+    layout.rows = [row for row in layout.rows if row[1] != NAMES[5]]  # Bu satır okunamamıştı
+    cache.store(layout)
+    fingerprint, rect = page_of(0, 5)
+    assert cache.lookup(fingerprint, rect) == (True, None)
+
+
+def test_clear_drops_layout():
+    cache = MenuLayoutCache()
+    cache.store(layout_of(0, 3))
+    cache.clear()
+    fingerprint, rect = page_of(0, 3)
+    assert cache.lookup(fingerprint, rect) == (False, None)
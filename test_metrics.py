@@ -0,0 +1,43 @@
+# test_metrics.py
+"""metrics: halka tamponlu aşama süreleri ve etkin FPS."""
+import pytest
+
+from metrics import StageMetrics, format_summary
+
+
+def test_ring_buffer_keeps_last_samples():
+    metrics = StageMetrics(("ocr",), capacity=3)
+    for seconds in (0.001, 0.002, 0.003, 0.004):
+        metrics.record("ocr", seconds)
+    assert sorted(metrics.samples_ms("ocr")) == pytest.approx([2.0, 3.0, 4.0])
+    # Toplam, halkadan düşen ölçümleri de içerir
+    assert metrics.total(("ocr",)) == pytest.approx(0.010)
+
+
+def test_unknown_stage_raises():
+    metrics = StageMetrics(("ocr",))
+    with pytest.raises(KeyError):
+        metrics.record("capture", 0.1)
+
+
+def test_fps_from_frame_times():
+    metrics = StageMetrics(capacity=8)
+    assert metrics.fps() == 0.0
+    for i in range(5):
+        metrics.frame_done(now=10.0 + i * 0.25)
+    assert metrics.fps() == pytest.approx(4.0)
+
+
+def test_snapshot_and_summary():
+    metrics = StageMetrics(("capture", "ocr"))
+    metrics.record("ocr", 0.010)
+    metrics.record("ocr", 0.030)
+    metrics.frame_done(now=1.0)
+    snapshot = metrics.snapshot()
+    assert snapshot["stages"]["capture"] == {"count": 0}
+    assert snapshot["stages"]["ocr"]["count"] == 2
+    assert snapshot["stages"]["ocr"]["max"] == pytest.approx(30.0)
+    assert snapshot["frames"] == 1
+    summary = format_summary(snapshot)
+    assert "ocr=20.0/" in summary
+    assert "capture" not in summary
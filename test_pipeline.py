@@ -0,0 +1,179 @@
+# test_pipeline.py
+"""pipeline: en yeni kazanır kuyruğu ve aşamalar arası _pending temizliği."""
+import cv2
+import numpy as np
+
+from matcher import MatchDebouncer
+from pipeline import HighlightPipeline, LatestQueue
+
+EMPTY_FRAME = np.full((600, 600, 4), 30, np.uint8)
+
+
+def menu_frame(name: str) -> np.ndarray:
+    """Tek seçili satırlı (açık renkli şerit) sentetik menü karesi."""
+    frame = EMPTY_FRAME.copy()
+    cv2.rectangle(frame, (20, 220), (420, 256), (240, 240, 240, 255), -1)
+    cv2.putText(frame, name, (32, 246), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (10, 10, 10, 255), 2)
+    return frame
+
+
+class FakeOcr:
+    """Her çağrıda sabit metni okuyan OCR; çağrı sayısını tutar."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.calls = 0
+
+    def __call__(self, image):
+        self.calls += 1
+        return [self.text]
+
+
+def make_pipeline(ocr, results, **kwargs):
+    return HighlightPipeline(recognize=ocr, resolve=lambda text: (text, 100, text),
+                             on_result=results.append, **kwargs)
+
+
+def test_latest_queue_keeps_newest():
+    queue = LatestQueue()
+    queue.put(1)
+    queue.put(2)
+    assert queue.get(0) == 2
+    assert queue.dropped == 1
+    assert queue.get(0) is None
+
+
+def test_kept_item_survives_plain_puts():
+    queue = LatestQueue()
+    assert queue.put("ocr", keep=True)
+    assert not queue.put("empty")
+    assert queue.get(0) == "ocr"
+    # Tüketildikten sonra sıradan elemanlar yine yazılabilir
+    assert queue.put("empty")
+    assert queue.get(0) == "empty"
+
+
+def test_kept_item_replaced_by_newer_kept_item():
+    queue = LatestQueue()
+    queue.put("old", keep=True)
+    queue.put("new", keep=True)
+    assert queue.get(0) == "new"
+
+
+def test_closed_queue_returns_none():
+    queue = LatestQueue()
+    queue.close()
+    assert queue.get(1.0) is None
+
+
+def test_ocr_result_survives_interleaved_empty_frame():
+    ocr, results = FakeOcr("Adder"), []
+    pipeline = make_pipeline(ocr, results)
+    frame = menu_frame("Adder")
+
+    pipeline._detect_stage((frame, None))
+    assert pipeline._pending is not None
+    pipeline._ocr_stage(pipeline._rois.get(0))
+    # OCR sonucu eşleştirmeye ulaşmadan şeritsiz bir kare gelir
+    pipeline._detect_stage((EMPTY_FRAME, None))
+    pipeline._match_stage(pipeline._results.get(0))
+
+    assert results == [[("Adder", 100, "Adder")]]
+    assert pipeline._pending is None
+
+    # Aynı satır artık önbellekten gelir, OCR tekrar çağrılmaz
+    pipeline._detect_stage((frame, None))
+    pipeline._match_stage(pipeline._results.get(0))
+    assert results[-1] == [("Adder", 100, "Adder")]
+    assert ocr.calls == 1
+
+
+def test_pending_row_is_not_resubmitted():
+    ocr, results = FakeOcr("Adder"), []
+    pipeline = make_pipeline(ocr, results)
+    frame = menu_frame("Adder")
+
+    pipeline._detect_stage((frame, None))
+    first = pipeline._rois.get(0)
+    pipeline._detect_stage((frame, None))
+    assert pipeline._rois.get(0) is None  # OCR'da bekleyen şerit tekrar gönderilmez
+
+    pipeline._ocr_stage(first)
+    pipeline._match_stage(pipeline._results.get(0))
+    assert pipeline._pending is None
+
+
+def test_ocr_error_clears_pending():
+    results = []
+
+    def failing_ocr(image):
+        raise RuntimeError("OCR yok")
+
+    pipeline = make_pipeline(failing_ocr, results)
+    pipeline._detect_stage((menu_frame("Adder"), None))
+    item = pipeline._rois.get(0)
+    try:
+        pipeline._ocr_stage(item)
+    except RuntimeError:
+        pass
+    assert pipeline._pending is None
+
+
+def test_process_matches_staged_result():
+    ocr, results = FakeOcr("Adder"), []
+    pipeline = make_pipeline(ocr, results)
+    assert pipeline.process(menu_frame("Adder")) == [("Adder", 100, "Adder")]
+    assert pipeline.process(EMPTY_FRAME) == []
+    assert pipeline.process(menu_frame("Adder")) == [("Adder", 100, "Adder")]
+    assert ocr.calls == 1
+
+
+class SequenceOcr(FakeOcr):
+    """Sırayla verilen metinleri okuyan OCR (son metin tekrarlanır)."""
+
+    def __init__(self, *texts: str):
+        super().__init__(texts[-1])
+        self.texts = list(texts)
+
+    def __call__(self, image):
+        self.calls += 1
+        return [self.texts.pop(0) if len(self.texts) > 1 else self.texts[0]]
+
+
+def test_unconfirmed_read_is_not_cached():
+    ocr = SequenceOcr("T20", "Adder")
+    debouncer = MatchDebouncer(window=4, required=2, fast_score=101)
+
+    def vote(candidates):
+        debouncer.push(candidates[0][0] if candidates else None, 100)
+
+    pipeline = HighlightPipeline(recognize=ocr, resolve=lambda text: (text, 100, text), on_result=vote,
+                                 confirm=lambda c: not c or debouncer.confirmed(c[0][0]))
+    frame = menu_frame("Adder")
+
+    # Yanlış okuma oylamayı geçmez, önbelleğe yazılmaz; satır yeniden OCR'lanır
+    assert pipeline.process(frame)[0][0] == "T20"
+    assert pipeline.roi_cache.stats()["size"] == 0
+    assert pipeline.process(frame)[0][0] == "Adder"
+    assert pipeline.process(frame)[0][0] == "Adder"
+    assert debouncer.current == "Adder"
+    assert ocr.calls == 3
+    # Onaylanan okuma önbellekten gelir
+    assert pipeline.process(frame)[0][0] == "Adder"
+    assert ocr.calls == 3
+
+
+def test_confirm_runs_after_on_result_in_match_stage():
+    ocr, results = FakeOcr("Adder"), []
+    seen = []
+    pipeline = make_pipeline(ocr, results, confirm=lambda c: seen.append(len(results)) or False)
+    frame = menu_frame("Adder")
+
+    pipeline._detect_stage((frame, None))
+    pipeline._ocr_stage(pipeline._rois.get(0))
+    pipeline._match_stage(pipeline._results.get(0))
+    assert seen == [1]
+    assert pipeline._pending is None
+    # Onaylanmadığı için sonraki kare yine OCR'a gider
+    pipeline._detect_stage((frame, None))
+    assert pipeline._rois.get(0) is not None
@@ -0,0 +1,62 @@
+# test_scheduler.py
+"""scheduler: etkin/boşta aralıkları ve hat aşamalarını da kapsayan CPU bütçesi."""
+import pytest
+
+import scheduler as scheduler_module
+from metrics import StageMetrics
+from scheduler import FrameScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(scheduler_module.time, "monotonic", fake)
+    return fake
+
+
+def test_idle_and_active_intervals(clock):
+    sched = FrameScheduler(active_fps=10, idle_fps=2, idle_after=3)
+    sched.begin_frame()
+    assert sched.next_delay() == pytest.approx(0.5)
+    sched.mark_highlight()
+    assert sched.next_delay() == pytest.approx(0.1)
+    clock.now += 3.5
+    sched.begin_frame()
+    assert not sched.is_active
+
+
+def test_own_work_budget(clock):
+    sched = FrameScheduler(active_fps=10, idle_fps=10, cpu_budget=0.5)
+    sched.begin_frame()
+    clock.now += 0.3
+    # work / (work + delay) <= 0.5 -> delay >= 0.3
+    assert sched.next_delay() == pytest.approx(0.3)
+
+
+def test_offloaded_pipeline_work_throttles(clock):
+    sched = FrameScheduler(active_fps=10, idle_fps=10, cpu_budget=0.5)
+    sched.begin_frame()
+    clock.now += 0.01  # Yakalama + submit hızlı
+    assert sched.next_delay() == pytest.approx(0.09)
+    sched.add_work(0.2)  # OCR hat thread'inde 200 ms
+    # (0.01 + 0.2) / 0.5 - 0.01
+    assert sched.next_delay() == pytest.approx(0.41)
+    sched.begin_frame()
+    assert sched.next_delay() == pytest.approx(0.1)  # Yeni karede sıfırlanır
+
+
+def test_metrics_total_feeds_scheduler():
+    metrics = StageMetrics()
+    metrics.record("ocr", 0.2)
+    metrics.record("match", 0.05)
+    metrics.record("capture", 1.0)
+    assert metrics.total(("ocr", "match")) == pytest.approx(0.25)
+    assert metrics.total(()) == 0
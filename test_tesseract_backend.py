@@ -0,0 +1,63 @@
+# test_tesseract_backend.py
+"""tesseract_backend: birleştirilmiş sayfadaki satırların kaynak ROI'lere dağıtılması."""
+import numpy as np
+
+from tesseract_backend import STITCH_GAP, TesseractBackend, recognize_stitched, stitch_images
+
+# Her ROI kendi gri tonuyla doldurulur; sahte motor satırı bu tondan tanır
+ROIS = [(10, 30, 180, "Adder"), (20, 52, 240, "Zentorno"), (30, 18, 120, "T20")]
+
+
+class StubBackend(TesseractBackend):
+    """Sayfadaki gri tonlu blokları bilinen satır kutuları olarak döndürür (Tesseract'sız)."""
+
+    def __init__(self, extra_lines=()):
+        self.extra_lines = list(extra_lines)
+        self.pages = []
+        self.single = []
+
+    def recognize(self, images):
+        self.single.append(len(images))
+        return [f"single-{int(image[0, 0])}" for image in images]
+
+    def recognize_lines(self, page):
+        self.pages.append(page.shape)
+        lines = list(self.extra_lines)
+        for value, _, _, text in ROIS:
+            rows = np.flatnonzero((page == value).any(axis=1))
+            if rows.size:
+                lines.append((text, int(rows[0]), int(rows[-1]) + 1))
+        return sorted(lines, key=lambda line: line[1])  # Tesseract satırları yukarıdan aşağı verir
+
+
+def roi_images():
+    return [np.full((h, w), value, np.uint8) for value, h, w, _ in ROIS]
+
+
+def test_stitched_lines_map_back_to_their_rois():
+    backend = StubBackend()
+    assert recognize_stitched(backend, roi_images()) == ["Adder", "Zentorno", "T20"]
+    assert len(backend.pages) == 1 and backend.single == []
+
+
+def test_stitched_order_follows_input_not_page_lines():
+    backend = StubBackend()
+    images = roi_images()[::-1]
+    assert recognize_stitched(backend, images) == ["T20", "Zentorno", "Adder"]
+
+
+def test_lines_in_gaps_are_dropped_and_split_lines_are_joined():
+    _, tops = stitch_images(roi_images())
+    second_top = tops[1]
+    extra = [
+        ("|", 2, STITCH_GAP - 4),  # İlk ROI'nin üstündeki boşlukta kenarlık gürültüsü
+        ("(Arena)", second_top + 40, second_top + 50),  # İkinci ROI'nin alt satırı
+    ]
+    texts = recognize_stitched(StubBackend(extra), roi_images())
+    assert texts == ["Adder", "Zentorno (Arena)", "T20"]
+
+
+def test_single_roi_skips_stitching():
+    backend = StubBackend()
+    assert recognize_stitched(backend, roi_images()[:1]) == ["single-10"]
+    assert backend.pages == [] and backend.single == [1]
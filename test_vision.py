@@ -0,0 +1,137 @@
+# test_vision.py
+"""vision: ROI parmak izi önbelleği (tam eşleşme vs yakın eşleşme) ve şerit tespiti."""
+import cv2
+import numpy as np
+import pytest
+
+from vision import (FusedHighlightMask, HighlightTracker, RoiFingerprintCache, extract_highlight_roi, find_highlight_rect,
+                    find_highlight_rect_projection, fingerprint_distance, roi_fingerprint)
+
+ROW_RECT = (20, 20, 400, 36)  # Etkileşim menüsündeki sabit "< isim >" satırı
+
+# Aynı geometride birkaç bit farkla çizilen veritabanı isimleri
+LOOKALIKE_NAMES = [
+    ("Itali GTO", "Itali GTB"),
+    ("Dominator GTX", "Dominator GTT"),
+    ("Chimera", "Glendale"),
+]
+
+
+def render_row(name: str) -> np.ndarray:
+    """Seçili (açık renkli) satıra koyu metinle ismi çizer, ikili ROI'yi döndürür."""
+    frame = np.full((80, 600, 4), 30, np.uint8)
+    x, y, w, h = ROW_RECT
+    cv2.rectangle(frame, (x, y), (x + w, y + h), (240, 240, 240, 255), -1)
+    cv2.putText(frame, name, (x + 12, y + 26), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (10, 10, 10, 255), 2)
+    return extract_highlight_roi(frame, ROW_RECT)
+
+
+def fingerprint_of(name: str):
+    return roi_fingerprint(render_row(name), ROW_RECT)
+
+
+def test_same_row_hits_cache():
+    cache = RoiFingerprintCache()
+    cache.store(fingerprint_of("Itali GTO"), ("Itali GTO",))
+    assert cache.lookup(fingerprint_of("Itali GTO")) == ("Itali GTO",)
+    assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.parametrize("stored, shown", LOOKALIKE_NAMES)
+def test_lookalike_names_never_collide(stored, shown):
+    cache = RoiFingerprintCache()
+    cache.store(fingerprint_of(stored), (stored,))
+    assert cache.lookup(fingerprint_of(shown)) is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_near_match_tolerance_would_collide():
+    # Eski 8 bitlik tolerans bu çiftleri aynı satır sayıyordu
+    distance = fingerprint_distance(fingerprint_of("Itali GTO"), fingerprint_of("Itali GTB"))
+    assert 0 < distance <= 8
+    cache = RoiFingerprintCache(max_distance=8)
+    cache.store(fingerprint_of("Itali GTO"), ("Itali GTO",))
+    assert cache.lookup(fingerprint_of("Itali GTB")) == ("Itali GTO",)
+
+
+def test_different_geometry_is_a_miss():
+    cache = RoiFingerprintCache(max_distance=8)
+    geometry, bits = fingerprint_of("Itali GTO")
+    cache.store((geometry, bits), ("Itali GTO",))
+    moved = (tuple(v + 5 for v in geometry), bits)
+    assert cache.lookup(moved) is None
+
+
+def test_lru_eviction():
+    cache = RoiFingerprintCache(max_size=2)
+    names = ["Adder", "Zentorno", "T20"]
+    for name in names:
+        cache.store(fingerprint_of(name), (name,))
+    assert cache.lookup(fingerprint_of("Adder")) is None
+    assert cache.lookup(fingerprint_of("T20")) == ("T20",)
+
+
+def render_menu(selected, rows=12, top=120, row_height=38):
+    """Koyu zeminde açık renkli isimler; ``selected`` satırı açık şerit (None: şerit yok)."""
+    frame = np.full((900, 600, 4), 30, np.uint8)
+    for i in range(rows):
+        y = top + i * row_height
+        if i == selected:
+            cv2.rectangle(frame, (20, y), (420, y + 36), (240, 240, 240, 255), -1)
+            cv2.putText(frame, "Zentorno", (32, y + 26), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (10, 10, 10, 255), 2)
+        else:
+            cv2.putText(frame, "Adder", (32, y + 26), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (240, 240, 240, 255), 2)
+    return frame
+
+
+@pytest.mark.parametrize("selected", [0, 3, 11])
+def test_projection_detector_matches_contour_detector(selected):
+    mask = FusedHighlightMask()(render_menu(selected))
+    rect = find_highlight_rect(mask)
+    assert rect is not None and rect[1] == 120 + selected * 38
+    assert find_highlight_rect_projection(mask) == rect
+
+
+def test_projection_detector_without_highlight():
+    mask = FusedHighlightMask()(render_menu(None))
+    assert find_highlight_rect(mask) is None
+    assert find_highlight_rect_projection(mask) is None
+
+
+def tracked_detect(tracker, frame):
+    """Yakalama + tespit thread'lerinin yaptığı gibi: bant varsa yalnızca onu tarar."""
+    band = tracker.band()
+    view = frame if band is None else frame[band[0]:band[0] + band[1]]
+    rect = find_highlight_rect(FusedHighlightMask()(view))
+    if rect is not None and band is not None:
+        rect = (rect[0], rect[1] + band[0], rect[2], rect[3])
+    tracker.observe(rect, band, frame.shape[0])
+    return rect, band
+
+
+def test_tracker_refinds_moved_highlight_inside_band():
+    tracker = HighlightTracker(margin_rows=3)
+    rect, band = tracked_detect(tracker, render_menu(4))
+    assert band is None and rect[1] == 120 + 4 * 38
+    for selected in (5, 6, 5):  # Ok tuşlarıyla birer satır kayma
+        rect, band = tracked_detect(tracker, render_menu(selected))
+        assert band is not None and band[1] < 900
+        assert rect == find_highlight_rect(FusedHighlightMask()(render_menu(selected)))
+    assert tracker.stats() == {"full_scans": 1, "band_scans": 3}
+
+
+def test_tracker_falls_back_to_full_scan_when_highlight_is_lost():
+    tracker = HighlightTracker(margin_rows=1)
+    tracked_detect(tracker, render_menu(0))
+    # Şerit bandın dışına sıçradı: bant taraması ıskalar, sonraki kare tam taranır
+    rect, band = tracked_detect(tracker, render_menu(10))
+    assert band is not None and rect is None
+    rect, band = tracked_detect(tracker, render_menu(10))
+    assert band is None and rect[1] == 120 + 10 * 38
+    assert tracker.stats() == {"full_scans": 2, "band_scans": 1}
+
+
+def test_tracker_rescans_full_frame_periodically():
+    tracker = HighlightTracker(full_scan_every=2)
+    bands = [tracked_detect(tracker, render_menu(3))[1] for _ in range(4)]
+    assert [band is None for band in bands] == [True, False, False, True]
@@ -20,7 +20,7 @@ from PyQt5.QtGui import (
 
 # Proje Modülleri
 from config import load_config, save_config
-from database import get_smart_badges, get_vehicle_advice, parse_number, load_garage, get_garage_stats, toggle_vehicle_ownership
+from database import get_smart_badges, get_vehicle_advice, garage_store, get_garage_stats, toggle_vehicle_ownership, vehicle_record, vehicle_table
 from workers import ImageLoaderThread, get_ocr_engine
 import logging
 import ctypes
@@ -332,8 +332,7 @@ class VehicleCard(QFrame):
         """)
         
         name = self.vehicle_data.get("Vehicle Name", "")
-        garage = load_garage()
-        is_owned = name in garage
+        is_owned = name in garage_store
         
         # Garaj aksiyonu
         action_garage = QAction(i18n.t("card.remove_garage") if is_owned else i18n.t("card.add_garage"), self)
@@ -398,9 +397,10 @@ class GalleryWindow(QWidget):
 
         
 
-        self.all_classes = sorted(list(set(c.get("Vehicle Class", "") for c in db_data if c.get("Vehicle Class", ""))))
-        self.all_manufacturers = sorted(list(set(c.get("Manufacturer", "") for c in db_data if c.get("Manufacturer", ""))))
-        self.all_vendors = sorted(list(set(c.get("Acquisition", "") for c in db_data if c.get("Acquisition", ""))))
+        table = vehicle_table(db_data)
+        self.all_classes = [label for label in table.class_labels if label]
+        self.all_manufacturers = [label for label in table.manufacturer_labels if label]
+        self.all_vendors = [label for label in table.vendor_labels if label]
 
         # YENİ: Modifikasyon atölyelerini çıkar
         mod_set = set()
@@ -718,6 +718,11 @@ class GalleryWindow(QWidget):
         if mode in ("STORE", "GARAGE"):
             self.apply_filters()
 
+    def on_garage_changed(self, version):
+        """GarageStore değişince garaja bağlı sekmeyi (liste, özet, analiz) yeniler."""
+        if self.current_tab in ("GARAGE", "ANALYTICS"):
+            self.switch_tab(self.current_tab)
+
 
 
     # YENİ: Buton Renklerini Güncelleme
@@ -1104,13 +1109,14 @@ class GalleryWindow(QWidget):
 
         # YENİ: Garaj listesini çek
 
-        owned_list = load_garage()
+        owned_list = garage_store.owned()
 
         
 
         self.filtered_data = []
+        filtered_rows = []
 
-        for car in self.db_data:
+        for row, car in enumerate(self.db_data):
 
             # YENİ: Garaj modundaysa sadece sahip olunanları göster
 
@@ -1143,23 +1149,27 @@ class GalleryWindow(QWidget):
             match_vendor = (vendor == i18n.t("gallery.filter_all_vendors")) or (vendor == car.get("Acquisition", ""))
             match_mod = (mod_type == i18n.t("gallery.filter_all_mods")) or (mod_type in str(car.get("Modifications", "")))
             match_armor = True
-            if req_armor: match_armor = "Yes" in str(car.get("Bulletproof", ""))
+            if req_armor: match_armor = vehicle_record(car).bulletproof
             match_weapon = True
-            if req_weapon: match_weapon = "Weaponized" in str(car.get("Vehicle Features", ""))
+            if req_weapon: match_weapon = vehicle_record(car).weaponized
             
             if match_query and match_class and match_brand and match_vendor and match_mod and match_armor and match_weapon:
 
                 self.filtered_data.append(car)
+                filtered_rows.append(row)
 
         
-        if sort_mode == i18n.t("gallery.sort_price_desc"):
-            self.filtered_data.sort(key=lambda x: parse_number(x.get("GTA Online Price", "0")), reverse=True)
-        elif sort_mode == i18n.t("gallery.sort_price_asc"):
-            self.filtered_data.sort(key=lambda x: parse_number(x.get("GTA Online Price", "0")))
-        elif sort_mode == i18n.t("gallery.sort_speed_desc"):
-            self.filtered_data.sort(key=lambda x: parse_number(x.get("Top Speed (Broughy)", "0")), reverse=True)
-        elif sort_mode == i18n.t("gallery.sort_accel_desc"):
-            self.filtered_data.sort(key=lambda x: parse_number(x.get("Stat - Acceleration", "0")), reverse=True)
+        # Sıralama sütunlu tablo üzerinde (kararlı; eşit değerlerde veritabanı sırası korunur)
+        sort_columns = {
+            i18n.t("gallery.sort_price_desc"): ("price", True),
+            i18n.t("gallery.sort_price_asc"): ("price", False),
+            i18n.t("gallery.sort_speed_desc"): ("top_speed", True),
+            i18n.t("gallery.sort_accel_desc"): ("acceleration", True),
+        }
+        if sort_mode in sort_columns:
+            column, descending = sort_columns[sort_mode]
+            ordered = vehicle_table(self.db_data).sort_rows(filtered_rows, column, descending)
+            self.filtered_data = [self.db_data[row] for row in ordered]
 
         
         self.current_page = 0
@@ -1401,9 +1411,10 @@ class GalleryWindow(QWidget):
             w = self.analytics_layout.itemAt(i).widget()
             if w: w.deleteLater()
 
-        garage = load_garage()
-        garage_vehicles = [v for v in self.db_data if v.get("Vehicle Name", "") in garage]
-        total_value = sum(parse_number(v.get("GTA Online Price", "0")) for v in garage_vehicles)
+        garage = garage_store.names()
+        table = vehicle_table(self.db_data)
+        owned_rows = table.owned_rows(garage)
+        total_value = table.total(owned_rows, "price")
 
         # === Özet Kutusu ===
         summary_frame = QFrame()
@@ -1415,11 +1426,11 @@ class GalleryWindow(QWidget):
             (i18n.t("analytics.total_value"), f"${total_value:,.0f}", "#fdcb6e"),
         ]
 
-        if garage_vehicles:
-            most_expensive = max(garage_vehicles, key=lambda v: parse_number(v.get("GTA Online Price", "0")))
-            fastest = max(garage_vehicles, key=lambda v: parse_number(v.get("Top Speed (Broughy)", "0")))
-            stats.append((i18n.t("analytics.most_expensive"), most_expensive.get("Vehicle Name", ""), "#e17055"))
-            stats.append((i18n.t("analytics.fastest"), fastest.get("Vehicle Name", ""), "#74b9ff"))
+        if len(owned_rows):
+            most_expensive = table.names[table.top_row(owned_rows, "price")]
+            fastest = table.names[table.top_row(owned_rows, "top_speed")]
+            stats.append((i18n.t("analytics.most_expensive"), most_expensive, "#e17055"))
+            stats.append((i18n.t("analytics.fastest"), fastest, "#74b9ff"))
 
         for i, (label_text, value_text, color) in enumerate(stats):
             lbl = QLabel(f"<span style='color: {Theme.TEXT_SECONDARY}; font-size: 10pt;'>{label_text}</span><br>"
@@ -1439,14 +1450,9 @@ class GalleryWindow(QWidget):
         class_title.setStyleSheet("color: #00FF96; margin-bottom: 10px;")
         class_layout.addWidget(class_title)
 
-        # Sınıf sayılarını hesapla
-        class_counts = {}
-        for v in garage_vehicles:
-            vc = v.get("Vehicle Class", i18n.t("analytics.unknown_class"))
-            class_counts[vc] = class_counts.get(vc, 0) + 1
-
-        # En çoktan aza sırala
-        sorted_classes = sorted(class_counts.items(), key=lambda x: x[1], reverse=True)
+        # Sınıf sayıları, en çoktan aza sıralı
+        sorted_classes = [(cls_name or i18n.t("analytics.unknown_class"), count)
+                          for cls_name, count in table.class_counts(owned_rows)]
         max_count = sorted_classes[0][1] if sorted_classes else 1
 
         for cls_name, count in sorted_classes:
@@ -1473,8 +1479,8 @@ class GalleryWindow(QWidget):
         self.analytics_layout.addWidget(class_frame)
 
         # === Eksik Sınıflar ===
-        all_classes = set(v.get("Vehicle Class", "") for v in self.db_data if v.get("Vehicle Class", ""))
-        owned_classes = set(class_counts.keys())
+        all_classes = set(label for label in table.class_labels if label)
+        owned_classes = set(cls_name for cls_name, _ in sorted_classes)
         missing = all_classes - owned_classes
 
         if missing:
@@ -1750,6 +1756,11 @@ class StatusHUD(QWidget):
         self.lbl_hint = QLabel("[F10]")
         self.lbl_hint.setStyleSheet("color: #777; font-size: 8pt; font-family: 'Consolas'; margin-left: 5px;")
         self.inner_layout.addWidget(self.lbl_hint)
+
+        # Performans satırı (FPS / OCR gecikmesi) - config'den açılır
+        self.lbl_perf = QLabel("")
+        self.lbl_perf.setStyleSheet("color: #777; font-size: 8pt; font-family: 'Consolas';")
+        self.inner_layout.addWidget(self.lbl_perf)
         
         self.inner_layout.addStretch()
         
@@ -1762,9 +1773,26 @@ class StatusHUD(QWidget):
             cfg = load_config()
             hk = cfg.get("hotkeys", {}).get("toggle_ocr", "F10").upper()
             self.lbl_hint.setText(f"[{hk}]")
+            self.set_perf_visible(cfg.get("ocr", {}).get("show_perf_stats", False))
         except:
             pass
 
+    def set_perf_visible(self, visible: bool):
+        """Performans satırını gösterir/gizler ve HUD genişliğini ayarlar."""
+        self.lbl_perf.setVisible(visible)
+        width = 330 if visible else 220
+        if self.width() != width:
+            screen = QApplication.desktop().screenGeometry()
+            self.setGeometry((screen.width() - width) // 2, 8, width, self.height())
+
+    def update_perf_stats(self, stats: dict):
+        """OcrThread.stats_signal ile gelen etkin FPS ve OCR gecikmesini yazar."""
+        if self.lbl_perf.isHidden():
+            return
+        ocr = stats.get("stages", {}).get("ocr", {})
+        latency = f"{ocr['p50']:.0f}ms" if ocr.get("count") else "-"
+        self.lbl_perf.setText(f"{stats.get('fps', 0):.1f} FPS · OCR {latency}")
+
     def update_status(self, ocr_active: bool):
         self.update_shortcut_text()
         
@@ -1861,11 +1889,17 @@ class OverlayHUD(QWidget):
         
         super().resizeEvent(event)
 
+    def apply_config(self):
+        """Config değişince HUD bölgesini yeniden okur; görünürse hemen yerleştirir."""
+        self.hud_config = load_config().get("hud_region", {"top": 40, "left": -1, "width": 300, "height": 600})
+        if self.isVisible():
+            self.resizeEvent(None)
+
     def update_ui(self, vehicle_data):
         try:
             if not self.isVisible():
                 self.show()
-                # Geometry'i zorla güncelle (Config değişmiş olabilir)
+                # Geometry'i zorla güncelle (Config değişmiş olabilir; önbellekten okunur)
                 self.hud_config = load_config().get("hud_region", {"top": 40, "left": -1, "width": 300, "height": 600})
                 self.resizeEvent(None)
 
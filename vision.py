@@ -0,0 +1,400 @@
+# vision.py
+"""Görüntü işleme yardımcıları: highlight şeridi tespiti, parmak izi ve ROI önbelleği."""
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import cv2
+
+# Parmak izi ızgarası (genişlik x yükseklik). 128x16 = 2048 bit;
+# 400px'lik bir şeritte hücre ~3px olur, benzer uzunluktaki isimler de ayrışır
+# (64x16'da "Chimera" ile "Glendale" 8 bit farkla aynı kayda düşüyordu).
+FINGERPRINT_SIZE = (128, 16)
+
+Fingerprint = Tuple[Tuple[int, int, int, int], bytes]
+Rect = Tuple[int, int, int, int]
+
+# GTA V menüsündeki seçili satır çok açık gri/beyazdır.
+# HSV değerleri: Hue(0-180), Saturation(0-255), Value(0-255)
+# Düşük doygunluk (Saturation < 40) ve yüksek parlaklık (Value > 200) olan pikselleri arıyoruz.
+HIGHLIGHT_HSV_LOWER = np.array([0, 0, 200])
+HIGHLIGHT_HSV_UPPER = np.array([180, 40, 255])
+# Küçük gürültüleri gidermek için yatay açma çekirdeği
+HIGHLIGHT_KERNEL = np.ones((1, 5), np.uint8)
+# Seçili şeritte arka plan BEYAZ, metin SİYAH; bu eşikle ters çevrilir
+HIGHLIGHT_TEXT_THRESHOLD = 180
+# Menü şeridi yatayda uzun (örn 200-400px), dikeyde incedir.
+# Garaj ve liste elemanlarında çift satırlı isimler olabildiği için yüksekliği 120'ye kadar esnetiyoruz.
+# Ayrıca sol kenara yakın olmalıdır (x çok büyük olamaz)
+HIGHLIGHT_WIDTH = (150, 440)   # 150 < w < 440
+HIGHLIGHT_HEIGHT = (20, 120)   # 20 < h < 120
+HIGHLIGHT_MAX_X = 50           # x < 50
+
+
+def frame_to_hsv(frame_bgra: np.ndarray) -> np.ndarray:
+    """BGRA kareyi HSV'ye çevirir (Renk maskelemesi HSV'de çok daha stabildir)."""
+    hsv = cv2.cvtColor(frame_bgra, cv2.COLOR_BGRA2BGR)
+    return cv2.cvtColor(hsv, cv2.COLOR_BGR2HSV)
+
+
+def highlight_mask_hsv(hsv: np.ndarray) -> np.ndarray:
+    """HSV görüntüde "parlak ve doygunluğu düşük" pikselleri maskeler."""
+    return cv2.inRange(hsv, HIGHLIGHT_HSV_LOWER, HIGHLIGHT_HSV_UPPER)
+
+
+def highlight_mask(frame_bgra: np.ndarray) -> np.ndarray:
+    """Ekran görüntüsünde "parlak ve doygunluğu düşük" pikselleri maskeler.
+
+    HSV tabanlı referans yol; canlı hat aynı sonucu ``FusedHighlightMask`` ile üretir.
+    """
+    return highlight_mask_hsv(frame_to_hsv(frame_bgra))
+
+
+def _build_saturation_limits() -> np.ndarray:
+    """max(B,G,R) değerine göre izin verilen en büyük (max - min) farkı tablosu.
+
+    OpenCV'nin 8-bit HSV dönüşümünde S = yuvarla(255 * (max - min) / max) ve
+    V = max'tır; Hue maskede kullanılmaz. S, farkla monoton arttığı için her V
+    değerinde ``S <= üst sınır`` koşulu ``fark < tablo[V]`` olarak yazılabilir.
+    Tablo OpenCV'nin kendisiyle üretilir, böylece yuvarlama birebir aynı kalır.
+    """
+    v = np.arange(256, dtype=np.int32)[:, None]
+    diff = np.arange(256, dtype=np.int32)[None, :]
+    lo = np.clip(v - diff, 0, 255)
+    # Her hücre bir piksel: B = max, G = R = max - fark
+    bgr = np.dstack([np.broadcast_to(v, lo.shape), lo, lo]).astype(np.uint8)
+    hsv = cv2.cvtColor(bgr, cv2.COLOR_BGR2HSV)
+    inside = cv2.inRange(hsv, HIGHLIGHT_HSV_LOWER, HIGHLIGHT_HSV_UPPER) > 0
+    inside &= (diff <= v)  # Geçersiz (min < 0) hücreler
+    # inside her satırda 0..k önek şeklindedir; limit = k + 1 (hiç yoksa 0)
+    return inside.sum(axis=1).astype(np.uint8).reshape(256, 1)
+
+
+class FusedHighlightMask:
+    """``highlight_mask`` ile aynı maskeyi HSV görüntüsü oluşturmadan hesaplar.
+
+    Kare ``STRIP_ROWS`` satırlık şeritler halinde işlenir: her şeridin B/G/R
+    düzlemleri önbellekte kalan küçük, önceden ayrılmış tamponlara açılır ve
+    max/min/LUT/karşılaştırma orada yapılır. Ana bellekten yalnızca BGRA kare
+    bir kez okunur ve maske bir kez yazılır; kare başına yeni dizi ayrılmaz.
+
+    Döndürülen maske bir sonraki çağrıda üzerine yazılır — saklanacaksa
+    kopyalanmalıdır. Her tespit thread'i kendi örneğini kullanmalıdır.
+    """
+
+    LIMITS = _build_saturation_limits()
+    STRIP_ROWS = 128  # 128 x 600px şerit tamponları L2 önbelleğine sığar
+
+    def __init__(self):
+        self._shape = None
+        self._planes = []
+        self._vmax = self._diff = self._limit = self._mask = None
+
+    def _allocate(self, shape: Tuple[int, int]) -> None:
+        height, width = shape
+        strip = (min(self.STRIP_ROWS, height), width)
+        self._shape = shape
+        self._planes = [np.empty(strip, np.uint8) for _ in range(3)]
+        self._vmax = np.empty(strip, np.uint8)
+        self._diff = np.empty(strip, np.uint8)
+        self._limit = np.empty(strip, np.uint8)
+        self._mask = np.empty(shape, np.uint8)
+
+    def __call__(self, frame_bgra: np.ndarray) -> np.ndarray:
+        shape = frame_bgra.shape[:2]
+        if shape != self._shape:
+            self._allocate(shape)
+        height = shape[0]
+        for y in range(0, height, self.STRIP_ROWS):
+            rows = min(self.STRIP_ROWS, height - y)
+            b, g, r = planes = [p[:rows] for p in self._planes]
+            vmax, diff, limit = self._vmax[:rows], self._diff[:rows], self._limit[:rows]
+            cv2.mixChannels([frame_bgra[y:y + rows]], planes, [0, 0, 1, 1, 2, 2])
+            cv2.max(b, g, dst=vmax)
+            cv2.max(vmax, r, dst=vmax)      # V = max(B, G, R)
+            cv2.min(b, g, dst=diff)
+            cv2.min(diff, r, dst=diff)
+            cv2.subtract(vmax, diff, dst=diff)  # fark = max - min (doygunluk payı)
+            cv2.LUT(vmax, self.LIMITS, dst=limit)
+            # Parlak ve doygunluğu düşük: fark < limit[V] (V < 200 için limit 0)
+            cv2.compare(diff, limit, cv2.CMP_LT, dst=self._mask[y:y + rows])
+        return self._mask
+
+
+def frame_from_buffer(buffer, width: int, height: int) -> np.ndarray:
+    """Ham BGRA ekran tamponunu (ör. mss ScreenShot.raw) kopyasız dizi olarak sarar."""
+    return np.frombuffer(buffer, dtype=np.uint8).reshape(height, width, 4)
+
+
+def find_highlight_rect(mask: np.ndarray) -> Optional[Rect]:
+    """Maskeden menünün seçili satırına (highlight) en uygun dikdörtgeni bulur."""
+    mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, HIGHLIGHT_KERNEL)
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+    highlight_rect = None
+    max_w = 0
+    for cnt in contours:
+        x, y, w, h = cv2.boundingRect(cnt)
+        if _is_highlight_shape(x, w, h):
+            # En geniş olanı (gerçek şeridi) alıyoruz (Bazen ufak menü parçaları kopuk olabilir)
+            if w > max_w:
+                max_w = w
+                highlight_rect = (x, y, w, h)
+    return highlight_rect
+
+
+def _is_highlight_shape(x: int, w: int, h: int) -> bool:
+    return (HIGHLIGHT_WIDTH[0] < w < HIGHLIGHT_WIDTH[1]
+            and HIGHLIGHT_HEIGHT[0] < h < HIGHLIGHT_HEIGHT[1]
+            and x < HIGHLIGHT_MAX_X)
+
+
+def find_highlight_rect_projection(mask: np.ndarray) -> Optional[Rect]:
+    """``find_highlight_rect`` ile aynı kurala uyan şeridi satır izdüşümüyle bulur.
+
+    Seçili satır sol kenara yakın, geniş ve beyaz yatay bir banttır: önce her
+    satırdaki maske pikseli sayılır, yeterince dolu ardışık satırlar bant
+    olarak gruplanır; her bandın sütun izdüşümünden x ve genişlik okunur.
+    Kontur takibi ve Python'da kontur başına döngü yoktur.
+    """
+    # Kurala uyan bir şerit x < 50 ve w < 440 olduğundan bu sütunları aşamaz
+    region = mask[:, :HIGHLIGHT_MAX_X + HIGHLIGHT_WIDTH[1]]
+    coverage = cv2.reduce(region, 1, cv2.REDUCE_SUM, dtype=cv2.CV_32S).ravel()
+    # Metin satırlarında şeridin bir kısmı siyah olduğundan eşik en küçük genişliğin yarısı
+    filled = (coverage > (HIGHLIGHT_WIDTH[0] // 2) * 255).astype(np.int8)
+    edges = np.diff(filled, prepend=0, append=0)
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+
+    highlight_rect = None
+    max_w = 0
+    for y0, y1 in zip(starts, ends):
+        h = int(y1 - y0)
+        if not HIGHLIGHT_HEIGHT[0] < h < HIGHLIGHT_HEIGHT[1]:
+            continue
+        columns = cv2.reduce(region[y0:y1], 0, cv2.REDUCE_MAX).ravel()
+        on = np.flatnonzero(columns)
+        if on.size == 0:
+            continue
+        x = int(on[0])
+        gaps = np.flatnonzero(columns[x:] == 0)
+        w = int(gaps[0]) if gaps.size else region.shape[1] - x
+        if _is_highlight_shape(x, w, h) and w > max_w:
+            max_w = w
+            highlight_rect = (x, int(y0), w, h)
+    return highlight_rect
+
+
+# config.json "ocr" -> "highlight_detector" değerleri
+HIGHLIGHT_DETECTORS = {
+    "contour": find_highlight_rect,
+    "projection": find_highlight_rect_projection,
+}
+
+
+def extract_highlight_roi(frame_bgra: np.ndarray, highlight_rect: Rect) -> np.ndarray:
+    """Şeridi kırpar ve OCR için ters çevrilmiş ikili görüntü döndürür (beyaz metin)."""
+    x, y, w, h = highlight_rect
+
+    # Güvenlik için şeridi biraz daraltalım/genişletelim ki yazıyı tam alsın
+    y_start = max(0, y - 2)
+    y_end = min(frame_bgra.shape[0], y + h + 2)
+
+    # Etkileşim (Interaction) menüsünde araç isimleri sağa dayalıdır (Örn: < Havok >).
+    # Bu yüzden barın "solundaki" ikonları vs. kırparken sağ tarafını tam uzunlukta bırakmalıyız.
+    x_start = max(0, x + 5)
+    x_end = min(frame_bgra.shape[1], x + w)
+
+    roi_gray = cv2.cvtColor(frame_bgra[y_start:y_end, x_start:x_end], cv2.COLOR_BGRA2GRAY)
+    # OCR daha iyi okusun diye resmi Invert (Ters Çevirme) yapıyoruz: Siyah arkaplan, beyaz metin.
+    _, roi_binary = cv2.threshold(roi_gray, HIGHLIGHT_TEXT_THRESHOLD, 255, cv2.THRESH_BINARY_INV)
+    return roi_binary
+
+
+def roi_fingerprint(roi_binary: np.ndarray, highlight_rect: Rect) -> Fingerprint:
+    """İkili (binarize) ROI'nin küçültülmüş bit imzasını ve şerit geometrisini döndürür.
+
+    Geometri 2px'e yuvarlanır; böylece tek piksellik titreme aynı anahtara düşer.
+    """
+    small = cv2.resize(roi_binary, FINGERPRINT_SIZE, interpolation=cv2.INTER_AREA)
+    bits = np.packbits(small > 127)
+    geometry = tuple(int(v) // 2 for v in highlight_rect)
+    return geometry, bits.tobytes()
+
+
+def fingerprint_distance(a: Fingerprint, b: Fingerprint) -> Optional[int]:
+    """İki parmak izi arasındaki Hamming mesafesi (geometri farklıysa None)."""
+    if a[0] != b[0]:
+        return None
+    xor = np.bitwise_xor(np.frombuffer(a[1], dtype=np.uint8), np.frombuffer(b[1], dtype=np.uint8))
+    return int(np.unpackbits(xor).sum())
+
+
+# =====================================================
+# Tesseract modu: parlak metin konturları (eski yaklaşım)
+# =====================================================
+# Kontur boyutları 1600p referans çözünürlükte; çözünürlüğe göre ölçeklenir
+TEXT_CONTOUR_WIDTH = (200, 650)
+TEXT_CONTOUR_HEIGHT = (35, 85)
+TEXT_CONTOUR_MAX_X = 225   # HEURISTIC: Oyun içi çevre yazıları sol sınırdan uzaktır
+TEXT_MASK_THRESHOLD = 140
+TEXT_BRIGHTNESS_THRESHOLD = 80
+TEXT_BINARY_THRESHOLD = 140
+
+
+def preprocess_text_roi(roi: np.ndarray) -> Optional[np.ndarray]:
+    """ROI'yi OCR için ön işler. Karanlık zemini atlar."""
+    roi_enlarged = cv2.resize(roi, None, fx=2, fy=2, interpolation=cv2.INTER_CUBIC)
+    roi_blurred = cv2.GaussianBlur(roi_enlarged, (3, 3), 0)
+    clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+    roi_contrasted = clahe.apply(roi_blurred)
+
+    if np.mean(roi_contrasted) <= TEXT_BRIGHTNESS_THRESHOLD:
+        return None
+
+    _, roi_final = cv2.threshold(roi_contrasted, TEXT_BINARY_THRESHOLD, 255, cv2.THRESH_BINARY)
+    roi_padded = cv2.copyMakeBorder(roi_final, 10, 10, 10, 10, cv2.BORDER_CONSTANT, value=[255, 255, 255])
+    return roi_padded
+
+
+def find_text_rois(gray: np.ndarray, scale_factor: float = 1.0) -> List[np.ndarray]:
+    """Gri karede menü satırı olabilecek parlak konturları bulur; ön işlenmiş ROI'leri kontur sırasıyla döndürür."""
+    _, mask = cv2.threshold(gray, TEXT_MASK_THRESHOLD, 255, cv2.THRESH_BINARY)
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+    # Ölçekli eşik değerleri
+    min_w, max_w = (v * scale_factor for v in TEXT_CONTOUR_WIDTH)
+    min_h, max_h = (v * scale_factor for v in TEXT_CONTOUR_HEIGHT)
+    max_x_allowed = TEXT_CONTOUR_MAX_X * scale_factor
+
+    rois = []
+    for cnt in contours:
+        x, y, w, h = cv2.boundingRect(cnt)
+        if not (min_w < w < max_w and min_h < h < max_h):
+            continue
+        if x > max_x_allowed:
+            continue
+
+        crop_w = w - 10 if w > 50 else w
+        roi_padded = preprocess_text_roi(gray[y:y+h, x:x+crop_w])
+        if roi_padded is not None:
+            rois.append(roi_padded)
+    return rois
+
+
+Band = Tuple[int, int]  # Tarama şeridi içinde (üst satır, yükseklik)
+
+
+class HighlightTracker:
+    """Seçili şeridi son konumunun etrafındaki bir bantta arar.
+
+    Şerit kare başına en fazla bir iki satır kayar; tam yükseklikte maske ve
+    kontur taraması yerine yalnızca son ``highlight_rect``'in ``margin_rows``
+    satır yüksekliği kadar üstü ve altı yakalanır ve taranır. Şerit bantta
+    bulunamazsa veya ``full_scan_every`` bant taramasından sonra tam tarama
+    yapılır (ör. menü başka bir yere açıldıysa).
+
+    ``band()`` yakalama thread'inden, ``observe()`` tespit thread'inden çağrılır.
+    """
+
+    def __init__(self, margin_rows: int = 3, full_scan_every: int = 15):
+        self.margin_rows = margin_rows
+        self.full_scan_every = full_scan_every
+        self._rect: Optional[Rect] = None       # Tam kare koordinatında son şerit
+        self._full_height: Optional[int] = None
+        self._since_full = 0
+        self.full_scans = 0
+        self.band_scans = 0
+
+    def band(self) -> Optional[Band]:
+        """Sıradaki karede yakalanacak bant; tam tarama gerekiyorsa None."""
+        rect, full_height = self._rect, self._full_height
+        if rect is None or full_height is None or self._since_full >= self.full_scan_every:
+            return None
+        _, y, _, h = rect
+        margin = self.margin_rows * h
+        top = max(0, y - margin)
+        bottom = min(full_height, y + h + margin)
+        return top, bottom - top
+
+    def observe(self, highlight_rect: Optional[Rect], band: Optional[Band], frame_height: int) -> None:
+        """Taranan karenin sonucunu kaydeder (``highlight_rect`` tam kare koordinatında)."""
+        if band is None:
+            self._full_height = frame_height
+            self._since_full = 0
+            self.full_scans += 1
+        else:
+            self._since_full += 1
+            self.band_scans += 1
+        self._rect = highlight_rect  # Iskalama -> bir sonraki kare tam tarama
+
+    def stats(self) -> Dict[str, int]:
+        return {"full_scans": self.full_scans, "band_scans": self.band_scans}
+
+
+class RoiFingerprintCache:
+    """Parmak izi -> OCR sonucu eşlemesini tutan küçük, sınırlı önbellek.
+
+    Aynı menü satırında beklenirken her tikte WinOCR çağırmak yerine önceki
+    sonucu döndürür. Varsayılan olarak yalnızca birebir aynı parmak izi kabul
+    edilir: etkileşim menüsü ``< isim >`` satırını aynı geometride döndürür ve
+    benzer isimler (Itali GTO/GTB: 4 bit, Dominator GTX/GTT: 6-8 bit) küçük
+    bir Hamming toleransına düşüp OCR'sız yanlış araç döndürür.
+    ``max_distance`` > 0 verilirse aynı geometrideki en yakın yeni kayıt da kabul edilir.
+    """
+
+    def __init__(self, max_size: int = 64, max_distance: int = 0):
+        self.max_size = max_size
+        self.max_distance = max_distance
+        self._entries: "OrderedDict[Fingerprint, Any]" = OrderedDict()
+        self._lock = threading.Lock()  # Tespit ve eşleştirme aşamaları farklı thread'lerde
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, fingerprint: Fingerprint) -> Optional[Any]:
+        """Önbellekteki değeri döndürür, yoksa None. Hit/miss sayaçlarını günceller."""
+        with self._lock:
+            key = self._find(fingerprint)
+            if key is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+
+    def store(self, fingerprint: Fingerprint, value: Any) -> None:
+        """Yeni sonucu ekler; limit aşılırsa en eski kaydı siler."""
+        with self._lock:
+            self._entries[fingerprint] = value
+            self._entries.move_to_end(fingerprint)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Kayıtları siler (sayaçlar korunur)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss sayaçlarını ve isabet oranını döndürür."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / total) if total else 0.0,
+            "size": len(self._entries),
+        }
+
+    def _find(self, fingerprint: Fingerprint) -> Optional[Fingerprint]:
+        if fingerprint in self._entries:
+            return fingerprint
+        if self.max_distance <= 0:
+            return None
+
+        # En yeni kayıttan geriye doğru tara (menüde en son bakılan satır en olası)
+        for key in reversed(self._entries):
+            distance = fingerprint_distance(fingerprint, key)
+            if distance is not None and distance <= self.max_distance:
+                return key
+        return None
@@ -1,8 +1,8 @@
 # workers.py
 """Arka plan işçi thread'leri: OCR, kısayol ve resim yükleme."""
 import time
-import re
 import os
+import threading
 import asyncio
 import logging
 from typing import Dict, List, Optional, Tuple
@@ -10,13 +10,22 @@ from typing import Dict, List, Optional, Tuple
 import requests
 import numpy as np
 import cv2
-import mss
 import keyboard
-from thefuzz import process, fuzz
 from PyQt5.QtCore import QThread, pyqtSignal
 from PyQt5.QtGui import QPixmap, QImage
 import i18n
 from config import load_config, _get_default_tesseract_path
+from vision import (FusedHighlightMask, HighlightTracker, RoiFingerprintCache,
+                    find_highlight_rect, find_text_rois)
+from tesseract_backend import TesseractPool, create_tesseract_backend, recognize_stitched
+from matcher import MatchDebouncer, VehicleResolver
+from database import garage_store, get_garage_version
+from scheduler import FrameScheduler
+from pipeline import HighlightPipeline
+from frame_source import FrameSource, create_frame_source
+from metrics import StageMetrics, clock, format_summary
+from menu_layout import MenuLayoutCache, PageLine
+from menu_context import MENU_CLOSED_FRAMES, classify_menu_header, menu_header_binary
 
 # Config yükle
 cfg = load_config()
@@ -136,41 +145,47 @@ class OcrThread(QThread):
     vehicle_found_signal = pyqtSignal(dict)
     hide_hud_signal = pyqtSignal() 
     gta_window_active_signal = pyqtSignal(bool) # YENİ: Pencere odak durumu
-    
-    # OCR sonuçlarını filtreleyen kara liste
-    BLACKLIST = [
-        "garage", "request", "delivery", "return", "mechanic",
-        "apartment", "suite", "facility", "arcade", "nightclub",
-        "bunker", "empty", "property", "boss", "health", "ammo",
-        "clubhouse", "office", "arena", "casino", "penthouse",
-        "auto shop", "agency", "eclipse", "hawick", "blvd", "free",
-        "select", "manage", "transporter", "storage", "organization",
-        "call", "personal", "vehicle", "special", "mansions",
-        "garment", "factory", "bail", "reservoir", "land act"
-    ]
+    stats_signal = pyqtSignal(dict)  # Aşama süreleri ve etkin FPS (StageMetrics.snapshot)
     
     # ... (existing code) ...
 
 
     
-    # Görüntü İşleme Sabitleri (Tesseract kontur modu)
-    MIN_CONTOUR_WIDTH = 200
-    MAX_CONTOUR_WIDTH = 650
-    MIN_CONTOUR_HEIGHT = 35
-    MAX_CONTOUR_HEIGHT = 85
-    BRIGHTNESS_THRESHOLD = 80
-    BINARY_THRESHOLD = 140
+    # Görüntü İşleme Sabitleri (Tesseract kontur modu: bkz. vision.TEXT_*)
     MATCH_THRESHOLD = 85
     HUD_TIMEOUT = 1.5  # saniye
+    ROI_CACHE_LOG_INTERVAL = 500  # Bu kadar sorguda bir önbellek istatistiği logla
+    MATCH_MEMO_SIZE = 512  # Metin -> araç sonucu önbelleği (kayıt sayısı)
+    # WinOCR hattında yakalama döngüsü dışındaki thread'lerde ölçülen aşamalar (zamanlayıcı bütçesi)
+    PIPELINE_STAGES = ("convert", "mask", "ocr", "clean", "match", "emit")
+    STATS_EMIT_INTERVAL = 1.0  # stats_signal yayın aralığı (sn)
+    STATS_LOG_INTERVAL = 60.0  # app.log'a aşama özeti yazma aralığı (sn)
     
     def __init__(self, search_dict: Dict[str, dict]):
         super().__init__()
-        self.search_dict = search_dict
-        self.search_keys = list(search_dict.keys())
         self.running = True
         self.paused = False
         self.last_gta_state = None
         self._loop = None
+        self._tess = None  # Tesseract arka ucu (yalnızca Tesseract döngüsü boyunca açık)
+        self._last_matched = ""
+        self._last_seen = time.time()
+        # HUD'a yeni araç göndermeden önce kareler arası oylama (döngü başında config'ten kurulur)
+        self.debouncer = MatchDebouncer()
+        # Seçili satır değişmediyse WinOCR'ı atlamak için parmak izi önbelleği
+        self.roi_cache = RoiFingerprintCache()
+        self._roi_cache_logged_at = 0  # Son istatistik logundaki sorgu sayısı
+        # Menü sayfası düzeni (y-merkezi -> araç); "menu_layout_cache" açıksa kullanılır
+        self.layout_cache = MenuLayoutCache()
+        # Aşama süreleri için halka tampon (kare başına log yazmadan ölçüm)
+        self.metrics = StageMetrics()
+        self._stats_emitted_at = clock()
+        self._stats_logged_at = clock()
+        # Ana thread'den gelen yeni veritabanı; OCR tarafı kareler arasında uygular
+        self._database_lock = threading.Lock()
+        self._pending_database = None
+        self._database_swapped = False  # Bu sonuç eski veritabanıyla çözüldü, önbelleğe yazılmaz
+        self._load_database(search_dict)
         
         # Ekran Çözünürlüğüne Göre Ölçek Faktörü (Tesseract Konturları İçin)
         from config import get_screen_resolution, BASELINE_RESOLUTION
@@ -178,110 +193,77 @@ class OcrThread(QThread):
         self.scale_factor = curr_h / BASELINE_RESOLUTION[1]
         logging.debug(f"[OCR] Ölçek faktörü belirlendi: {self.scale_factor:.2f} ({curr_h}/1600)")
 
-    # =====================================================
-    # Tesseract modu: Kontur tabanlı (eski yaklaşım)
-    # =====================================================
-    def _preprocess_roi(self, roi: np.ndarray) -> Optional[np.ndarray]:
-        """ROI'yi OCR için ön işler. Karanlık zemini atlar."""
-        roi_enlarged = cv2.resize(roi, None, fx=2, fy=2, interpolation=cv2.INTER_CUBIC)
-        roi_blurred = cv2.GaussianBlur(roi_enlarged, (3, 3), 0)
-        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-        roi_contrasted = clahe.apply(roi_blurred)
-        
-        if np.mean(roi_contrasted) <= self.BRIGHTNESS_THRESHOLD:
-            return None
-        
-        _, roi_final = cv2.threshold(roi_contrasted, self.BINARY_THRESHOLD, 255, cv2.THRESH_BINARY)
-        roi_padded = cv2.copyMakeBorder(roi_final, 10, 10, 10, 10, cv2.BORDER_CONSTANT, value=[255, 255, 255])
-        return roi_padded
-
-    def _extract_text_tesseract(self, roi_padded: np.ndarray) -> Optional[str]:
-        """Tesseract ile metin okur."""
-        try:
-            return pytesseract.image_to_string(roi_padded, config='--oem 3 --psm 7').strip()
-        except Exception:
-            return None
-
-    # =====================================================
-    # Metin temizleme & eşleştirme (her iki mod için ortak)
-    # =====================================================
-    def _clean_text(self, raw_text: str) -> Optional[str]:
-        """Ham OCR metnini temizler ve filtreler."""
-        if not raw_text or len(raw_text.strip()) < 3:
-            return None
-        
-        text = raw_text.strip()
-        
-        # Regex: "Request Personal Aircraft < Cargobob >" -> "Cargobob"
-        bracket_match = re.search(r'<(.+?)>', text)
-        if bracket_match:
-            clean = bracket_match.group(1).strip()
-            return clean if len(clean) >= 3 else None
-        
-        # Temizlik
-        clean = text.replace('<', '').replace('>', '').replace('|', '')
-        clean = clean.replace('_', '').replace('«', '').replace('»', '').strip()
-        
-        if len(clean) < 3:
-            return None
-        if any(b in clean.lower() for b in self.BLACKLIST):
-            return None
-        if not re.search(r'[a-zA-Z0-9]', clean):
-            return None
-            
-        # Dosya uzantılarını ele (örn. main.py, setup.exe)
-        if re.search(r'\.[a-zA-Z]{2,4}$', clean):
-            return None
-        
-        return clean
-
-    def _match_vehicle(self, clean_text: str) -> Optional[Tuple[str, int]]:
-        """Metni veritabanıyla eşleştirir (Çok aşamalı filtreleme)."""
-        # 1. Geniş kapsamlı arama (WRatio) - İlk 10 adayı al
-        # Eşik değeri düşük tutuyoruz ki "RM-IO" gibi hatalı okumaları yakalayalım
-        candidates = process.extract(clean_text, self.search_keys, scorer=fuzz.WRatio, limit=10)
-        
-        # 2. Çok kötü eşleşmeleri ele (WRatio < 60)
-        valid_candidates = [c for c in candidates if c[1] >= 60]
-        if not valid_candidates:
-            return None
-        
-        # 3. Gelişmiş Skorlama
-        scored_candidates = []
-        for match_text, w_score in valid_candidates:
-            # TokenSet: Kelime kümesi alt-küme ise (örn "Vigero" içinde "Vigero ZX" yok ama tersi var)
-            set_ratio = fuzz.token_set_ratio(clean_text, match_text)
-            # TokenSort: Tüm kelimeler aynı mı (Uzunluk farkını cezalandırır)
-            sort_ratio = fuzz.token_sort_ratio(clean_text, match_text)
-            # Ratio: Tam bir Levenshtein mesafesi (Harfi harfine aynılık)
-            exact_ratio = fuzz.ratio(clean_text, match_text)
-            
-            scored_candidates.append((match_text, w_score, set_ratio, sort_ratio, exact_ratio))
-        
-        # 4. Sıralama Stratejisi (DÜZELTİLDİ):
-        # Önceki sürümde TokenSet 1. sıradaydı. Bu durum "Vigero ZX Convertible" araması yapıldığında
-        # veritabanındaki "Vigero" kelimesi ile TokenSet=100 çıkarıyordu çünkü "Vigero" kelimesi aranan metnin tam alt kümesiydi.
-        # ÇÖZÜM: Öncelik 1'e EXACT RATIO (Birebir eşleşme) veya TOKEN SORT koyuyoruz.
-        # Sıralama Önceliği: 
-        # 1. exact_ratio (Birebir eşleşmeye en yakın olan, harf sayısı tutan)
-        # 2. sort_ratio (Aynı kelimeleri içeren ama sırası karışık olan)
-        # 3. set_ratio (Eksik kelimesi olan ama alakasız olmayan)
-        scored_candidates.sort(key=lambda x: (x[4], x[3], x[2], x[1]), reverse=True)
-        
-        best = scored_candidates[0]
-        best_match, w_score, set_ratio, sort_ratio, exact_ratio = best
-        
-        # 5. Son Karar Eşiği
-        # TokenSet veya Exact Ratio çok düşükse reddet
-        if set_ratio < 85 and exact_ratio < 70:
-            return None
-            
-        # Skor olarak güvenilir bir ortalama döndür
-        final_score = (exact_ratio + sort_ratio) // 2
-        if final_score < 50:
-            final_score = w_score # Fallback
-            
-        return best_match, final_score
+    def reload_config(self) -> None:
+        """config.json değişti: kare başına okunan ayarlar hemen, döngü başında kurulanlar
+        (motor, zamanlayıcı, oylama) bir sonraki döngü başlangıcında geçerli olur."""
+        global cfg
+        cfg = load_config()
+
+    def set_database(self, search_dict: Dict[str, dict]) -> None:
+        """Yeni araç veritabanını OCR tarafına sıraya koyar (VeriÇek güncellemesinden sonra ana thread'den).
+
+        Sözlük ve eşleştirici OCR tarafında kareler arasında birlikte değiştirilir;
+        böylece bir kare eski eşleştiriciyle çözülüp yeni sözlükte aranmaz.
+        """
+        with self._database_lock:
+            self._pending_database = search_dict
+
+    def _apply_pending_database(self) -> bool:
+        """Sırada yeni veritabanı varsa yükler (OCR/eşleştirme thread'inde); yüklendiyse True."""
+        with self._database_lock:
+            search_dict, self._pending_database = self._pending_database, None
+        if search_dict is None:
+            return False
+        self._load_database(search_dict)
+        logging.info(f"[OCR] Araç veritabanı yenilendi: {len(search_dict)} araç")
+        return True
+
+    def _load_database(self, search_dict: Dict[str, dict]) -> None:
+        """Araç veritabanını yükler ve veritabanına bağlı önbellekleri sıfırlar."""
+        # İsim indeksi + aynı OCR satırı için temizleme/eşleştirmeyi tekrar yapmayan LRU
+        garage_version = get_garage_version()
+        resolver = VehicleResolver(search_dict, memo_size=self.MATCH_MEMO_SIZE, metrics=self.metrics,
+                                   garage=self._garage_for_matcher(),
+                                   engine=cfg.get("ocr", {}).get("match_engine", "trigram"))
+        previous = getattr(self, "resolver", None)
+        if previous is not None:
+            resolver.set_context(previous.context)  # Açık menünün bağlamı korunur
+        self.search_dict, self.resolver, self._garage_version = search_dict, resolver, garage_version
+        self.roi_cache.clear()
+        self.layout_cache.clear()
+
+    def _garage_for_matcher(self) -> List[str]:
+        """Garaj öncelikli eşleştirme açıksa sahip olunan araçlar (kapalıysa boş liste)."""
+        if not cfg.get("ocr", {}).get("garage_first", True):
+            return []
+        return list(garage_store.names())
+
+    def _refresh_garage(self) -> None:
+        """GarageStore sürümü değiştiyse garaj indeksini yeniden kurar (disk erişimi yok)."""
+        version = get_garage_version()
+        if version == self._garage_version:
+            return
+        garage = self._garage_for_matcher()
+        self._garage_version = get_garage_version()
+        self.resolver.set_garage(garage)
+        # Önbelleklerdeki adaylar eski garaja göre çözülmüştü
+        self.roi_cache.clear()
+        self.layout_cache.clear()
+        logging.debug(f"[OCR] Garaj indeksi yenilendi: {len(garage)} araç")
+
+    def _set_menu_context(self, context: Optional[str]) -> None:
+        """Menü bağlamını eşleştiriciye verir; değiştiyse eski bağlamla çözülmüş önbellekleri boşaltır."""
+        if context == self.resolver.context:
+            return
+        self.resolver.set_context(context)
+        self.roi_cache.clear()
+        self.layout_cache.clear()
+        logging.debug(f"[OCR] Menü bağlamı: {context or 'bilinmiyor'}")
+
+    def _resolve_text(self, raw_text: str) -> Optional[Tuple[str, int, str]]:
+        """Ham OCR satırını (araç, skor, temiz metin) sonucuna çözer (önbellekli)."""
+        self._refresh_garage()
+        return self.resolver.resolve(raw_text)
 
     # =====================================================
     # Windows OCR modu: Tüm ekran taraması (kontur yok)
@@ -290,6 +272,10 @@ class OcrThread(QThread):
         """Windows OCR ile tüm ekranı tarar, satır nesnelerini döndürür."""
         import winocr # Fonksiyon içinde import ederek global scope karmaşasından kaçınalım
         from PIL import Image as PILImage
+        # Event loop'u OCR aşamasının kendi thread'inde oluştur
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
         try:
             pil_img = PILImage.fromarray(gray)
             result = self._loop.run_until_complete(
@@ -299,6 +285,18 @@ class OcrThread(QThread):
         except Exception:
             return []
 
+    def _run_winocr_page(self, gray: np.ndarray) -> List[PageLine]:
+        """Menü sütununu WinOCR ile okur; her satırın metni ve y-merkezini döndürür."""
+        page = []
+        for line in self._run_winocr(gray):
+            rects = [word.bounding_rect for word in line.words]
+            if not rects:
+                continue
+            top = min(r.y for r in rects)
+            bottom = max(r.y + r.height for r in rects)
+            page.append((line.text, (top + bottom) / 2.0))
+        return page
+
     # =====================================================
     # Ana döngü
     # =====================================================
@@ -309,7 +307,7 @@ class OcrThread(QThread):
 
         while self.running:
             try:
-                cfg = load_config()  # Launcher'da değişmiş olabilir
+                cfg = load_config()  # Launcher'da değişmiş olabilir (izleyici önbelleği tazeler)
                 engine = get_ocr_engine()
 
                 if engine == "winocr":
@@ -352,30 +350,64 @@ class OcrThread(QThread):
         except Exception:
             return True  # Hata durumunda devam et
 
+    def _check_gta_focus(self, source: FrameSource) -> bool:
+        """GTA odak durumunu kontrol eder, değiştiyse sinyal yayar.
+
+        Kayıttan oynatılan kaynaklarda veya config'de "require_gta_focus"
+        kapalıysa kontrol atlanır ve pencere aktif kabul edilir.
+        """
+        if source.live and cfg.get("ocr", {}).get("require_gta_focus", True):
+            is_gta = self._is_gta_active()
+        else:
+            is_gta = True
+        
+        if is_gta != self.last_gta_state:
+            self.last_gta_state = is_gta
+            self.gta_window_active_signal.emit(is_gta)
+            logging.debug(f"[DEBUG] GTA Penceresi Aktif: {is_gta}")
+        return is_gta
+
     def _run_winocr_loop(self) -> None:
-        """Windows OCR döngüsü: Yalnızca menüdeki seçili (Highlight) satırı bulur ve okur."""
-        self._loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(self._loop)
+        """Windows OCR döngüsü: Yalnızca menüdeki seçili (Highlight) satırı bulur ve okur.
+
+        Bu thread yalnızca ekranı yakalar; tespit, OCR ve eşleştirme
+        HighlightPipeline aşamalarında paralel yürür (en yeni kare kazanır).
+        "menu_layout_cache" açıksa liste kaydığında tüm menü sütunu bir kez
+        okunur, kaymadıkça yeni seçim OCR'sız konumdan çözülür.
+        """
+        self._last_matched = ""
+        self._last_seen = time.time()
+        self.debouncer = self._make_debouncer()
+        scheduler = FrameScheduler.from_config(cfg)
+        ocr_cfg = cfg.get("ocr", {})
+        use_layout = ocr_cfg.get("menu_layout_cache", False)
+        tracker = None
+        if ocr_cfg.get("track_highlight", True) and not use_layout:
+            tracker = HighlightTracker(full_scan_every=ocr_cfg.get("full_scan_every", 15))
+        pipeline = HighlightPipeline(
+            recognize=lambda img: [line.text for line in self._run_winocr(img)],
+            resolve=self._resolve_text,
+            on_result=self._on_winocr_result,
+            on_error=self._on_pipeline_error,
+            on_highlight=scheduler.mark_highlight,
+            roi_cache=self.roi_cache,
+            metrics=self.metrics,
+            detector=ocr_cfg.get("highlight_detector", "contour"),
+            recognize_page=self._run_winocr_page if use_layout else None,
+            layout_cache=self.layout_cache,
+            tracker=tracker,
+            on_menu_context=self._set_menu_context if ocr_cfg.get("menu_context", True) else None,
+            confirm=self._confirm_cached,
+        )
         
-        # Ana monitör boyutunu alıp sol kısmı (örneğin %35 genişlik) tam yükseklikle tarayacağız
-        with mss.mss() as sct:
-            monitor = sct.monitors[1]  # Birincil monitör
-            # Monitor alanı: {left, top, width, height}
-            scan_rect = {
-                "top": monitor["top"],
-                "left": monitor["left"],
-                "width": min(600, int(monitor["width"] * 0.35)),  # Maksimum 600px veya ekranın %35'i
-                "height": monitor["height"]
-            }
-            
+        # Varsayılan kaynak: birincil monitörün sol kısmı (%35 genişlik, tam yükseklik)
+        with create_frame_source(cfg) as source:
+            pipeline.start()
+            pipeline_work = self.metrics.total(self.PIPELINE_STAGES)
             try:
                 while self.running:
                     # 1. GTA Pencere Kontrolü
-                    is_gta = self._is_gta_active()
-                    if is_gta != self.last_gta_state:
-                        self.last_gta_state = is_gta
-                        self.gta_window_active_signal.emit(is_gta)
-                        logging.debug(f"[DEBUG] GTA Penceresi Aktif: {is_gta}")
+                    is_gta = self._check_gta_focus(source)
                     
                     if not is_gta:
                         self.hide_hud_signal.emit()
@@ -388,136 +420,158 @@ class OcrThread(QThread):
                         time.sleep(1)
                         continue
 
+                    scheduler.begin_frame()
                     try:
-                        # 3. Ekranı Yakala
-                        screen_grab = np.array(sct.grab(scan_rect))
-                        # BGR formattan HSV formata çevir (Renk maskelemesi HSV'de çok daha stabildir)
-                        hsv = cv2.cvtColor(screen_grab, cv2.COLOR_BGRA2BGR)
-                        hsv = cv2.cvtColor(hsv, cv2.COLOR_BGR2HSV)
-                        
-                        # 4. Seçili Şeridin (Highlight) Rengini Maskele
-                        # GTA V menüsündeki seçili satır genellikle çok açık gri/beyazdır.
-                        # HSV değerleri: Hue(0-180), Saturation(0-255), Value(0-255)
-                        # Düşük doygunluk (Saturation < 40) ve yüksek parlaklık (Value > 200) olan pikselleri arıyoruz.
-                        lower_white = np.array([0, 0, 200])
-                        upper_white = np.array([180, 40, 255])
-                        
-                        mask = cv2.inRange(hsv, lower_white, upper_white)
-                        
-                        # 5. Maskedeki Şekilleri (Contours) Bul
-                        # Küçük gürültüleri gidermek için morfolojik işlem yapalım
-                        kernel = np.ones((1, 5), np.uint8) 
-                        mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel)
-                        
-                        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-                        
-                        highlight_rect = None
-                        max_w = 0
-                        
-                        # 6. Bulunan şekillerden "Menü Şeridi" olmaya en uygununu seç
-                        for cnt in contours:
-                            x, y, w, h = cv2.boundingRect(cnt)
-                            
-                            # Menü şeridi yatayda uzun (örn 200-400px), dikeyde incedir.
-                            # Garaj ve liste elemanlarında çift satırlı isimler olabildiği için yüksekliği 120'ye kadar esnetiyoruz.
-                            # Ayrıca sol kenara yakın olmalıdır (x çok büyük olamaz)
-                            if w > 150 and w < 440 and h > 20 and h < 120 and x < 50:
-                                # En geniş olanı (gerçek şeridi) alıyoruz (Bazen ufak menü parçaları kopuk olabilir)
-                                if w > max_w:
-                                    max_w = w
-                                    highlight_rect = (x, y, w, h)
-                                    
-                        # 7. Sadece Şeridi Kırp ve OCR'a Gönder
-                        candidates = []
-                        if highlight_rect:
-                            x, y, w, h = highlight_rect
-                            
-                            # Güvenlik için şeridi biraz daraltalım/genişletelim ki yazıyı tam alsın
-                            y_start = max(0, y - 2)
-                            y_end = min(screen_grab.shape[0], y + h + 2)
-                            
-                            # Etkileşim (Interaction) menüsünde araç isimleri sağa dayalıdır (Örn: < Havok >).
-                            # Bu yüzden barın "solundaki" ikonları vs. kırparken sağ tarafını tam uzunlukta bırakmalıyız.
-                            x_start = max(0, x + 5) 
-                            
-                            # X_end'i tam genişlikte (veya sonuna kadar) alıyoruz ki Interaction menüsündeki sağa dayalı araç isimleri kesilmesin.
-                            x_end = min(screen_grab.shape[1], x + w)
-                            
-                            roi_color = screen_grab[y_start:y_end, x_start:x_end]
-                            roi_gray = cv2.cvtColor(roi_color, cv2.COLOR_BGRA2GRAY)
-                            
-                            # Seçili şeritte arka plan BEYAZ, metin SİYAHtır.
-                            # OCR daha iyi okusun diye resmi Invert (Ters Çevirme) yapıyoruz: Siyah arkaplan, beyaz metin.
-                            _, roi_binary = cv2.threshold(roi_gray, 180, 255, cv2.THRESH_BINARY_INV)
-                            
-                            # Metni okumayı kolaylaştırmak için 2 kat büyüt
-                            roi_2x = cv2.resize(roi_binary, None, fx=2, fy=2, interpolation=cv2.INTER_CUBIC)
-                            
-                            # OCR işlemini başlat (Sadece 50x300 piksellik bir alanı okuyor!)
-                            lines = self._run_winocr(roi_2x)
-                            
-                            for line in lines:
-                                raw_text = line.text.strip()
-                                # print(f"[TARGETED OCR] Ham Metin: '{raw_text}'")
-                                
-                                clean = self._clean_text(raw_text)
-                                if clean:
-                                    match_result = self._match_vehicle(clean)
-                                    if match_result:
-                                        match, score = match_result
-                                        candidates.append((match, score, clean))
-                                        
-                        # 8. Sonuç Değerlendirmesi
-                        if candidates:
-                            # Sadece 1 satır/araç olmasını bekliyoruz zaten, ilkini alabiliriz.
-                            best_match, best_score, best_clean = candidates[0]
-                            
-                            detected = True
-                            last_seen = time.time()
-                            
-                            if best_match != last_matched:
-                                last_matched = best_match
-                                logging.debug(f"[OCR SEÇİLDİ] {best_clean} -> {best_match} (Skor: {best_score})")
-                                self.vehicle_found_signal.emit(self.search_dict[best_match])
-                        
-                        else:
-                            # Araç kaybolursa zaman aşımından sonra HUD'ı gizle
-                            if last_matched != "" and (time.time() - last_seen > self.HUD_TIMEOUT):
-                                self.hide_hud_signal.emit()
-                                last_matched = ""
-                    
+                        # 3. Ekranı Yakala ve tespit aşamasına ver (şerit biliniyorsa yalnızca etrafındaki bant)
+                        band = tracker.band() if tracker is not None else None
+                        start = clock()
+                        frame = source.grab(band)
+                        self.metrics.since("capture", start)
+                        if frame is None:
+                            logging.info("[OcrThread:winocr] Kare kaynağı bitti.")
+                            break
+                        pipeline.submit(frame, band)
                     except Exception as e:
-                        logging.exception(f"[OcrThread:winocr] OCR döngüsü hatası: {e}")
-                        self.hide_hud_signal.emit()
-                        last_matched = ""
+                        logging.exception(f"[OcrThread:winocr] Ekran yakalama hatası: {e}")
+                        self._on_pipeline_error()
                         time.sleep(1.0)
 
-                    time.sleep(0.25) # İstediğiniz hızda okuması için döngü beklemesi
+                    self._publish_stats()
+                    # OCR/eşleştirme hat thread'lerinde; süreleri CPU bütçesine bu kare için eklenir
+                    total = self.metrics.total(self.PIPELINE_STAGES)
+                    scheduler.add_work(total - pipeline_work)
+                    pipeline_work = total
+                    # Menü açıkken hızlı, boştayken yavaş; yavaş OCR aralığı uzatır
+                    scheduler.wait()
             finally:
-                if self._loop:
+                pipeline.stop()
+                if self._loop and not self._loop.is_running():
                     self._loop.close()
+                self._loop = None
+
+    def _on_winocr_result(self, candidates: List[Tuple[str, int, str]]) -> None:
+        """Hattın son aşamasından gelen adayları değerlendirir ve HUD sinyallerini yayar."""
+        self._log_roi_cache_stats()
+        self.metrics.frame_done()
+        # Sonuç önbelleğe yazılmadan önce: eski veritabanıyla çözülen adaylar yeni önbelleğe girmez
+        self._database_swapped = self._apply_pending_database()
+        
+        if candidates:
+            # Sadece 1 satır/araç olmasını bekliyoruz zaten, ilkini alabiliriz.
+            best_match, best_score, best_clean = candidates[0]
+            self._last_seen = time.time()
+            
+            # Yeni araç yalnızca oylamayı geçince (veya çok yüksek skorlu ilk eşleşmede) yayınlanır
+            if self.debouncer.push(best_match, best_score):
+                self._last_matched = best_match
+                logging.debug(f"[OCR SEÇİLDİ] {best_clean} -> {best_match} (Skor: {best_score})")
+                start = clock()
+                car = self.search_dict.get(best_match)
+                if car is not None:
+                    self.vehicle_found_signal.emit(car)
+                self.metrics.since("emit", start)
+        
+        else:
+            self.debouncer.push(None)
+            # Araç kaybolursa zaman aşımından sonra HUD'ı gizle
+            if self._last_matched != "" and (time.time() - self._last_seen > self.HUD_TIMEOUT):
+                self.hide_hud_signal.emit()
+                self._last_matched = ""
+                self.debouncer.reset()
+
+    def _confirm_cached(self, candidates: List[Tuple[str, int, str]]) -> bool:
+        """Taze okuma önbelleğe yazılsın mı: araç ancak HUD oylamasını geçince, boş okuma hemen."""
+        if self._database_swapped:
+            return False
+        return not candidates or self.debouncer.confirmed(candidates[0][0])
+
+    def _on_pipeline_error(self) -> None:
+        """Hat aşamalarından biri hata verdiğinde HUD'ı gizler ve durumu sıfırlar."""
+        self.hide_hud_signal.emit()
+        self._last_matched = ""
+        self.debouncer.reset()
+
+    def _make_debouncer(self) -> MatchDebouncer:
+        """Config'teki oylama penceresiyle HUD yayın oylayıcısı (vote_required=1: oylama yok)."""
+        ocr_cfg = cfg.get("ocr", {})
+        return MatchDebouncer(
+            window=int(ocr_cfg.get("vote_window", 4)),
+            required=int(ocr_cfg.get("vote_required", 2)),
+            fast_score=int(ocr_cfg.get("vote_fast_score", 95)),
+        )
+
+    def _log_roi_cache_stats(self) -> None:
+        """ROI önbelleği isabet oranını belirli aralıklarla loglar."""
+        stats = self.roi_cache.stats()
+        lookups = stats["hits"] + stats["misses"]
+        # Yalnızca bir sorgu sayacı yeni bir katsayıya taşıdığında (boşta ve 0'da her kare değil)
+        if lookups == self._roi_cache_logged_at or lookups % self.ROI_CACHE_LOG_INTERVAL:
+            return
+        self._roi_cache_logged_at = lookups
+        logging.debug(
+            f"[OCR CACHE] hit={stats['hits']} miss={stats['misses']} "
+            f"oran={stats['hit_rate']:.0%} boyut={stats['size']} "
+            f"sayfa={self.layout_cache.pages} sayfa_hit={self.layout_cache.hits}"
+        )
+
+    def _publish_stats(self) -> None:
+        """Aşama istatistiklerini periyodik olarak sinyal ile yayar ve app.log'a özetler."""
+        now = clock()
+        if now - self._stats_emitted_at < self.STATS_EMIT_INTERVAL:
+            return
+        self._stats_emitted_at = now
+        snapshot = self.metrics.snapshot()
+        snapshot["matcher"] = self.resolver.stats()
+        snapshot["hud"] = self.debouncer.stats()
+        self.stats_signal.emit(snapshot)
+
+        if now - self._stats_logged_at >= self.STATS_LOG_INTERVAL:
+            self._stats_logged_at = now
+            matcher, hud = snapshot["matcher"], snapshot["hud"]
+            logging.info(f"[OCR PERF] {format_summary(snapshot)} "
+                         f"hızlı yol={matcher['exact_hits']}/{matcher['exact_hits'] + matcher['fuzzy_matches']} "
+                         f"HUD yayın={hud['emits']}/{hud['raw_emits']} "
+                         f"önlenen={hud['wasted_per_min']:.1f}/dk")
+
+    def _read_tesseract_header(self, frame: np.ndarray,
+                               masker: FusedHighlightMask) -> Optional[List[str]]:
+        """Seçili satırın üstündeki başlık şeridini okur; şerit bulunamazsa None."""
+        highlight_rect = find_highlight_rect(masker(frame))
+        header_binary = menu_header_binary(frame, highlight_rect) if highlight_rect is not None else None
+        if header_binary is None:
+            return None
+        start = clock()
+        header_2x = cv2.resize(header_binary, None, fx=2, fy=2, interpolation=cv2.INTER_CUBIC)
+        lines = self._tess.recognize([header_2x])
+        self.metrics.since("ocr", start)
+        return lines
 
     def _run_tesseract_loop(self) -> None:
         """Tesseract döngüsü: Kontur tabanlı, ROI bazlı OCR."""
         last_matched = ""
         last_seen = time.time()
-
-        with mss.mss() as sct:  # Context manager
-            monitor = sct.monitors[1]
-            scan_rect = {
-                "top": monitor["top"],
-                "left": monitor["left"],
-                "width": min(600, int(monitor["width"] * 0.35)),
-                "height": monitor["height"]
-            }
-            
+        self.debouncer = self._make_debouncer()
+        scheduler = FrameScheduler.from_config(cfg)
+        # Motor döngü boyunca bir kez yüklenir (ROI başına tesseract.exe başlatılmaz)
+        backend_name = cfg.get("ocr", {}).get("tesseract_backend", "auto")
+        workers = int(cfg.get("ocr", {}).get("tesseract_workers", 0))
+        if workers > 0:
+            # ROI'ler işçi süreçlerde paralel okunur; tek sayfaya dizme bu paralelliği kaldırır
+            self._tess = TesseractPool(pytesseract.pytesseract.tesseract_cmd, workers, backend_name)
+            stitch = False
+        else:
+            self._tess = create_tesseract_backend(pytesseract.pytesseract.tesseract_cmd, backend_name)
+            stitch = cfg.get("ocr", {}).get("tesseract_stitch", True)
+        use_context = cfg.get("ocr", {}).get("menu_context", True)
+        masker = FusedHighlightMask()
+        menu_misses = MENU_CLOSED_FRAMES  # Metin konturu görülmeyen ardışık kare sayısı
+        header_pending = False  # Menü yeni açıldı, başlık henüz okunmadı
+
+        with create_frame_source(cfg) as source:  # Context manager
             try:
                 while self.running:
                     # Pencere Kontrolü (Tesseract Modu İçin Ekledim)
-                    is_gta = self._is_gta_active()
-                    if is_gta != self.last_gta_state:
-                        self.last_gta_state = is_gta
-                        self.gta_window_active_signal.emit(is_gta)
+                    is_gta = self._check_gta_focus(source)
                     
                     if not is_gta:
                         self.hide_hud_signal.emit()
@@ -529,65 +583,90 @@ class OcrThread(QThread):
                         time.sleep(1)
                         continue
 
+                    scheduler.begin_frame()
                     try:
-                        screen_grab = np.array(sct.grab(scan_rect))
+                        self._apply_pending_database()
+                        start = clock()
+                        screen_grab = source.grab()
+                        start = self.metrics.since("capture", start)
+                        if screen_grab is None:
+                            logging.info("[OcrThread:tesseract] Kare kaynağı bitti.")
+                            break
                         gray = cv2.cvtColor(screen_grab, cv2.COLOR_BGRA2GRAY)
+                        start = self.metrics.since("convert", start)
                         
-                        _, mask = cv2.threshold(gray, 140, 255, cv2.THRESH_BINARY)
-                        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+                        # Parlak metin konturları (kontur sırasıyla, ön işlenmiş)
+                        rois = find_text_rois(gray, self.scale_factor)
+                        self.metrics.since("mask", start)
                         detected = False
+                        texts = []
                         
-                        for cnt in contours:
-                            x, y, w, h = cv2.boundingRect(cnt)
-                            
-                            # Ölçekli eşik değerleri kontrolü
-                            min_w = self.MIN_CONTOUR_WIDTH * self.scale_factor
-                            max_w = self.MAX_CONTOUR_WIDTH * self.scale_factor
-                            min_h = self.MIN_CONTOUR_HEIGHT * self.scale_factor
-                            max_h = self.MAX_CONTOUR_HEIGHT * self.scale_factor
-                            
-                            if not (min_w < w < max_w and min_h < h < max_h):
-                                        continue
-                                        
-                            # HEURISTIC: Oyun içi çevre yazıları sol sınırdan uzaktır
-                            max_x_allowed = 225 * self.scale_factor
-                            if x > max_x_allowed:
-                                continue
-                            
-                            crop_w = w - 10 if w > 50 else w
-                            roi = gray[y:y+h, x:x+crop_w]
-                            
-                            roi_padded = self._preprocess_roi(roi)
-                            if roi_padded is None:
-                                continue
-                            
-                            raw_text = self._extract_text_tesseract(roi_padded)
-                            clean = self._clean_text(raw_text) if raw_text else None
-                            if not clean:
-                                continue
+                        if rois:
+                            scheduler.mark_highlight()
+                            # Tüm ROI'ler tek istekte, yüklü motorla okunur
+                            # (stitch: tek sayfaya dizilip tek tanıma çağrısıyla;
+                            # havuz: paralel, sonuçlar kontur sırasıyla)
+                            start = clock()
+                            if stitch:
+                                texts = recognize_stitched(self._tess, rois)
+                            else:
+                                texts = self._tess.recognize(rois)
+                            self.metrics.since("ocr", start)
+                        
+                        # Menü açılışında (uzun bir yokluktan sonra görünen metin) başlık bir kez okunur
+                        if rois:
+                            header_pending = header_pending or (use_context and menu_misses >= MENU_CLOSED_FRAMES)
+                            menu_misses = 0
+                        else:
+                            menu_misses += 1
+                        if header_pending:
+                            header_lines = self._read_tesseract_header(screen_grab, masker)
+                            if header_lines is not None:
+                                header_pending = False
+                                self._set_menu_context(classify_menu_header(header_lines))
+                        
+                        # Kontur sırasındaki ilk eşleşme bu karenin oyudur
+                        resolved = None
+                        for raw_text in texts:
+                            resolved = self._resolve_text(raw_text) if raw_text else None
+                            if resolved:
+                                break
+                        
+                        if resolved:
+                            match, score, clean = resolved
+                            detected = True
+                            last_seen = time.time()
                             
-                            match_result = self._match_vehicle(clean)
-                            if match_result:
-                                match, score = match_result
-                                detected = True
-                                last_seen = time.time()
-                                
-                                if match != last_matched:
-                                    last_matched = match
-                                    print(f"[OCR BULUNDU] {clean} -> {match} (Skor: {score})")
-                                    self.vehicle_found_signal.emit(self.search_dict[match])
+                            # Yeni araç yalnızca oylamayı geçince (veya çok yüksek skorlu ilk eşleşmede) yayınlanır
+                            if self.debouncer.push(match, score):
+                                last_matched = match
+                                print(f"[OCR BULUNDU] {clean} -> {match} (Skor: {score})")
+                                start = clock()
+                                car = self.search_dict.get(match)
+                                if car is not None:
+                                    self.vehicle_found_signal.emit(car)
+                                self.metrics.since("emit", start)
+                        else:
+                            self.debouncer.push(None)
                         
+                        self.metrics.frame_done()
                         if not detected and last_matched != "" and (time.time() - last_seen > self.HUD_TIMEOUT):
                             self.hide_hud_signal.emit() 
                             last_matched = ""
+                            self.debouncer.reset()
+                            self._set_menu_context(None)  # Menü kapandı; sonraki menü başlığından belirlenir
                     
                     except Exception:
                         logging.exception("[OcrThread:tesseract] OCR döngüsü hatası")
                         self.hide_hud_signal.emit()
                         last_matched = ""
+                        self.debouncer.reset()
                         time.sleep(1.0)
 
-                    time.sleep(0.35)
+                    self._publish_stats()
+                    scheduler.wait()
             finally:
                 # Cleanup
+                self._tess.close()
+                self._tess = None
                 self.hide_hud_signal.emit()
\ No newline at end of file